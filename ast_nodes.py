@@ -0,0 +1,188 @@
+# ast_nodes.py
+# Representación compacta de los nodos del AST y utilidades para recorrerlo.
+# Cada nodo es un objeto con __slots__ (sin __dict__ propio), los tipos se
+# internan y las hojas comparten una misma tupla vacía como 'children'.
+
+import sys
+from types import GeneratorType
+
+# Lista de hijos compartida por todas las hojas (inmutable a propósito)
+EMPTY_CHILDREN = ()
+
+# Nodos cuyo 'value' es un nombre: se internan para compartir el string
+NAME_TYPES = frozenset(("IDENT", "Identifier", "Type"))
+
+class Node:
+    __slots__ = ("type", "children", "value", "datatype", "lineno")
+
+    def __init__(self, type, children=EMPTY_CHILDREN, value=None, datatype=None, lineno=None):
+        self.type = type
+        self.children = children
+        self.value = value
+        self.datatype = datatype
+        self.lineno = lineno
+
+    # --- Compatibilidad con el formato anterior (dict) ---
+    # node["type"], node["children"] = ..., node.get("value"), "lineno" in node
+    __getitem__ = object.__getattribute__
+    __setitem__ = object.__setattr__
+
+    def get(self, key, default=None):
+        if key in Node.__slots__:
+            return getattr(self, key)
+        return default
+
+    def __contains__(self, key):
+        return key in Node.__slots__
+
+    def keys(self):
+        return Node.__slots__
+
+    def __repr__(self):
+        return (f"Node({self.type!r}, children={list(self.children)!r}, value={self.value!r}, "
+                f"datatype={self.datatype!r}, lineno={self.lineno!r})")
+
+def make_node(type, children=None, value=None, datatype=None, lineno=None):
+    if type in NAME_TYPES and value.__class__ is str:
+        value = sys.intern(value)
+    return Node(sys.intern(type), children or EMPTY_CHILDREN, value, datatype, lineno)
+
+# ==============================
+# DESPACHO DE VISITANTES
+# ==============================
+_dispatch_cache = {}
+
+def dispatch_table(cls, prefix):
+    """
+    Devuelve {tipo_de_nodo: función} con los métodos de 'cls' que empiezan
+    con 'prefix' (ej. 'visit_BINOP' -> 'BINOP'). Se calcula una sola vez por
+    clase; las funciones se llaman pasando la instancia: func(self, node).
+    """
+    key = (cls, prefix)
+    table = _dispatch_cache.get(key)
+    if table is None:
+        table = {name[len(prefix):]: getattr(cls, name)
+                 for name in dir(cls) if name.startswith(prefix)}
+        _dispatch_cache[key] = table
+    return table
+
+# ==============================
+# RECORRIDO SIN RECURSIÓN NATIVA
+# ==============================
+def trampoline(work):
+    """
+    Ejecuta un visitante escrito como generador usando una pila explícita.
+
+    Un método visitante puede devolver un valor directamente o ser un
+    generador que hace 'resultado = yield trabajo' para pedir el resultado de
+    un subárbol, donde 'trabajo' es a su vez un valor o un generador. Así la
+    profundidad del árbol solo ocupa memoria del heap (la pila de
+    generadores) y no la pila nativa de Python, por lo que no hay
+    RecursionError con expresiones o bloques arbitrariamente profundos.
+    """
+    if work.__class__ is not GeneratorType:
+        return work
+    stack = [work]
+    value = None
+    while stack:
+        try:
+            work = stack[-1].send(value)
+        except StopIteration as stop:
+            stack.pop()
+            value = stop.value
+            continue
+        if work.__class__ is GeneratorType:
+            stack.append(work)
+            value = None
+        else:
+            value = work
+    return value
+
+def walk(tree):
+    """
+    Recorre en preorden todos los nodos de un AST, de un nodo o de una lista
+    de sentencias (las listas anidadas, como los bloques, se aplanan).
+    Usa una pila explícita, así que sirve para árboles de cualquier
+    profundidad.
+    """
+    stack = [tree]
+    pop, extend = stack.pop, stack.extend
+    while stack:
+        item = pop()
+        if item is None:
+            continue
+        if item.__class__ is list or item.__class__ is tuple:
+            extend(reversed(item))
+        else:
+            yield item
+            children = item.children
+            if children:
+                extend(reversed(children))
+
+# ==============================
+# SERIALIZACIÓN PLANA
+# ==============================
+def flatten_tree(tree):
+    """
+    Convierte un árbol en una lista plana, en preorden, que se puede guardar
+    con pickle sin importar la profundidad (pickle es recursivo y falla con
+    expresiones muy anidadas). Cada elemento es:
+        nodo  -> (type, value, datatype, lineno, número de hijos)
+        lista -> su número de elementos
+        None  -> None
+    Un nodo hoja con la tupla vacía compartida lleva -1 como número de hijos.
+    """
+    records = []
+    append = records.append
+    stack = [tree]
+    pop, extend = stack.pop, stack.extend
+    while stack:
+        item = pop()
+        if item is None:
+            append(None)
+        elif item.__class__ is Node:
+            children = item.children
+            if children.__class__ is list:
+                append((item.type, item.value, item.datatype, item.lineno, len(children)))
+                extend(reversed(children))
+            elif children:
+                append((item.type, item.value, item.datatype, item.lineno, len(children)))
+                extend(reversed(children))
+            else:
+                append((item.type, item.value, item.datatype, item.lineno, -1))
+        else:
+            append(len(item))
+            extend(reversed(item))
+    return records
+
+
+def rebuild_tree(records):
+    """Inversa de flatten_tree (los hijos vuelven como lista)."""
+    root = []
+    stack = [[root, 1]]     # [lista que se está llenando, elementos que faltan]
+    names = {}              # los tipos y nombres se vuelven a internar una vez
+    for record in records:
+        count = 0
+        if record is None:
+            item = None
+        elif record.__class__ is int:
+            item = fill = []
+            count = record
+        else:
+            type, value, datatype, lineno, count = record
+            type = names.get(type) or names.setdefault(type, sys.intern(type))
+            if type in NAME_TYPES and value.__class__ is str:
+                value = names.get(value) or names.setdefault(value, sys.intern(value))
+            if count < 0:
+                item, count = Node(type, EMPTY_CHILDREN, value, datatype, lineno), 0
+            else:
+                fill = []
+                item = Node(type, fill, value, datatype, lineno)
+        top = stack[-1]
+        top[0].append(item)
+        top[1] -= 1
+        if not top[1]:
+            stack.pop()
+        if count:
+            stack.append([fill, count])
+    return root[0]
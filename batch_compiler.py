@@ -0,0 +1,141 @@
+# batch_compiler.py
+# Compilación por lotes: compila muchos archivos .wax (directorios, patrones
+# glob o archivos sueltos) repartidos en un pool de procesos, para no pagar
+# el arranque de Python y la carga de las tablas del parser por cada
+# archivo como al llamar a 'main.py' una vez por programa.
+#
+# Cada proceso del pool crea un solo Compiler al arrancar (con el sistema
+# "fork" hereda la gramática ya cargada; con "spawn" la carga una vez al
+# importar compiler.py) y lo reutiliza para todos los archivos que le tocan.
+# Si hay una BuildCache, los procesos la comparten: las entradas se
+# escriben de forma atómica.
+#
+# El resultado es un resumen que se puede serializar a JSON: estado,
+# diagnósticos y tiempo de cada archivo (en el orden de entrada) y el
+# total de archivos por segundo.
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from build_cache import BuildCache
+from compiler import Compiler
+
+SOURCE_SUFFIX = ".wax"
+
+# Estados posibles de un archivo en el resumen
+STATUSES = ("ok", "read_error", "syntax_error", "semantic_error", "generator_error", "internal_error")
+
+# Compiler del proceso actual (uno por proceso del pool)
+_compiler = None
+
+
+def expand_paths(patterns):
+    """
+    Lista de archivos a compilar: los directorios se recorren completos
+    buscando archivos .wax, los patrones con comodines se expanden con glob
+    ('**' entra en subdirectorios) y el resto se toma tal cual. Se respeta
+    el orden de 'patterns' y cada archivo aparece una sola vez.
+    """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, dirs, files in os.walk(pattern):
+                dirs.sort()
+                paths.extend(os.path.join(root, name) for name in sorted(files)
+                             if name.endswith(SOURCE_SUFFIX))
+        elif glob.has_magic(pattern):
+            paths.extend(sorted(path for path in glob.glob(pattern, recursive=True)
+                                if not os.path.isdir(path)))
+        else:
+            paths.append(pattern)
+    return list(dict.fromkeys(paths))
+
+
+def init_worker(backend, optimize, cache_directory, entry_function=True):
+    """Inicializador de cada proceso: crea su Compiler (y su BuildCache)."""
+    global _compiler
+    cache = BuildCache(cache_directory) if cache_directory else None
+    _compiler = Compiler(backend, optimize=optimize, cache=cache, entry_function=entry_function)
+
+
+def compile_file(path):
+    """Compila 'path' con el Compiler del proceso y devuelve su registro."""
+    record = {"path": path, "status": "ok", "diagnostics": [], "cached": False, "seconds": 0.0}
+    start = time.perf_counter()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            source = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        record["status"] = "read_error"
+        record["diagnostics"].append(str(e))
+        return record
+
+    try:
+        result = _compiler.compile(source, path)
+    except Exception as e:
+        record["status"] = "internal_error"
+        record["diagnostics"].append(f"{type(e).__name__}: {e}")
+        record["seconds"] = time.perf_counter() - start
+        return record
+
+    record["cached"] = result.from_cache
+    record["diagnostics"] = list(result.syntax_errors) + list(result.semantic_errors)
+    # Igual que main.py: el AST de una entrada de la caché sólo se
+    # reconstruye si no hay objeto código
+    if result.syntax_errors or (result.code_object is None and not result.ast):
+        record["status"] = "syntax_error"
+    elif result.semantic_errors:
+        record["status"] = "semantic_error"
+    elif result.generator_error is not None:
+        e = result.generator_error
+        record["status"] = "generator_error"
+        record["diagnostics"].append(f"{type(e).__name__}: {e}")
+    record["seconds"] = time.perf_counter() - start
+    return record
+
+
+def compile_paths(paths, jobs=None, backend="ast", optimize=False, cache_directory=None,
+                  entry_function=True):
+    """
+    Compila 'paths' en 'jobs' procesos (por defecto, uno por núcleo) y
+    devuelve el resumen. Con jobs=1 compila en el proceso actual, sin pool.
+    'cache_directory' es el directorio de la BuildCache, o None para no
+    usarla.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(paths)))
+    start = time.perf_counter()
+    if jobs == 1:
+        init_worker(backend, optimize, cache_directory, entry_function)
+        records = [compile_file(path) for path in paths]
+    else:
+        # Bloques de varios archivos por mensaje: con miles de programas
+        # pequeños el costo de ir y volver al pool por archivo domina
+        chunksize = max(1, min(32, len(paths) // (jobs * 8)))
+        with ProcessPoolExecutor(jobs, initializer=init_worker,
+                                 initargs=(backend, optimize, cache_directory, entry_function)) as pool:
+            records = list(pool.map(compile_file, paths, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+    return summarize(records, jobs, elapsed, backend, optimize, entry_function)
+
+
+def summarize(records, jobs, elapsed, backend, optimize, entry_function=True):
+    counts = dict.fromkeys(STATUSES, 0)
+    for record in records:
+        counts[record["status"]] += 1
+    return {
+        "backend": backend,
+        "optimize": optimize,
+        "entry_function": entry_function,
+        "jobs": jobs,
+        "total": len(records),
+        "ok": counts["ok"],
+        "failed": len(records) - counts["ok"],
+        "cached": sum(record["cached"] for record in records),
+        "statuses": counts,
+        "elapsed": elapsed,
+        "files_per_second": len(records) / elapsed if elapsed > 0 else 0.0,
+        "files": records,
+    }
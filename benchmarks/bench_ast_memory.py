@@ -0,0 +1,59 @@
+# bench_ast_memory.py
+# Compara con tracemalloc los bytes por nodo del AST con nodos compactos
+# (ast_nodes.Node) contra la representación anterior basada en dicts.
+# Uso: python benchmarks/bench_ast_memory.py [copias]
+
+import sys
+import tracemalloc
+
+from bench_common import big_program, report
+
+import parser as wax_parser
+from lexer import lexer, TokenStream
+
+
+def dict_node(type, children=None, value=None, datatype=None, lineno=None):
+    """make_node tal como era antes: un dict de cinco claves por nodo."""
+    return {"type": type, "children": children or [], "value": value, "datatype": datatype, "lineno": lineno}
+
+
+def count_nodes(ast):
+    total = 0
+    stack = list(ast)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (list, tuple)):
+            stack.extend(node)
+        elif node is not None:
+            total += 1
+            stack.extend(node["children"])
+    return total
+
+
+def measure(data, factory):
+    stream = TokenStream(lexer)
+    stream.input(data)
+    original = wax_parser.make_node
+    wax_parser.make_node = factory
+    try:
+        tracemalloc.start()
+        ast = wax_parser.parser.parse(lexer=lexer, tokenfunc=stream.token)
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        wax_parser.make_node = original
+    return size, count_nodes(ast)
+
+
+def main():
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    data = big_program(copies)
+    rows = [("representación", "nodos", "bytes totales", "bytes/nodo")]
+    for label, factory in (("dict", dict_node), ("Node (__slots__)", wax_parser.make_node)):
+        size, nodes = measure(data, factory)
+        rows.append((label, nodes, size, f"{size / nodes:.1f}"))
+    report(f"Memoria del AST ({copies} copias)", rows)
+
+
+if __name__ == "__main__":
+    main()
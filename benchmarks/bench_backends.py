@@ -0,0 +1,57 @@
+# bench_backends.py
+# Compara los dos backends de generación de extremo a extremo: compilar el
+# programa Wax hasta un objeto código y ejecutarlo. "source" genera texto
+# Python y CPython lo vuelve a parsear; "ast" entrega un ast.Module a
+# compile() directamente. También separa el tiempo de la fase de generación.
+# Uso: python benchmarks/bench_backends.py [copias]
+
+import contextlib
+import io
+import sys
+
+from bench_common import big_program, report, timed
+
+from compiler import Compiler, gc_frozen
+from generator import CodeGenerator
+from pyast_generator import PyAstGenerator
+
+
+def compile_and_run(backend, source):
+    result = Compiler(backend).compile(source)
+    assert result.ok
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        exec(result.code_object, {})
+    return out.getvalue()
+
+
+# Igual que en Compiler.compile, la generación del backend "ast" corre
+# con el recolector de ciclos sin recorrer los objetos ya existentes
+# (gc_frozen); el backend "source" no lo necesita.
+def source_backend(ast):
+    return compile(CodeGenerator().generate(ast), "<wax>", "exec")
+
+
+def ast_backend(ast):
+    with gc_frozen():
+        return PyAstGenerator().compile(ast)
+
+
+def main():
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    source = big_program(copies)
+    ast = Compiler().compile(source).ast
+
+    rows = [("backend", "generar+compile (s)", "compilar+ejecutar (s)")]
+    outputs = []
+    for backend, generate in (("source", source_backend), ("ast", ast_backend)):
+        t_gen, _ = timed(generate, ast, repeat=5)
+        t_total, output = timed(compile_and_run, backend, source, repeat=5)
+        outputs.append(output)
+        rows.append((backend, f"{t_gen:.3f}", f"{t_total:.3f}"))
+    assert outputs[0] == outputs[1], "los backends producen salidas distintas"
+    report(f"Backends de generación ({copies} copias, {len(source.splitlines())} líneas)", rows)
+
+
+if __name__ == "__main__":
+    main()
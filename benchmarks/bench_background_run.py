@@ -0,0 +1,125 @@
+# bench_background_run.py
+# Capacidad de respuesta de la GUI mientras corre un programa que sólo
+# calcula: un latido en el hilo principal (cada 10 ms, como un timer del
+# ciclo de eventos de Qt) mide cuánto se atrasa con el programa ejecutado
+# en el mismo hilo (como lo hacía gui.py) y en un ProgramRunner. También
+# mide cuánto tarda cancel() en cortar un ciclo infinito y un input()
+# pendiente, y cuántos avisos de salida recibe la interfaz por un programa
+# que imprime 100k líneas.
+# Uso: python benchmarks/bench_background_run.py [escala]
+
+import sys
+import threading
+import time
+
+from bench_common import report
+
+from compiler import Compiler
+from program_runner import ProgramRunner
+
+TICK = 0.010
+
+CPU_PROGRAM = (
+    "wax total:int = 0;\n"
+    "wax i:int = 0;\n"
+    "while (i < {n}) {{\n"
+    "    total += i % 7;\n"
+    "    i++;\n"
+    "}}\n"
+    "print(str(total));\n"
+)
+
+LOOP_PROGRAM = "wax i:int = 0;\nwhile (true) { i++; }\n"
+INPUT_PROGRAM = "wax nombre:string = input(\"nombre: \");\nprint(nombre);\n"
+PRINT_PROGRAM = "for (wax i:int = 0; i < {n}; i++) {{ print(\"linea \" + str(i)); }}\n"
+
+
+def heartbeat(until):
+    """Latidos cada TICK segundos hasta que until() sea verdadero; devuelve los atrasos."""
+    delays = []
+    expected = time.perf_counter() + TICK
+    while not until():
+        time.sleep(max(0.0, expected - time.perf_counter()))
+        now = time.perf_counter()
+        delays.append(now - expected)
+        expected = now + TICK
+    return delays
+
+
+def start(code_object, on_input=lambda prompt: None):
+    done = threading.Event()
+    runner = ProgramRunner(code_object, lambda: None, on_input, lambda status, error: done.set())
+    runner.start()
+    return runner, done
+
+
+def in_thread(code_object):
+    runner, done = start(code_object)
+    started = time.perf_counter()
+    delays = heartbeat(done.is_set)
+    return time.perf_counter() - started, delays
+
+
+def same_thread(code_object):
+    # El latido no puede correr mientras el programa ocupa el hilo: el
+    # atraso es la duración completa del programa
+    started = time.perf_counter()
+    exec(code_object, {"print": lambda *args: None})
+    elapsed = time.perf_counter() - started
+    return elapsed, [elapsed]
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def cancel_latency(code_object, wait, on_input=lambda prompt: None):
+    runner, done = start(code_object, on_input)
+    time.sleep(wait)
+    started = time.perf_counter()
+    runner.cancel()
+    done.wait(10)
+    assert runner.status == "cancelled", runner.status
+    return time.perf_counter() - started
+
+
+def main():
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    cpu = Compiler().compile(CPU_PROGRAM.format(n=10_000_000 * scale)).code_object
+
+    deadline = time.perf_counter() + 1.0
+    idle = heartbeat(lambda: time.perf_counter() >= deadline)
+    rows = [("forma", "programa (s)", "latidos", "atraso p50 (ms)", "atraso p99 (ms)", "atraso máx (ms)"),
+            ("sin programa", "-", len(idle), f"{percentile(idle, 0.5) * 1000:.2f}",
+             f"{percentile(idle, 0.99) * 1000:.2f}", f"{max(idle) * 1000:.2f}")]
+    for label, run in (("mismo hilo (antes)", same_thread), ("ProgramRunner", in_thread)):
+        elapsed, delays = run(cpu)
+        rows.append((label, f"{elapsed:.2f}", len(delays), f"{percentile(delays, 0.5) * 1000:.2f}",
+                     f"{percentile(delays, 0.99) * 1000:.2f}", f"{max(delays) * 1000:.2f}"))
+    report(f"Latido de 10 ms con un programa de cálculo (intervalo del GIL {sys.getswitchinterval() * 1000:.0f} ms)",
+           rows)
+
+    loop = Compiler().compile(LOOP_PROGRAM).code_object
+    asking = Compiler().compile(INPUT_PROGRAM).code_object
+    t_loop = max(cancel_latency(loop, 0.2) for _ in range(5))
+    t_input = max(cancel_latency(asking, 0.05) for _ in range(5))
+    print(f"  cancel(): ciclo infinito cortado en {t_loop * 1000:.2f} ms, "
+          f"input() pendiente en {t_input * 1000:.2f} ms (peor de 5)")
+
+    # Los avisos llegan a la interfaz, que toma la salida en cada latido
+    lines = 100_000 * scale
+    notices = []
+    chunks = []
+    done = threading.Event()
+    printer = Compiler().compile(PRINT_PROGRAM.format(n=lines)).code_object
+    runner = ProgramRunner(printer, lambda: notices.append(None), lambda prompt: None,
+                           lambda status, error: done.set())
+    runner.start()
+    heartbeat(lambda: chunks.append(runner.take_output()) or done.is_set())
+    text = "".join(chunks) + runner.take_output()
+    assert text.count("\n") == lines, "se perdió salida"
+    print(f"  {lines:,} líneas impresas: {len(notices):,} avisos de salida a la interfaz")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# bench_batch.py
+# Compila un directorio de programas .wax generados de tres formas: un
+# proceso 'main.py' por archivo, 'main.py --batch' con un solo proceso y
+# 'main.py --batch' con un proceso por núcleo. Todo sin caché. Verifica
+# que el resumen del modo batch marca como correctos todos los archivos.
+# Uso: python benchmarks/bench_batch.py [archivos]
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from bench_common import ROOT, report, timed
+
+MAIN = os.path.join(ROOT, "main.py")
+
+
+def generated_program(n):
+    return (
+        f"wax function puntaje{n} : int(a:int, b:int) {{\n"
+        f"    return a * {n % 7 + 1} + b;\n"
+        f"}}\n"
+        f"wax datos:list = [{', '.join(str(n + k) for k in range(n % 13 + 1))}];\n"
+        f"wax total:int = 0;\n"
+        f"for (wax i:int = 0; i < {n % 13 + 1}; i++) {{\n"
+        f"    if (datos[i] % 2 == 0) {{\n"
+        f"        total += puntaje{n}(datos[i], {n});\n"
+        f"    }} else {{\n"
+        f"        total -= 1;\n"
+        f"    }}\n"
+        f"}}\n"
+        f"print(\"total {n} = \" + str(total));\n"
+    )
+
+
+def one_process_per_file(paths):
+    for path in paths:
+        subprocess.run([sys.executable, MAIN, path, "--no-cache"], stdout=subprocess.DEVNULL, check=True)
+
+
+def batch(directory, jobs, summary_path):
+    subprocess.run([sys.executable, MAIN, "--batch", directory, "--no-cache", "-j", str(jobs),
+                    "--summary", summary_path], stdout=subprocess.DEVNULL, check=True)
+    with open(summary_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    cores = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory(prefix="wax-batch-") as directory:
+        sources = os.path.join(directory, "programas")
+        os.mkdir(sources)
+        paths = []
+        for n in range(count):
+            path = os.path.join(sources, f"programa{n:05}.wax")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(generated_program(n))
+            paths.append(path)
+        summary_path = os.path.join(directory, "resumen.json")
+
+        t_single, _ = timed(one_process_per_file, paths, repeat=1)
+        rows = [("forma", "procesos", "tiempo (s)", "archivos/s", "aceleración"),
+                ("un main.py por archivo", count, f"{t_single:.2f}", f"{count / t_single:,.0f}", "1.00x")]
+        for jobs in sorted({1, cores}):
+            elapsed, summary = timed(batch, sources, jobs, summary_path)
+            assert summary["total"] == count and summary["ok"] == count, \
+                f"el modo batch reporta errores: {summary['statuses']}"
+            rows.append((f"--batch -j {jobs}", jobs, f"{elapsed:.2f}", f"{count / elapsed:,.0f}",
+                         f"{t_single / elapsed:.2f}x"))
+    report(f"Compilación por lotes ({count} archivos, {cores} núcleos)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# bench_cache.py
+# Compila los ejemplos del repositorio y un programa grande sin caché, con
+# la caché vacía (compilar + guardar la entrada) y con la entrada ya
+# guardada (leerla y deserializar el objeto código), con y sin -O. La
+# caché se crea en un directorio temporal. Verifica que el programa leído
+# de la caché imprime lo mismo que el recién compilado.
+# Uso: python benchmarks/bench_cache.py [copias]
+
+import contextlib
+import io
+import shutil
+import sys
+import tempfile
+
+from bench_common import big_program, read_example, report, timed
+
+from build_cache import BuildCache
+from compiler import Compiler
+
+
+def run(code_object):
+    out = io.StringIO()
+    stdin, sys.stdin = sys.stdin, io.StringIO("7\n" * 100)
+    try:
+        with contextlib.redirect_stdout(out):
+            exec(code_object, {})
+    finally:
+        sys.stdin = stdin
+    return out.getvalue()
+
+
+def compile_with(cache, source, optimize):
+    return Compiler(optimize=optimize, cache=cache).compile(source)
+
+
+def main():
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    programs = (
+        ("becas.wax", read_example("becas.wax")),
+        ("gestionAlumnos.wax", read_example("gestionAlumnos.wax")),
+        (f"grande ({copies} copias)", big_program(copies)),
+    )
+
+    rows = [("programa", "variante", "sin caché (s)", "guardar (s)", "acierto (s)", "aceleración")]
+    directory = tempfile.mkdtemp(prefix="wax-cache-")
+    try:
+        for name, source in programs:
+            for label, optimize in (("sin -O", False), ("-O", True)):
+                t_plain, plain = timed(compile_with, None, source, optimize)
+
+                def store():
+                    shutil.rmtree(directory, ignore_errors=True)
+                    return compile_with(BuildCache(directory), source, optimize)
+
+                t_store, _ = timed(store)
+                t_hit, cached = timed(compile_with, BuildCache(directory), source, optimize)
+                assert cached.from_cache, f"'{name}' no se leyó de la caché"
+                assert run(cached.code_object) == run(plain.code_object), \
+                    f"'{name}' imprime otra cosa al leerse de la caché"
+                rows.append((name, label, f"{t_plain:.4f}", f"{t_store:.4f}", f"{t_hit:.4f}",
+                             f"{t_plain / t_hit:.1f}x"))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    report("Caché de compilación en disco", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# bench_common.py
+# Utilidades compartidas por los benchmarks: ruta del compilador,
+# medición de tiempos y generación de programas Wax sintéticos.
+
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def timed(func, *args, repeat=3, **kwargs):
+    """Ejecuta 'func' varias veces y devuelve (mejor_tiempo, resultado)."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, result
+
+
+def read_example(name):
+    """Lee uno de los programas .wax de ejemplo del repositorio."""
+    with open(os.path.join(ROOT, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def big_program(copies):
+    """Genera un programa grande repitiendo el cuerpo de 'becas.wax'."""
+    parts = []
+    for n in range(copies):
+        parts.append(
+            f"wax edades{n}:list = [20, 17, 23, 26, 22];\n"
+            f"wax total{n}:int = 0;\n"
+            f"for (wax i:int = 0; i < 5; i++) {{\n"
+            f"    if (edades{n}[i] >= 18 && edades{n}[i] <= 25) {{\n"
+            f"        total{n} += 1;\n"
+            f"    }} else {{\n"
+            f"        print(\"rechazado \" + str(i));\n"
+            f"    }}\n"
+            f"}}\n"
+        )
+    return "".join(parts)
+
+
+def report(title, rows):
+    """Imprime una tabla simple de resultados."""
+    print(f"\n=== {title} ===")
+    for row in rows:
+        print("  " + "  ".join(str(col) for col in row))
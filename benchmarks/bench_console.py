@@ -0,0 +1,155 @@
+# bench_console.py
+# Tiempo de imprimir 1M de líneas en la consola de la GUI. La forma
+# anterior (cada print() une todas las líneas y reemplaza el texto) es
+# cuadrática: se mide con pocas líneas y se extrapola, y eso sin contar
+# el setText ni el repintado. La nueva corre el programa en un
+# ProgramRunner y, unas 30 veces por segundo, pasa su salida por un
+# OutputLog como lo hace gui.OutputConsole; se verifica que el archivo
+# guardado tiene todas las líneas. Si PySide6 está instalado mide también
+# el widget real (plataforma "offscreen").
+# Uso: python benchmarks/bench_console.py [líneas]
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from bench_common import report
+
+from compiler import Compiler
+from output_log import OutputLog
+from program_runner import ProgramRunner
+
+REFRESH = 0.033
+
+PRINT_PROGRAM = "for (wax i:int = 0; i < {n}; i++) {{ print(\"linea \" + str(i)); }}\n"
+
+
+def joined_every_print(code_object):
+    """Lo que hacía gui_print: unir toda la salida después de cada línea."""
+    output_lines = []
+
+    def gui_print(*args):
+        output_lines.append(" ".join(str(arg) for arg in args))
+        current_output = "\n".join(output_lines)
+        return f"--- Ejecutando... ---\n{current_output}"
+
+    exec(code_object, {"print": gui_print})
+    return len(output_lines)
+
+
+def plain(code_object):
+    """Referencia: el mismo programa imprimiendo a una función que no hace nada."""
+    exec(code_object, {"print": lambda *args: None})
+
+
+def refreshed(code_object):
+    """ProgramRunner + OutputLog con un refresco cada REFRESH segundos."""
+    log = OutputLog()
+    done = threading.Event()
+    runner = ProgramRunner(code_object, lambda: None, lambda prompt: None, lambda status, error: done.set())
+    refreshes = 0
+    shown = 0
+    runner.start()
+    while True:
+        finished = done.wait(REFRESH)
+        log.write(runner.take_output())
+        text, truncated = log.take_pending()
+        refreshes += 1
+        shown = max(shown, text.count("\n"))
+        if finished:
+            break
+    return log, refreshes, shown
+
+
+def qt_console(code_object):
+    """El widget real con señales encoladas, o None sin PySide6."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PySide6.QtCore import QEventLoop
+        from PySide6.QtWidgets import QApplication
+    except ImportError:
+        return None
+    from gui import OutputConsole, WorkerSignals
+
+    app = QApplication.instance() or QApplication([])
+    console = OutputConsole()
+    console.show()
+    signals = WorkerSignals()
+    loop = QEventLoop()
+    runner = ProgramRunner(code_object, signals.output_ready.emit, signals.input_requested.emit,
+                           signals.finished.emit)
+
+    def finished(status, error):
+        console.write(runner.take_output())
+        console.flush()
+        loop.quit()
+
+    signals.output_ready.connect(lambda: console.write(runner.take_output()))
+    signals.finished.connect(finished)
+    start = time.perf_counter()
+    runner.start()
+    loop.exec()
+    elapsed = time.perf_counter() - start
+    app.processEvents()
+    return elapsed, console.blockCount(), console.log
+
+
+def count_saved_lines(log):
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    os.close(fd)
+    try:
+        log.save(path)
+        with open(path, encoding="utf-8") as f:
+            return sum(1 for _ in f)
+    finally:
+        os.remove(path)
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    program = Compiler().compile(PRINT_PROGRAM.format(n=lines)).code_object
+
+    rows = [("forma", "líneas", "tiempo (s)", "µs por línea")]
+    # La forma anterior con 5k, 10k y 20k líneas; 1M se extrapola (cuadrática)
+    old = None
+    for n in (5_000, 10_000, 20_000):
+        small = Compiler().compile(PRINT_PROGRAM.format(n=n)).code_object
+        start = time.perf_counter()
+        joined_every_print(small)
+        old = (n, time.perf_counter() - start)
+        rows.append(("unir todo en cada print (antes)", f"{n:,}", f"{old[1]:.2f}", f"{old[1] / n * 1e6:.1f}"))
+    estimate = old[1] * (lines / old[0]) ** 2
+    rows.append(("unir todo en cada print (extrapolado)", f"{lines:,}", f"~{estimate:,.0f}",
+                 f"~{estimate / lines * 1e6:,.0f}"))
+
+    start = time.perf_counter()
+    plain(program)
+    t_plain = time.perf_counter() - start
+    rows.append(("print sin consola (referencia)", f"{lines:,}", f"{t_plain:.2f}", f"{t_plain / lines * 1e6:.2f}"))
+
+    start = time.perf_counter()
+    log, refreshes, shown = refreshed(program)
+    t_log = time.perf_counter() - start
+    rows.append(("ProgramRunner + OutputLog a 30 Hz", f"{lines:,}", f"{t_log:.2f}", f"{t_log / lines * 1e6:.2f}"))
+    assert count_saved_lines(log) == lines, "la salida guardada no tiene todas las líneas"
+    log.close()
+
+    qt = qt_console(program)
+    if qt is not None:
+        t_qt, blocks, qt_log = qt
+        rows.append(("OutputConsole (Qt offscreen)", f"{lines:,}", f"{t_qt:.2f}", f"{t_qt / lines * 1e6:.2f}"))
+        assert count_saved_lines(qt_log) == lines + 1
+        qt_log.close()
+    report(f"Consola de salida: imprimir {lines:,} líneas", rows)
+    print(f"  {refreshes} refrescos; a lo sumo {shown:,} líneas por refresco "
+          f"(la consola conserva {log.max_lines:,})")
+    if qt is None:
+        print("  PySide6 no está instalado: no se midió el widget real")
+    else:
+        print(f"  bloques en el widget al terminar: {blocks:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# bench_cse.py
+# Ciclos con indexación densa: los mismos 'datos[i]' y 'pesos[i]' (y sus
+# productos) se leen en varias sentencias seguidas de cada iteración, y
+# una ventana de vecinos que repite 'serie[i - 1]', 'serie[i]' y
+# 'serie[i + 1]' en cada expresión; cada lista se recorre PASSES veces
+# después de construirla. Se ejecutan sin -O, con -O sin reutilizar
+# subexpresiones comunes y con -O completo, y se verifica que las tres
+# variantes imprimen lo mismo.
+# Uso: python benchmarks/bench_cse.py [n]
+
+import contextlib
+import io
+import sys
+
+from bench_common import report, timed
+
+from compiler import Compiler, gc_frozen
+from optimizer import CommonSubexpressions, Optimizer
+from pyast_generator import PyAstGenerator
+
+# Veces que se recorre la lista ya construida
+PASSES = 5
+
+
+def weighted_program(n):
+    """Dos listas paralelas indexadas varias veces por iteración."""
+    return (
+        "wax datos:list = [];\n"
+        "wax pesos:list = [];\n"
+        f"for (wax j:int = 0; j < {n}; j++) {{\n"
+        "    datos.append(j * 7 % 101);\n"
+        "    pesos.append(j % 13 + 1);\n"
+        "}\n"
+        "wax suma:int = 0;\n"
+        "wax cuadrados:int = 0;\n"
+        "wax maximo:int = 0;\n"
+        f"for (wax r:int = 0; r < {PASSES}; r++) {{\n"
+        f"    for (wax i:int = 0; i < {n}; i++) {{\n"
+        "        suma += datos[i] * pesos[i] + datos[i] % 7;\n"
+        "        cuadrados += datos[i] * pesos[i] * (datos[i] * pesos[i]) % 1000;\n"
+        "        if (datos[i] * pesos[i] > maximo && pesos[i] > 1) { maximo = datos[i]; }\n"
+        "    }\n"
+        "}\n"
+        "print(str(suma) + \" \" + str(cuadrados) + \" \" + str(maximo));\n"
+    )
+
+
+def window_program(n):
+    """Suavizado con una ventana de tres vecinos."""
+    return (
+        "wax serie:list = [];\n"
+        f"for (wax j:int = 0; j < {n}; j++) {{\n"
+        "    serie.append(j * 31 % 97);\n"
+        "}\n"
+        "wax picos:int = 0;\n"
+        "wax total:int = 0;\n"
+        f"for (wax r:int = 0; r < {PASSES}; r++) {{\n"
+        f"    for (wax i:int = 1; i < {n} - 1; i++) {{\n"
+        "        total += serie[i - 1] + serie[i] * 2 + serie[i + 1];\n"
+        "        total += (serie[i] - serie[i - 1]) * (serie[i] - serie[i + 1]) % 10;\n"
+        "        if (serie[i] > serie[i - 1] && serie[i] > serie[i + 1]) { picos++; }\n"
+        "    }\n"
+        "}\n"
+        "print(str(total) + \" \" + str(picos));\n"
+    )
+
+
+class NoCseOptimizer(Optimizer):
+    passes = tuple(p for p in Optimizer.passes if p is not CommonSubexpressions)
+
+
+def build(source, optimizer_class):
+    compiler = Compiler()
+    result = compiler.compile(source)
+    assert result.ok
+    ast = result.ast
+    if optimizer_class is not None:
+        optimizer = optimizer_class(result.symbol_log, compiler.analyzer.function_signatures)
+        ast = optimizer.optimize(ast)
+    with gc_frozen():
+        return PyAstGenerator().compile(ast)
+
+
+def run(code_object):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        exec(code_object, {})
+    return out.getvalue()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    variants = (("sin -O", None), ("-O sin reutilizar", NoCseOptimizer), ("-O", Optimizer))
+
+    rows = [("programa", "variante", "ejecución (s)", "aceleración")]
+    for name, program in (("ponderado", weighted_program), ("ventana", window_program)):
+        source = program(n)
+        outputs = set()
+        baseline = None
+        for label, optimizer_class in variants:
+            code_object = build(source, optimizer_class)
+            elapsed, output = timed(run, code_object)
+            outputs.add(output)
+            baseline = baseline or elapsed
+            rows.append((name, label, f"{elapsed:.3f}", f"{baseline / elapsed:.2f}x"))
+        assert len(outputs) == 1, f"las variantes de '{name}' producen salidas distintas"
+    report(f"Subexpresiones comunes ({n} elementos, {PASSES} recorridos)", rows)
+
+
+if __name__ == "__main__":
+    main()
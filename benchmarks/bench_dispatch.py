@@ -0,0 +1,86 @@
+# bench_dispatch.py
+# Microbenchmark por fase del despacho de los visitantes: tiempo por nodo del
+# análisis semántico y de la generación de código usando la tabla de
+# despacho precalculada contra el despacho anterior (f-string + getattr).
+# Uso: python benchmarks/bench_dispatch.py [copias]
+
+import sys
+
+from bench_common import big_program, report, timed
+
+from compiler import Compiler
+from semantic import SemanticAnalyzer
+from generator import CodeGenerator
+
+
+class GetattrAnalyzer(SemanticAnalyzer):
+    """Despacho anterior del analizador, para comparar."""
+    def _visit(self, node, first_pass=False):
+        if node is None: return
+        if isinstance(node, list):
+            return self._visit_list(node, first_pass)
+        method = getattr(self, f'visit_{node["type"]}', self.generic_visit)
+        return method(node, first_pass=first_pass)
+
+    def _expr_type(self, node):
+        if node is None: return "error"
+        method = getattr(self, f'get_expr_type_{node["type"]}', self.unsupported_expr)
+        return method(node)
+
+
+class GetattrGenerator(CodeGenerator):
+    """Despacho anterior del generador, para comparar."""
+    def _visit(self, node):
+        if node is None:
+            return ""
+        if isinstance(node, list):
+            return self.visit_program(node)
+        method = getattr(self, f'visit_{node["type"]}', self.generic_visit)
+        return method(node)
+
+
+def count_nodes(ast):
+    total = 0
+    stack = list(ast)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (list, tuple)):
+            stack.extend(node)
+        elif node is not None:
+            total += 1
+            stack.extend(node["children"])
+    return total
+
+
+def analyze(cls, ast):
+    analyzer = cls()
+    analyzer.analyze(ast)
+    return analyzer.errors
+
+
+def generate(cls, ast):
+    return cls().generate(ast)
+
+
+def main():
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    result = Compiler().compile(big_program(copies))
+    assert result.ok
+    nodes = count_nodes(result.ast)
+
+    rows = [("fase", "getattr (ns/nodo)", "tabla (ns/nodo)", "reducción")]
+    phases = (
+        ("semántico", analyze, GetattrAnalyzer, SemanticAnalyzer),
+        ("generador", generate, GetattrGenerator, CodeGenerator),
+    )
+    for label, run, old_cls, new_cls in phases:
+        t_old, out_old = timed(run, old_cls, result.ast, repeat=5)
+        t_new, out_new = timed(run, new_cls, result.ast, repeat=5)
+        assert out_old == out_new
+        rows.append((label, f"{t_old / nodes * 1e9:.0f}", f"{t_new / nodes * 1e9:.0f}",
+                     f"{(1 - t_new / t_old) * 100:.1f}%"))
+    report(f"Despacho de visitantes ({nodes} nodos)", rows)
+
+
+if __name__ == "__main__":
+    main()
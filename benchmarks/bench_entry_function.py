@@ -0,0 +1,75 @@
+# bench_entry_function.py
+# Tiempo de ejecución de código de nivel superior con muchos ciclos,
+# generado a nivel de módulo (variables globales, LOAD_NAME/STORE_NAME)
+# contra envuelto en la función de entrada (variables locales rápidas).
+# Uso: python benchmarks/bench_entry_function.py [n]
+
+import contextlib
+import io
+import sys
+
+from bench_common import report, timed
+
+from compiler import Compiler
+from generator import CodeGenerator
+from pyast_generator import PyAstGenerator
+
+
+def top_level_program(n):
+    """Contadores y acumuladores al estilo de becas.wax, todo en el nivel superior."""
+    return (
+        f"wax function doble : int(x:int) {{ return x * 2; }}\n"
+        f"wax limite:int = {n};\n"
+        f"wax i:int = 0;\n"
+        f"wax pares:int = 0;\n"
+        f"wax suma:int = 0;\n"
+        f"while (i < limite) {{\n"
+        f"    if (i % 2 == 0) {{ pares = pares + 1; }} else {{ suma += i; }}\n"
+        f"    i = i + 1;\n"
+        f"}}\n"
+        f"for (wax k:int = 0; k < limite; k++) {{ suma = suma - k % 5; }}\n"
+        f"print(str(pares) + \" \" + str(suma) + \" \" + str(doble(limite)));\n"
+    )
+
+
+class ModuleCodeGenerator(CodeGenerator):
+    wrap_main = False
+
+
+class ModulePyAstGenerator(PyAstGenerator):
+    wrap_main = False
+
+
+def run(code_object):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        # Igual que main.py: el mismo dict como globales y locales
+        scope = {}
+        exec(code_object, scope, scope)
+    return out.getvalue()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    ast = Compiler().compile(top_level_program(n)).ast
+
+    variants = (
+        ("source", "módulo", compile(ModuleCodeGenerator().generate(ast), "<wax>", "exec")),
+        ("source", "función", compile(CodeGenerator().generate(ast), "<wax>", "exec")),
+        ("ast", "módulo", ModulePyAstGenerator().compile(ast)),
+        ("ast", "función", PyAstGenerator().compile(ast)),
+    )
+    rows = [("backend", "nivel superior", "ejecución (s)", "aceleración")]
+    outputs = set()
+    baseline = {}
+    for backend, mode, code_object in variants:
+        elapsed, output = timed(run, code_object)
+        outputs.add(output)
+        baseline.setdefault(backend, elapsed)
+        rows.append((backend, mode, f"{elapsed:.3f}", f"{baseline[backend] / elapsed:.2f}x"))
+    assert len(outputs) == 1, "las variantes producen salidas distintas"
+    report(f"Código de nivel superior ({n} iteraciones)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# bench_exec_pool.py
+# Ejecuta muchos programas cortos ya compilados con límites de CPU y
+# memoria y salida capturada: en un ExecutionPool (workers pre-creados que
+# se reciclan cada cierto número de trabajos) y lanzando un intérprete de
+# Python nuevo por programa con los mismos límites. Verifica que ambas
+# formas capturan la misma salida y que un ciclo infinito se corta.
+# Uso: python benchmarks/bench_exec_pool.py [trabajos]
+
+import marshal
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from bench_common import ROOT, report
+
+from compiler import Compiler
+from exec_pool import DEFAULT_CPU_SECONDS, DEFAULT_MEMORY_BYTES, ExecutionPool
+
+PROGRAMS = 50
+
+# Intérprete nuevo: lee el objeto código (marshal) y la entrada de stdin
+RUNNER = (
+    "import io, marshal, sys\n"
+    "sys.path.insert(0, sys.argv[1])\n"
+    "from runtime import batch_input\n"
+    "data = sys.stdin.buffer.read()\n"
+    "size = int.from_bytes(data[:4], 'little')\n"
+    "code = marshal.loads(data[4:4 + size])\n"
+    "scope = {'input': batch_input(io.StringIO(data[4 + size:].decode()))}\n"
+    "exec(code, scope, scope)\n"
+)
+
+
+def short_program(n):
+    return (
+        "wax nombre:string = input(\"nombre: \");\n"
+        "wax total:int = 0;\n"
+        f"for (wax i:int = 0; i < {n * 10 + 10}; i++) {{\n"
+        f"    if (i % {n % 5 + 2} == 0) {{ total += i; }}\n"
+        "}\n"
+        f"print(nombre + \" {n}: \" + str(total));\n"
+    )
+
+
+def set_limits():
+    resource.setrlimit(resource.RLIMIT_CPU, (DEFAULT_CPU_SECONDS, resource.RLIM_INFINITY))
+    resource.setrlimit(resource.RLIMIT_AS, (DEFAULT_MEMORY_BYTES, resource.RLIM_INFINITY))
+
+
+def fresh_interpreter(code_object, stdin):
+    code = marshal.dumps(code_object)
+    data = len(code).to_bytes(4, "little") + code + stdin.encode()
+    return subprocess.run([sys.executable, "-c", RUNNER, ROOT], input=data, stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE, preexec_fn=set_limits, timeout=30).stdout.decode()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    codes = [Compiler().compile(short_program(n)).code_object for n in range(PROGRAMS)]
+    jobs = [(codes[i % PROGRAMS], f"alumno{i}\n") for i in range(count)]
+
+    start = time.perf_counter()
+    with ExecutionPool() as pool:
+        t_startup = time.perf_counter() - start
+        start = time.perf_counter()
+        results = pool.map(jobs)
+        t_pool = time.perf_counter() - start
+        loop = Compiler().compile("wax i:int = 0;\nwhile (true) { i++; }\n").code_object
+        pool.timeout = 3
+        runaway = pool.run(loop)
+        stats = dict(pool.stats)
+    assert all(result.ok for result in results), [r for r in results if not r.ok][:3]
+    assert runaway.status in ("cpu_limit", "timeout"), runaway
+
+    # El intérprete nuevo es mucho más lento: se mide una muestra
+    sample = jobs[:max(1, count // 20)]
+    start = time.perf_counter()
+    outputs = [fresh_interpreter(*job) for job in sample]
+    t_fresh = (time.perf_counter() - start) * count / len(sample)
+    assert outputs == [result.stdout for result in results[:len(sample)]], \
+        "el pool captura otra salida que el intérprete nuevo"
+
+    rows = [("forma", "tiempo (s)", "trabajos/s", "aceleración"),
+            (f"intérprete nuevo por programa (estimado de {len(sample)})", f"{t_fresh:.2f}",
+             f"{count / t_fresh:,.0f}", "1.00x"),
+            (f"ExecutionPool ({pool.size} workers)", f"{t_pool:.2f}", f"{count / t_pool:,.0f}",
+             f"{t_fresh / t_pool:.1f}x")]
+    report(f"Ejecución aislada ({count} programas cortos)", rows)
+    print(f"  arranque del pool: {t_startup:.3f} s | workers creados: {stats['spawned']}, "
+          f"reciclados: {stats['recycled']}, matados: {stats['killed']}")
+    print(f"  ciclo infinito: {runaway.status} en {runaway.seconds:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# bench_for_range.py
+# Tiempo de ejecución de un programa dominado por ciclos 'for' de Wax,
+# traducidos a 'for ... in range()' contra la traducción con while, con
+# ambos backends. Verifica que las salidas coinciden.
+# Uso: python benchmarks/bench_for_range.py [n]
+
+import contextlib
+import io
+import sys
+
+from bench_common import report, timed
+
+from compiler import Compiler
+from generator import CodeGenerator
+from pyast_generator import PyAstGenerator
+
+
+def loop_program(n):
+    """Ciclos anidados con sumas, módulos y acceso a listas."""
+    return (
+        f"wax n:int = {n};\n"
+        f"wax total:int = 0;\n"
+        f"wax datos:list = [];\n"
+        f"for (wax i:int = 0; i < 100; i++) {{ datos.append(i * 3 % 7); }}\n"
+        f"for (wax i:int = 0; i < n; i++) {{\n"
+        f"    for (wax j:int = 0; j < 100; j++) {{\n"
+        f"        total += datos[j] + i % 3;\n"
+        f"    }}\n"
+        f"}}\n"
+        f"for (wax k:int = n; k > 0; k -= 2) {{ total = total - 1; }}\n"
+        f"print(str(total));\n"
+    )
+
+
+class WhileCodeGenerator(CodeGenerator):
+    lower_range_loops = False
+
+
+class WhilePyAstGenerator(PyAstGenerator):
+    lower_range_loops = False
+
+
+def run(code_object):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        exec(code_object, {})
+    return out.getvalue()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    ast = Compiler().compile(loop_program(n)).ast
+
+    variants = (
+        ("source", "while", compile(WhileCodeGenerator().generate(ast), "<wax>", "exec")),
+        ("source", "range", compile(CodeGenerator().generate(ast), "<wax>", "exec")),
+        ("ast", "while", WhilePyAstGenerator().compile(ast)),
+        ("ast", "range", PyAstGenerator().compile(ast)),
+    )
+    rows = [("backend", "ciclos", "ejecución (s)", "aceleración")]
+    outputs = set()
+    baseline = {}
+    for backend, loops, code_object in variants:
+        elapsed, output = timed(run, code_object)
+        outputs.add(output)
+        baseline.setdefault(backend, elapsed)
+        rows.append((backend, loops, f"{elapsed:.3f}", f"{baseline[backend] / elapsed:.2f}x"))
+    assert len(outputs) == 1, "las variantes producen salidas distintas"
+    report(f"Ciclos for ({n} x 100 iteraciones)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# bench_inline.py
+# Programas dominados por llamadas a funciones pequeñas (un predicado como
+# 'enRango' de gestionAlumnos.wax y funciones aritméticas de una línea)
+# ejecutados sin -O, con -O sin expandir funciones y con -O completo.
+# Verifica que las tres variantes imprimen lo mismo.
+# Uso: python benchmarks/bench_inline.py [n]
+
+import contextlib
+import io
+import sys
+
+from bench_common import report, timed
+
+from compiler import Compiler, gc_frozen
+from optimizer import FunctionInliner, Optimizer
+from pyast_generator import PyAstGenerator
+
+
+def predicate_program(n):
+    """Predicado de rango llamado dos veces por iteración."""
+    return (
+        "wax function enRango : bool(valor:int, minimo:int, maximo:int) {\n"
+        "    if (valor < minimo || valor > maximo) {\n"
+        "        return false;\n"
+        "    }\n"
+        "    return true;\n"
+        "}\n"
+        "wax validos:int = 0;\n"
+        f"for (wax i:int = 0; i < {n}; i++) {{\n"
+        "    wax nota:int = i * 7 % 130;\n"
+        "    if (enRango(nota, 0, 100) && enRango(i % 120, 0, 100)) { validos++; }\n"
+        "}\n"
+        "print(str(validos));\n"
+    )
+
+
+def arithmetic_program(n):
+    """Funciones aritméticas anidadas con argumentos compuestos."""
+    return (
+        "wax function cuadrado : int(x:int) { return x * x; }\n"
+        "wax function distancia : int(a:int, b:int) { return cuadrado(a - b); }\n"
+        "wax function mezcla : int(a:int, b:int, c:int) { return distancia(a, b) + distancia(b, c) % 7; }\n"
+        "wax total:int = 0;\n"
+        f"for (wax i:int = 0; i < {n}; i++) {{\n"
+        "    total += mezcla(i % 10, i % 7 + 1, i % 3) % 1000;\n"
+        "}\n"
+        "print(str(total));\n"
+    )
+
+
+class NoInlineOptimizer(Optimizer):
+    passes = tuple(p for p in Optimizer.passes if p is not FunctionInliner)
+
+
+def build(source, optimizer_class):
+    compiler = Compiler()
+    result = compiler.compile(source)
+    assert result.ok
+    ast = result.ast
+    if optimizer_class is not None:
+        optimizer = optimizer_class(result.symbol_log, compiler.analyzer.function_signatures)
+        ast = optimizer.optimize(ast)
+    with gc_frozen():
+        return PyAstGenerator().compile(ast)
+
+
+def run(code_object):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        exec(code_object, {})
+    return out.getvalue()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    variants = (("sin -O", None), ("-O sin expandir", NoInlineOptimizer), ("-O", Optimizer))
+
+    rows = [("programa", "variante", "ejecución (s)", "aceleración")]
+    for name, program in (("predicado", predicate_program), ("aritmética", arithmetic_program)):
+        source = program(n)
+        outputs = set()
+        baseline = None
+        for label, optimizer_class in variants:
+            code_object = build(source, optimizer_class)
+            elapsed, output = timed(run, code_object)
+            outputs.add(output)
+            baseline = baseline or elapsed
+            rows.append((name, label, f"{elapsed:.3f}", f"{baseline / elapsed:.2f}x"))
+        assert len(outputs) == 1, f"las variantes de '{name}' producen salidas distintas"
+    report(f"Expansión de funciones en línea ({n} iteraciones)", rows)
+
+
+if __name__ == "__main__":
+    main()
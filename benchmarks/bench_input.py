@@ -0,0 +1,70 @@
+# bench_input.py
+# Reproduce un archivo de entrada grabado (1M de líneas por defecto) con
+# 'main.py --execute' en un proceso aparte: con input() interactivo, con
+# --input batch y con --input batch --no-prompts, todos con --output
+# buffered. Verifica que los modos interactivo y batch imprimen lo mismo
+# y que sin mensajes sólo faltan los mensajes.
+# Uso: python benchmarks/bench_input.py [entradas]
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from bench_common import ROOT, report, timed
+
+PROMPT = "nota: "
+
+
+def replay_program(count):
+    return (
+        "wax aprobados:int = 0;\n"
+        "wax leidas:int = 0;\n"
+        f"for (wax i:int = 0; i < {count}; i++) {{\n"
+        f"    wax linea:string = input(\"{PROMPT}\");\n"
+        "    leidas++;\n"
+        "    if (linea == \"A\" || linea == \"B\") { aprobados++; }\n"
+        "}\n"
+        "print(str(leidas) + \" leídas, \" + str(aprobados) + \" aprobadas\");\n"
+    )
+
+
+def run(program, input_path, options):
+    command = [sys.executable, os.path.join(ROOT, "main.py"), program, "--execute", "--no-cache",
+               "--output", "buffered"] + options
+    with open(input_path, "rb") as stdin:
+        return subprocess.run(command, stdin=stdin, stdout=subprocess.PIPE, check=True).stdout
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    variants = (
+        ("interactive", []),
+        ("batch", ["--input", "batch"]),
+        ("batch --no-prompts", ["--input", "batch", "--no-prompts"]),
+    )
+
+    rows = [("modo", "tiempo (s)", "entradas/s", "aceleración")]
+    with tempfile.TemporaryDirectory(prefix="wax-input-") as directory:
+        program = os.path.join(directory, "replay.wax")
+        with open(program, "w", encoding="utf-8") as f:
+            f.write(replay_program(count))
+        input_path = os.path.join(directory, "entrada.txt")
+        with open(input_path, "w", encoding="utf-8") as f:
+            f.writelines("ABCDF"[i % 5] + "\n" for i in range(count))
+
+        outputs = {}
+        baseline = None
+        for label, options in variants:
+            elapsed, outputs[label] = timed(run, program, input_path, options)
+            baseline = baseline or elapsed
+            rows.append((label, f"{elapsed:.3f}", f"{count / elapsed:,.0f}", f"{baseline / elapsed:.2f}x"))
+
+    assert outputs["interactive"] == outputs["batch"], "el modo batch imprime otra cosa"
+    assert outputs["batch"].replace(PROMPT.encode(), b"") == outputs["batch --no-prompts"], \
+        "sin mensajes la salida debe ser la misma sin los mensajes"
+    report(f"Entrada del programa ({count} entradas, proceso completo)", rows)
+
+
+if __name__ == "__main__":
+    main()
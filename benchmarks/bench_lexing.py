@@ -0,0 +1,76 @@
+# bench_lexing.py
+# Compara el flujo anterior (tokenizar para el reporte y volver a tokenizar
+# dentro del parser) contra el TokenStream de una sola pasada, y comprueba
+# con un lexer instrumentado (sólo aquí) que en una compilación cada
+# carácter se recorre una sola vez.
+# Uso: python benchmarks/bench_lexing.py
+
+from bench_common import big_program, report, timed
+
+from lexer import lexer, TokenStream
+from parser import parser
+
+
+def two_pass(data):
+    lexer.input(data)
+    token_list = []
+    while True:
+        tok = lexer.token()
+        if not tok:
+            break
+        token_list.append(tok)
+    lexer.lineno = 1
+    return parser.parse(data, lexer=lexer)
+
+
+def single_pass(data, lexer=lexer):
+    stream = TokenStream(lexer)
+    stream.input(data)
+    ast = parser.parse(lexer=lexer, tokenfunc=stream.token)
+    return stream, ast
+
+
+class CountingLexer:
+    """
+    Clon del lexer que cuenta las llamadas a input() ('passes') y los
+    caracteres que avanza cada token() ('chars_scanned'), incluidas las que
+    haga el parser. Envuelve sólo al clon de este benchmark.
+    """
+    def __init__(self):
+        self.lexer = lexer.clone()
+        self.passes = 0
+        self.chars_scanned = 0
+        self._input, self._token = self.lexer.input, self.lexer.token
+        self.lexer.input, self.lexer.token = self.input, self.token
+
+    def input(self, data):
+        self.passes += 1
+        self._input(data)
+
+    def token(self):
+        lex = self.lexer
+        start = lex.lexpos
+        tok = self._token()
+        # Al llegar al final PLY adelanta 'lexpos' una posición extra
+        self.chars_scanned += min(lex.lexpos, lex.lexlen) - start
+        return tok
+
+
+def main():
+    rows = [("copias", "caracteres", "2 pasadas (s)", "1 pasada (s)", "recorridos")]
+    for copies in (100, 1000, 5000):
+        data = big_program(copies)
+        t_old, _ = timed(two_pass, data)
+        t_new, _ = timed(single_pass, data)
+        # Cada carácter se recorre exactamente una vez por compilación,
+        # contando también lo que el parser le pida al lexer
+        counting = CountingLexer()
+        single_pass(data, counting.lexer)
+        assert counting.passes == 1, counting.passes
+        assert counting.chars_scanned == len(data), (counting.chars_scanned, len(data))
+        rows.append((copies, len(data), f"{t_old:.3f}", f"{t_new:.3f}", counting.chars_scanned))
+    report("Léxico: dos pasadas vs TokenStream", rows)
+
+
+if __name__ == "__main__":
+    main()
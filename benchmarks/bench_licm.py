@@ -0,0 +1,102 @@
+# bench_licm.py
+# Ciclos con expresiones que no cambian entre iteraciones: un 'while'
+# cuya condición recalcula 'limite * 2' y llama a una función pura con
+# argumentos fijos, y dos 'for' anidados que recalculan un desplazamiento
+# en cada vuelta. Se ejecutan sin -O, con -O sin sacar invariantes y con
+# -O completo, y se verifica que las tres variantes imprimen lo mismo.
+# Uso: python benchmarks/bench_licm.py [n]
+
+import contextlib
+import io
+import sys
+
+from bench_common import report, timed
+
+from compiler import Compiler, gc_frozen
+from optimizer import LoopInvariants, Optimizer
+from pyast_generator import PyAstGenerator
+
+
+def while_program(n):
+    """Condición con 'limite * 2' y una llamada pura (que no se expande)."""
+    return (
+        "wax function raiz : int(x:int) {\n"
+        "    wax r:int = 0;\n"
+        "    while ((r + 1) * (r + 1) <= x) { r++; }\n"
+        "    return r;\n"
+        "}\n"
+        "wax limite:int = 0;\n"
+        f"limite = {n};\n"
+        "wax escala:int = 0;\n"
+        "escala = 400;\n"
+        "wax k:int = 0;\n"
+        "wax suma:int = 0;\n"
+        "while (k % 1000 < raiz(escala) + 980 && k < limite * 2) {\n"
+        "    suma += k % 7;\n"
+        "    k++;\n"
+        "}\n"
+        "print(str(suma));\n"
+    )
+
+
+def nested_program(n):
+    """Desplazamiento de fila recalculado en el ciclo interno."""
+    return (
+        "wax ancho:int = 0;\n"
+        "ancho = 100;\n"
+        "wax base:int = 0;\n"
+        "base = 7;\n"
+        "wax total:int = 0;\n"
+        f"for (wax fila:int = 0; fila < {n // 100}; fila++) {{\n"
+        "    for (wax col:int = 0; col < ancho; col++) {\n"
+        "        total += (fila * ancho + base * 3) % 11 + col;\n"
+        "    }\n"
+        "}\n"
+        "print(str(total));\n"
+    )
+
+
+class NoLicmOptimizer(Optimizer):
+    passes = tuple(p for p in Optimizer.passes if p is not LoopInvariants)
+
+
+def build(source, optimizer_class):
+    compiler = Compiler()
+    result = compiler.compile(source)
+    assert result.ok
+    ast = result.ast
+    if optimizer_class is not None:
+        optimizer = optimizer_class(result.symbol_log, compiler.analyzer.function_signatures)
+        ast = optimizer.optimize(ast)
+    with gc_frozen():
+        return PyAstGenerator().compile(ast)
+
+
+def run(code_object):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        exec(code_object, {})
+    return out.getvalue()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    variants = (("sin -O", None), ("-O sin invariantes", NoLicmOptimizer), ("-O", Optimizer))
+
+    rows = [("programa", "variante", "ejecución (s)", "aceleración")]
+    for name, program in (("while", while_program), ("for anidados", nested_program)):
+        source = program(n)
+        outputs = set()
+        baseline = None
+        for label, optimizer_class in variants:
+            code_object = build(source, optimizer_class)
+            elapsed, output = timed(run, code_object)
+            outputs.add(output)
+            baseline = baseline or elapsed
+            rows.append((name, label, f"{elapsed:.3f}", f"{baseline / elapsed:.2f}x"))
+        assert len(outputs) == 1, f"las variantes de '{name}' producen salidas distintas"
+    report(f"Expresiones invariantes de ciclos ({n} iteraciones)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# bench_optimizer.py
+# Programa generado a partir de una plantilla (constantes de configuración,
+# bloques 'if (DEBUG)', funciones auxiliares que casi nunca se usan y
+# contadores que nadie lee), con y sin -O. Compara el tamaño del código
+# generado, el tiempo del optimizador, el de generación+compile() (backend
+# ast) y el de ejecución, y verifica que la salida es la misma.
+# Uso: python benchmarks/bench_optimizer.py [copias]
+
+import contextlib
+import io
+import sys
+
+from bench_common import report, timed
+
+from compiler import Compiler, gc_frozen
+from generator import CodeGenerator
+from optimizer import Optimizer
+from pyast_generator import PyAstGenerator
+
+
+def template_program(copies):
+    parts = [
+        "wax DEBUG:bool = false;\n"
+        "wax MIN_EDAD:int = 10 + 8;\n"
+        "wax MAX_EDAD:int = MIN_EDAD + 7;\n"
+        "wax ESCALA:double = 1 / 4;\n"
+    ]
+    for n in range(copies):
+        parts.append(
+            f"wax function ayuda{n} : int(x:int) {{\n"
+            f"    if (DEBUG) {{ print(\"ayuda{n}\"); }}\n"
+            f"    return x * {n};\n"
+            f"}}\n"
+            f"wax edades{n}:list = [20, 17, 23, 26, 22];\n"
+            f"wax aceptados{n}:int = 0;\n"
+            f"wax revisados{n}:int = 0;\n"
+            f"for (wax i:int = 0; i < 5; i++) {{\n"
+            f"    revisados{n} += 1;\n"
+            f"    if (DEBUG || !(edades{n}[i] >= MIN_EDAD && edades{n}[i] <= MAX_EDAD)) {{\n"
+            f"        if (DEBUG) {{ print(\"rechazado \" + str(i)); }}\n"
+            f"    }} else {{\n"
+            f"        aceptados{n} += 1;\n"
+            f"    }}\n"
+            f"}}\n"
+            f"if (aceptados{n} * ESCALA > 100) {{ print(str(ayuda{n}(aceptados{n}))); }}\n"
+        )
+    parts.append("print(\"listo\");\n")
+    return "".join(parts)
+
+
+def run(code_object):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        exec(code_object, {})
+    return out.getvalue()
+
+
+def optimize(result):
+    with gc_frozen():
+        optimizer = Optimizer(result.symbol_log)
+        return optimizer.optimize(result.ast), optimizer.stats
+
+
+def backend(ast):
+    with gc_frozen():
+        return PyAstGenerator().compile(ast)
+
+
+def main():
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    source = template_program(copies)
+    result = Compiler().compile(source)
+    assert result.ok
+
+    t_opt, (optimized, stats) = timed(optimize, result)
+    rows = [("variante", "líneas Python", "optimizar (s)", "generar+compile (s)", "ejecutar (s)")]
+    outputs = set()
+    for label, ast, t_pass in (("sin -O", result.ast, 0.0), ("-O", optimized, t_opt)):
+        t_back, code_object = timed(backend, ast)
+        t_run, output = timed(run, code_object)
+        outputs.add(output)
+        lines = len(CodeGenerator().generate(ast).splitlines())
+        rows.append((label, lines, f"{t_pass:.3f}", f"{t_back:.3f}", f"{t_run:.3f}"))
+    assert len(outputs) == 1, "las variantes producen salidas distintas"
+    rows.append(("", f"plegadas={stats.get('folded', 0)}", f"propagadas={stats.get('propagated', 0)}",
+                 f"nodos eliminados={stats.get('removed', 0)}"))
+    report(f"Optimizador ({copies} copias de la plantilla)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# bench_output.py
+# Programa que imprime muchas líneas de reporte, ejecutado con
+# 'main.py --execute' en un proceso aparte con la salida redirigida a un
+# archivo y a un pipe, en modo interactivo (una escritura por línea) y en
+# modo buffered (--output buffered). Verifica que ambos modos escriben
+# exactamente lo mismo.
+# Uso: python benchmarks/bench_output.py [líneas]
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from bench_common import ROOT, report, timed
+
+from runtime import OUTPUT_MODES
+
+
+def report_program(lines):
+    return (
+        "wax total:int = 0;\n"
+        f"for (wax i:int = 0; i < {lines}; i++) {{\n"
+        "    total += i % 97;\n"
+        "    print(\"alumno \" + str(i) + \": acumulado \" + str(total));\n"
+        "}\n"
+    )
+
+
+def command(path, mode):
+    return [sys.executable, os.path.join(ROOT, "main.py"), path, "--execute", "--no-cache",
+            "--output", mode]
+
+
+def to_file(path, mode, out_path):
+    with open(out_path, "wb") as out:
+        subprocess.run(command(path, mode), stdout=out, stdin=subprocess.DEVNULL, check=True)
+    with open(out_path, "rb") as f:
+        return f.read()
+
+
+def to_pipe(path, mode):
+    return subprocess.run(command(path, mode), stdout=subprocess.PIPE, stdin=subprocess.DEVNULL,
+                          check=True).stdout
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    rows = [("destino", "modo", "tiempo (s)", "líneas/s", "aceleración")]
+    with tempfile.TemporaryDirectory(prefix="wax-output-") as directory:
+        path = os.path.join(directory, "reporte.wax")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(report_program(lines))
+        out_path = os.path.join(directory, "salida.txt")
+
+        for target, run in (("archivo", lambda mode: to_file(path, mode, out_path)),
+                            ("pipe", lambda mode: to_pipe(path, mode))):
+            outputs = set()
+            baseline = None
+            for mode in OUTPUT_MODES:
+                elapsed, output = timed(run, mode)
+                outputs.add(output)
+                baseline = baseline or elapsed
+                rows.append((target, mode, f"{elapsed:.3f}", f"{lines / elapsed:,.0f}",
+                             f"{baseline / elapsed:.2f}x"))
+            assert len(outputs) == 1, f"los modos escriben salidas distintas a {target}"
+    report(f"Salida del programa ({lines} líneas, proceso completo)", rows)
+
+
+if __name__ == "__main__":
+    main()
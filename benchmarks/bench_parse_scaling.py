@@ -0,0 +1,46 @@
+# bench_parse_scaling.py
+# Verifica que el tiempo de parsing crece de forma lineal con el número de
+# elementos de una lista literal y con el número de sentencias de un bloque.
+# Uso: python benchmarks/bench_parse_scaling.py [max_elementos]
+
+import sys
+
+from bench_common import report, timed
+
+from lexer import lexer, TokenStream
+from parser import parser
+
+
+def list_program(n):
+    items = ", ".join(str(i % 100) for i in range(n))
+    return f"wax edades:list = [{items}];\n"
+
+
+def statements_program(n):
+    return "wax total:int = 0;\n" + "total += 1;\n" * n
+
+
+def parse(data):
+    stream = TokenStream(lexer)
+    stream.input(data)
+    return parser.parse(lexer=lexer, tokenfunc=stream.token)
+
+
+def scale(title, make_program, sizes):
+    rows = [("n", "tiempo (s)", "ns/elemento")]
+    for n in sizes:
+        data = make_program(n)
+        elapsed, _ = timed(parse, data, repeat=1 if n >= 100000 else 3)
+        rows.append((n, f"{elapsed:.3f}", f"{elapsed / n * 1e9:.0f}"))
+    report(title, rows)
+
+
+def main():
+    max_items = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    sizes = [n for n in (1000, 10000, 100000, 1000000) if n <= max_items]
+    scale("Lista literal de N elementos", list_program, sizes)
+    scale("Bloque de N sentencias", statements_program, sizes)
+
+
+if __name__ == "__main__":
+    main()
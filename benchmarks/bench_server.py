@@ -0,0 +1,116 @@
+# bench_server.py
+# Latencia por petición del servidor de compilación (compile_server.py)
+# contra invocaciones en frío de 'main.py': compilar y compilar+ejecutar
+# 'becas.wax' con 'main.py', con 'wax_client.py' (un proceso cliente por
+# petición) y con peticiones directas por el socket (una conexión abierta),
+# más varias conexiones concurrentes. Todo sin caché de compilación.
+# Verifica que el cliente y el servidor escriben lo mismo que main.py.
+# Uso: python benchmarks/bench_server.py [peticiones]
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from bench_common import ROOT, report
+
+from compile_protocol import Connection
+
+PROGRAM = "becas.wax"
+STDIN = "Ana\n"
+CLIENTS = 8
+
+
+def latencies(func, count):
+    """Lista de 'count' latencias (ms) de func()."""
+    times = []
+    for _ in range(count):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def command(script, flags, socket_path):
+    return [sys.executable, os.path.join(ROOT, script)] + \
+        (["--socket", socket_path] if script == "wax_client.py" else []) + [PROGRAM, "--no-cache"] + flags
+
+
+def run_cli(script, flags, socket_path):
+    return subprocess.run(command(script, flags, socket_path), cwd=ROOT, input=STDIN.encode(),
+                          stdout=subprocess.PIPE, check=True).stdout
+
+
+def direct(connection, op, flags):
+    response = connection.request({"op": op, "argv": [PROGRAM, "--no-cache"] + flags,
+                                   "cwd": ROOT, "stdin": STDIN})
+    assert response["ok"], response
+    return response
+
+
+def start_server(socket_path):
+    server = subprocess.Popen([sys.executable, os.path.join(ROOT, "compile_server.py"),
+                               "--socket", socket_path, "--no-cache"], stdout=subprocess.PIPE)
+    server.stdout.readline()    # "Servidor de compilación escuchando en ..."
+    return server
+
+
+def concurrent(socket_path, flags, per_client):
+    def client():
+        with Connection(socket_path) as connection:
+            for _ in range(per_client):
+                direct(connection, "run", flags)
+
+    threads = [threading.Thread(target=client) for _ in range(CLIENTS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return CLIENTS * per_client / (time.perf_counter() - start)
+
+
+def row(label, times):
+    return (label, f"{statistics.median(times):.2f}", f"{min(times):.2f}", f"{max(times):.2f}")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with tempfile.TemporaryDirectory(prefix="wax-server-") as directory:
+        socket_path = os.path.join(directory, "wax.sock")
+        server = start_server(socket_path)
+        try:
+            rows = [("forma", "mediana (ms)", "mín (ms)", "máx (ms)")]
+            with Connection(socket_path) as connection:
+                for label, flags in (("compilar", []), ("compilar+ejecutar", ["--execute"])):
+                    expected = run_cli("main.py", flags, socket_path)
+                    assert run_cli("wax_client.py", flags, socket_path) == expected, \
+                        f"wax_client.py escribe otra cosa ({label})"
+                    if flags:
+                        output = "".join(text for _, text in direct(connection, "run", flags)["output"])
+                        assert output.encode() == expected, \
+                            "la operación run escribe otra cosa"
+
+                    rows.append(row(f"main.py ({label})",
+                                    latencies(lambda: run_cli("main.py", flags, socket_path), count)))
+                    rows.append(row(f"wax_client.py ({label})",
+                                    latencies(lambda: run_cli("wax_client.py", flags, socket_path), count)))
+                    op = "run" if flags else "compile"
+                    rows.append(row(f"socket, op {op} ({label})",
+                                    latencies(lambda: direct(connection, op, flags), count * 10)))
+            throughput = concurrent(socket_path, ["--execute"], count * 5)
+            with Connection(socket_path) as connection:
+                connection.request({"op": "shutdown"})
+            server.wait(timeout=10)
+        finally:
+            if server.poll() is None:
+                server.kill()
+    report(f"Servidor de compilación ('{PROGRAM}', sin caché)", rows)
+    print(f"  {CLIENTS} conexiones concurrentes (op run): {throughput:,.0f} peticiones/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# bench_startup.py
+# Mide el tiempo de arranque en frío de 'import parser' y de 'main.py --help'
+# en tres modos: tablas precalculadas (normal), WAX_DEBUG=1 y sin tablas
+# (PLY regenera lextab/parsetab en cada arranque).
+# Uso: python benchmarks/bench_startup.py [repeticiones]
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_common import ROOT, report
+
+TABLES = ("lextab.py", "parsetab.py")
+
+
+def run(cmd, cwd, env, before=None):
+    if before:
+        before()
+    start = time.perf_counter()
+    subprocess.run(cmd, cwd=cwd, env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def best(cmd, cwd, env, repeat, before=None):
+    return min(run(cmd, cwd, env, before) for _ in range(repeat))
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    debug_env = dict(env, WAX_DEBUG="1")
+
+    # Copia del compilador sin tablas para simular el arranque sin caché
+    tmp = tempfile.mkdtemp(prefix="wax_startup_")
+    for name in os.listdir(ROOT):
+        if name.endswith(".py") and name not in TABLES:
+            shutil.copy(os.path.join(ROOT, name), tmp)
+
+    def drop_tables():
+        for name in TABLES + ("parser.out",):
+            path = os.path.join(tmp, name)
+            if os.path.exists(path):
+                os.remove(path)
+
+    commands = {
+        "import parser": [sys.executable, "-c", "import parser"],
+        "main.py --help": [sys.executable, "main.py", "--help"],
+    }
+    rows = [("comando", "tablas (ms)", "WAX_DEBUG=1 (ms)", "sin tablas (ms)")]
+    try:
+        for label, cmd in commands.items():
+            normal = best(cmd, ROOT, env, repeat)
+            debug = best(cmd, ROOT, debug_env, repeat)
+            cold = best(cmd, tmp, env, repeat, before=drop_tables)
+            rows.append((label, f"{normal * 1000:.0f}", f"{debug * 1000:.0f}", f"{cold * 1000:.0f}"))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    report(f"Arranque en frío (mejor de {repeat})", rows)
+
+
+if __name__ == "__main__":
+    main()
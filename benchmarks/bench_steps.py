@@ -0,0 +1,163 @@
+# bench_steps.py
+# Costo del presupuesto de pasos (--max-steps): programas con ciclos
+# 'while', 'for' anidados con forma de contador, funciones pequeñas
+# llamadas en un ciclo, llamadas recursivas y el programa de becas
+# repetido, ejecutados sin instrumentar y con un presupuesto que no se
+# agota (backends "ast" y "source"), alternando las dos versiones para que
+# el ruido de la máquina afecte a ambas por igual. Verifica que la salida
+# es la misma, compara contra contar pasos con sys.settrace y mide cuánto
+# tarda en cortarse un ciclo infinito.
+# Uso: python benchmarks/bench_steps.py [escala]
+
+import contextlib
+import io
+import sys
+import time
+
+from bench_common import big_program, report, timed
+
+from compiler import Compiler
+from runtime import StepLimitExceeded
+
+BUDGET = 10 ** 12
+ROUNDS = 9
+
+
+def while_program(n):
+    """Máximo común divisor por restas: casi todo el tiempo en un 'while'."""
+    return (
+        "wax total:int = 0;\n"
+        f"for (wax n:int = 1; n < {n}; n++) {{\n"
+        "    wax a:int = n % 1000 + 1000;\n"
+        "    wax b:int = n % 97 + 1;\n"
+        "    while (a != b) {\n"
+        "        if (a > b) { a -= b; } else { b -= a; }\n"
+        "    }\n"
+        "    total += a;\n"
+        "}\n"
+        "print(str(total));\n"
+    )
+
+
+def nested_for_program(n):
+    """Dos 'for' anidados con un ciclo interno corto: sin presupuesto son
+    range(); con presupuesto toman un paso por vuelta."""
+    return (
+        "wax datos:list = [3, 1, 4, 1, 5, 9, 2, 6, 5, 3];\n"
+        "wax total:int = 0;\n"
+        f"for (wax i:int = 0; i < {n}; i++) {{\n"
+        "    for (wax j:int = 0; j < 10; j++) {\n"
+        "        if (datos[j] > datos[(i + j) % 10]) { total += j; }\n"
+        "    }\n"
+        "}\n"
+        "print(str(total));\n"
+    )
+
+
+def helpers_program(n):
+    """Funciones pequeñas llamadas en un ciclo (un paso por llamada)."""
+    return (
+        "wax function en_rango:bool(x:int, a:int, b:int) {\n"
+        "    return x >= a && x <= b;\n"
+        "}\n"
+        "wax function pondera:int(x:int) {\n"
+        "    if (en_rango(x, 18, 25)) { return x * 2; }\n"
+        "    return x;\n"
+        "}\n"
+        "wax total:int = 0;\n"
+        "wax i:int = 0;\n"
+        f"while (i < {n}) {{\n"
+        "    total += pondera(i % 40);\n"
+        "    i++;\n"
+        "}\n"
+        "print(str(total));\n"
+    )
+
+
+def recursive_program(n):
+    """Fibonacci recursivo: una función mínima, el peor caso (un paso por llamada)."""
+    return (
+        "wax function fib:int(n:int) {\n"
+        "    if (n < 2) { return n; }\n"
+        "    return fib(n - 1) + fib(n - 2);\n"
+        "}\n"
+        f"print(str(fib({n})));\n"
+    )
+
+
+def run(code_object):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        exec(code_object, {})
+    return out.getvalue()
+
+
+def best_of_both(plain, counted):
+    """Mejor tiempo de cada objeto código, ejecutándolos por turnos."""
+    best = [float("inf"), float("inf")]
+    outputs = [None, None]
+    for _ in range(ROUNDS):
+        for i, code_object in enumerate((plain, counted)):
+            start = time.perf_counter()
+            outputs[i] = run(code_object)
+            best[i] = min(best[i], time.perf_counter() - start)
+    return best, outputs
+
+
+def traced(code_object):
+    """Cuenta un paso por cada línea ejecutada con sys.settrace (la alternativa)."""
+    steps = 0
+
+    def trace(frame, event, arg):
+        nonlocal steps
+        if event == "line":
+            steps += 1
+        return trace
+
+    sys.settrace(trace)
+    try:
+        return run(code_object)
+    finally:
+        sys.settrace(None)
+
+
+def main():
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    programs = [
+        ("while (mcd por restas)", while_program(20000 * scale)),
+        ("for anidados", nested_for_program(100000 * scale)),
+        ("funciones en un ciclo", helpers_program(200000 * scale)),
+        ("llamadas (fib recursivo)", recursive_program(24 + scale)),
+        ("becas.wax x2000", big_program(2000 * scale)),
+    ]
+    rows = [("programa", "backend", "sin límite (s)", "con límite (s)", "sobrecosto")]
+    for label, source in programs:
+        for backend in ("ast", "source"):
+            plain = Compiler(backend).compile(source).code_object
+            counted = Compiler(backend, step_budget=BUDGET).compile(source).code_object
+            (t_plain, t_counted), (expected, output) = best_of_both(plain, counted)
+            assert output == expected, f"el código instrumentado imprime otra cosa ({label}, {backend})"
+            rows.append((label, backend, f"{t_plain:.3f}", f"{t_counted:.3f}",
+                         f"{(t_counted / t_plain - 1) * 100:+.1f}%"))
+        if label.startswith("while"):
+            t_traced, output = timed(traced, plain, repeat=1)
+            assert output == expected
+            rows.append((label, "sys.settrace", f"{t_plain:.3f}", f"{t_traced:.3f}",
+                         f"{(t_traced / t_plain - 1) * 100:+.1f}%"))
+    report("Presupuesto de pasos (--max-steps)", rows)
+
+    runaway = Compiler(step_budget=10 ** 7).compile("wax i:int = 0;\nwhile (true) { i++; }\n").code_object
+    t_runaway, error = timed(lambda: _stopped(runaway), repeat=1)
+    print(f"  ciclo infinito con 10M pasos: {error} en {t_runaway:.2f} s")
+
+
+def _stopped(code_object):
+    try:
+        run(code_object)
+    except StepLimitExceeded as e:
+        return f"{type(e).__name__}: {e}"
+    raise AssertionError("el ciclo infinito no se detuvo")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# bench_symbol_table.py
+# Mide el análisis semántico de un programa con 200 niveles de bloques
+# anidados y 100k referencias a variables globales, comparando la tabla de
+# símbolos plana contra la anterior (una lista de dicts recorrida en reversa).
+# Uso: python benchmarks/bench_symbol_table.py [niveles] [referencias]
+
+import sys
+
+from bench_common import report, timed
+
+from compiler import Compiler
+from semantic import SemanticAnalyzer
+
+
+class ChainedScopesAnalyzer(SemanticAnalyzer):
+    """SemanticAnalyzer con la tabla de símbolos anterior, para comparar."""
+    def __init__(self):
+        super().__init__()
+        self.symbol_table = [{name: stack[-1] for name, stack in self.bindings.items()}]
+
+    def enter_scope(self, scope_name):
+        self.symbol_table.append({})
+        self.scope_stack.append(scope_name)
+
+    def exit_scope(self):
+        self.symbol_table.pop()
+        self.scope_stack.pop()
+
+    def add_symbol(self, name, symbol_info, lineno):
+        current_scope = self.symbol_table[-1]
+        if name in current_scope:
+            self._error(f"El símbolo '{name}' ya ha sido declarado en este alcance.", lineno)
+            return False
+        current_scope[name] = {'type_info': symbol_info, 'scope': self.scope_stack[-1]}
+        self.symbol_log.append({'name': name, 'type_info': self.format_type(symbol_info),
+                                'scope': self.scope_stack[-1], 'line': lineno})
+        return True
+
+    def get_symbol(self, name, lineno):
+        for scope in reversed(self.symbol_table):
+            if name in scope:
+                return scope[name]['type_info']
+        self._error(f"El símbolo '{name}' no ha sido declarado.", lineno)
+        return None
+
+    def update_symbol_type(self, name, new_type):
+        for scope in reversed(self.symbol_table):
+            if name in scope:
+                scope[name]['type_info'] = new_type
+                return True
+        return False
+
+
+def nested_program(depth, references):
+    lines = ["wax total:int = 0;", "wax paso:int = 1;"]
+    for level in range(depth):
+        lines.append(f"if (total >= 0) {{ wax nivel{level}:int = {level};")
+    # Cada sentencia hace dos referencias a variables globales
+    lines.extend(["total = total + paso;"] * (references // 2))
+    lines.append("}" * depth)
+    return "\n".join(lines) + "\n"
+
+
+def analyze(analyzer_class, ast):
+    analyzer = analyzer_class()
+    analyzer.analyze(ast)
+    return analyzer
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    references = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    result = Compiler().compile(nested_program(depth, references))
+    assert result.ast and not result.syntax_errors
+
+    rows = [("tabla de símbolos", "tiempo (s)", "µs/referencia")]
+    logs = []
+    for label, cls in (("lista de ámbitos", ChainedScopesAnalyzer), ("plana (O(1))", SemanticAnalyzer)):
+        elapsed, analyzer = timed(analyze, cls, result.ast)
+        assert not analyzer.errors, analyzer.errors[:3]
+        logs.append(analyzer.symbol_log)
+        rows.append((label, f"{elapsed:.3f}", f"{elapsed / references * 1e6:.2f}"))
+    assert logs[0] == logs[1]
+    report(f"{depth} niveles de anidamiento, {references} referencias", rows)
+
+
+if __name__ == "__main__":
+    main()
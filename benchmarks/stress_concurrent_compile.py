@@ -0,0 +1,83 @@
+# stress_concurrent_compile.py
+# Compila cientos de programas distintos en paralelo (un Compiler por hilo)
+# y verifica que cada resultado coincide exactamente con el de la
+# compilación en serie. Incluye programas con errores sintácticos y
+# semánticos para ejercitar también el reporte de errores.
+# Uso: python benchmarks/stress_concurrent_compile.py [programas] [hilos]
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bench_common  # noqa: F401  (agrega la raíz del proyecto a sys.path)
+
+from compiler import Compiler
+
+
+def make_program(n):
+    """Programa distinto para cada 'n'; algunos tienen errores a propósito."""
+    body = (
+        f"wax function f{n} : int(a:int, b:int) {{\n"
+        f"    return a * {n % 7 + 1} + b;\n"
+        f"}}\n"
+        f"wax datos{n}:list = [{', '.join(str(n + k) for k in range(n % 13 + 1))}];\n"
+        f"wax total:int = 0;\n"
+        f"for (wax i:int = 0; i < {n % 13 + 1}; i++) {{\n"
+        f"    total += f{n}(datos{n}[i], {n});\n"
+        f"}}\n"
+        f"print(\"total {n} = \" + str(total));\n"
+    )
+    if n % 10 == 3:
+        body += "if (total > 0) {\n    print(\"sin cerrar\");\n"  # falta '}'
+    elif n % 10 == 7:
+        body += f"wax malo{n}:int = \"texto\";\n"  # error semántico
+    return body
+
+
+def snapshot(result):
+    """Forma comparable (y sin referencias compartidas) de un resultado."""
+    return (
+        [(tok.type, tok.value, tok.lineno, tok.lexpos) for tok in result.tokens],
+        list(result.syntax_errors),
+        list(result.semantic_errors),
+        [dict(entry) for entry in result.symbol_log],
+        result.python_code,
+    )
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    sources = [make_program(n) for n in range(count)]
+
+    serial_compiler = Compiler()
+    start = time.perf_counter()
+    expected = [snapshot(serial_compiler.compile(src)) for src in sources]
+    serial_time = time.perf_counter() - start
+
+    local = threading.local()
+
+    def compile_one(src):
+        if not hasattr(local, "compiler"):
+            local.compiler = Compiler()
+        return snapshot(local.compiler.compile(src))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # Se envía en orden inverso para mezclar programas entre hilos
+        futures = {i: pool.submit(compile_one, sources[i]) for i in reversed(range(count))}
+        actual = [futures[i].result() for i in range(count)]
+    parallel_time = time.perf_counter() - start
+
+    mismatches = [i for i in range(count) if actual[i] != expected[i]]
+    print(f"{count} programas, {workers} hilos: serie {serial_time:.2f}s, paralelo {parallel_time:.2f}s")
+    if mismatches:
+        print(f"✗ {len(mismatches)} resultados distintos (primeros: {mismatches[:10]})")
+        return 1
+    print("✓ Todos los resultados concurrentes coinciden con la compilación en serie.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+# stress_deep_trees.py
+# Compila expresiones y bloques extremadamente profundos para comprobar que
+# el análisis semántico, los generadores y las funciones que imprimen el AST
+# no dependen del límite de recursión de Python.
+# Uso: python benchmarks/stress_deep_trees.py [terminos] [niveles_de_bloque] [niveles_por_la_derecha]
+
+import contextlib
+import io
+import sys
+import time
+
+import bench_common  # noqa: F401  (agrega la raíz del proyecto a sys.path)
+
+from compiler import Compiler, BACKENDS
+from semantic import SemanticAnalyzer
+from generator import CodeGenerator
+from optimizer import Optimizer
+from pyast_generator import PyAstGenerator
+from main import print_ast
+
+
+def left_chain(terms):
+    """wax total:int = 1 + 2 + ... ; cadena asociada por la izquierda."""
+    expr = " + ".join(str(n % 10) for n in range(terms))
+    return f"wax total:int = {expr};\nprint(str(total));\n", sum(n % 10 for n in range(terms))
+
+
+def logic_chain(terms):
+    """Cadena de || con cortocircuito: sólo el último operando es true."""
+    expr = " || ".join(["false"] * (terms - 1) + ["true"])
+    return f"wax ok:bool = {expr};\nprint(str(ok));\n", True
+
+
+def right_nesting(depth):
+    """1 + (1 + (1 + ...)) y !!!...b: anidamiento por la derecha."""
+    expr = "1 + (" * (depth - 1) + "1" + ")" * (depth - 1)
+    return (
+        f"wax total:int = {expr};\n"
+        f"wax b:bool = {'!' * depth}true;\n"
+        f"wax n:int = {'- ' * depth}1;\n"
+    )
+
+
+def nested_blocks(depth):
+    """if (true) { if (true) { ... } } con 'depth' niveles."""
+    return "if (true) {\n" * depth + "print(\"fondo\");\n" + "}\n" * depth
+
+
+def check_run(label, source, backend, expected, optimize=False):
+    """Compila con 'backend' hasta un objeto código, lo ejecuta y verifica lo que imprime."""
+    if optimize:
+        backend += " -O"
+    start = time.perf_counter()
+    result = Compiler(backend.split()[0], optimize).compile(source)
+    elapsed = time.perf_counter() - start
+    if not result.ok:
+        print(f"✗ {label} [{backend}]: {result.syntax_errors or result.semantic_errors or result.generator_error}")
+        return False
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        exec(result.code_object, {})
+    value = out.getvalue().strip()
+    if value != str(expected):
+        print(f"✗ {label} [{backend}]: resultado {value!r}, se esperaba {expected!r}")
+        return False
+    print(f"✓ {label} [{backend}]: compilado en {elapsed:.2f}s, ejecutado correctamente")
+    return True
+
+
+def check_passes(label, source):
+    """
+    Sólo nuestras fases (semántico, optimizador y ambos generadores, sin compile()):
+    CPython no puede compilar anidamientos tan profundos, pero nuestro
+    compilador debe recorrerlos sin recursión.
+    """
+    start = time.perf_counter()
+    result = Compiler().compile(source)
+    if result.syntax_errors or result.semantic_errors:
+        print(f"✗ {label}: {result.syntax_errors or result.semantic_errors}")
+        return False
+    analyzer = SemanticAnalyzer()
+    analyzer.analyze(result.ast)
+    Optimizer(result.symbol_log).optimize(result.ast)
+    code = CodeGenerator().generate(result.ast)
+    PyAstGenerator().generate(result.ast)
+    elapsed = time.perf_counter() - start
+    print(f"✓ {label}: analizado y generado en {elapsed:.2f}s, {len(code) / 1e6:.1f} MB de Python")
+    return True
+
+
+def main():
+    terms = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    blocks = int(sys.argv[2]) if len(sys.argv) > 2 else 1_500
+    nesting = int(sys.argv[3]) if len(sys.argv) > 3 else 50_000
+    ok = True
+
+    for backend in BACKENDS:
+        for optimize in (False, True):
+            source, expected = left_chain(terms)
+            ok &= check_run(f"cadena '+' de {terms} términos", source, backend, expected, optimize)
+            source, expected = logic_chain(terms)
+            ok &= check_run(f"cadena '||' de {terms} términos", source, backend, expected, optimize)
+
+    # (El código generado crece más que linealmente con la profundidad del
+    # anidamiento y de los bloques, por eso se usan tamaños menores.)
+    ok &= check_passes(f"anidamiento por la derecha de {nesting} niveles", right_nesting(nesting))
+    ok &= check_passes(f"{blocks} bloques 'if' anidados", nested_blocks(blocks))
+
+    # Impresión del AST: más profundo que el límite de recursión por defecto
+    ast = Compiler().compile(nested_blocks(blocks)).ast
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        print_ast(ast)
+    print(f"✓ print_ast: {out.getvalue().count(chr(10))} líneas con {blocks} niveles")
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
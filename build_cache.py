@@ -0,0 +1,331 @@
+# build_cache.py
+# Caché en disco de los resultados de compilación, direccionada por
+# contenido: la clave es un hash del código fuente, de las opciones que
+# cambian la salida (backend, -O, nombre de archivo de los tracebacks) y de
+# la versión del compilador. Si el archivo .wax no cambió, main.py salta
+# directo a la ejecución sin pasar por el lexer, el parser, el analizador
+# ni el generador.
+#
+# Cada entrada es un archivo con el registro de símbolos, los errores, las
+# estadísticas del optimizador, el código Python (si ya se había generado),
+# el objeto código y el AST en forma plana (ver ast_nodes.flatten_tree),
+# todo serializado con marshal: a diferencia de pickle, leer una entrada no
+# puede crear objetos arbitrarios ni llamar a nada. El AST y los tokens se
+# reconstruyen sólo si alguien los pide (--ast, --tokens, --code con el
+# backend "ast").
+#
+# El objeto código de una entrada se ejecuta, así que sólo se confía en
+# lo que escribió el mismo usuario: el directorio se crea con permisos
+# 0700 y se rechaza cualquier entrada de otro dueño.
+#
+# Las escrituras son atómicas (archivo temporal + os.replace), así que
+# varios procesos pueden usar el mismo directorio a la vez: un lector ve
+# la entrada completa o no la ve. Cada lectura actualiza la fecha de
+# modificación de la entrada; cuando el directorio pasa de 'max_bytes' se
+# borran primero las menos usadas recientemente (LRU). Cualquier error de
+# E/S deja la caché sin efecto: nunca impide compilar.
+#
+# Los aciertos y fallos de todos los procesos se acumulan en el archivo
+# 'stats' del directorio: dos enteros de 8 bytes que cada proceso lee,
+# incrementa y vuelve a escribir con el archivo bloqueado (fcntl.lockf).
+# lockf sólo excluye a otros procesos: dentro de uno (los hilos del
+# servidor de compilación comparten una BuildCache) lo hace un lock.
+# Sin fcntl (Windows) dos procesos a la vez pueden perder alguna cuenta.
+
+import hashlib
+import importlib.util
+import marshal
+import os
+import struct
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:     # Windows
+    fcntl = None
+
+from ast_nodes import flatten_tree, rebuild_tree
+from compiler import CompilationResult
+
+# Cambiarlo invalida todas las entradas (formato del archivo)
+CACHE_FORMAT = 2
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Módulos cuyo contenido define la "versión" del compilador: cualquier
+# cambio en ellos produce claves nuevas
+COMPILER_MODULES = (
+    "ast_nodes.py", "lexer.py", "lextab.py", "parser.py", "parsetab.py",
+    "semantic.py", "scope_analysis.py", "loop_analysis.py", "optimizer.py",
+    "generator.py", "pyast_generator.py", "compiler.py", "build_cache.py",
+)
+
+ENTRY_SUFFIX = ".wxc"
+
+# Archivo de contadores: aciertos y fallos como dos enteros sin signo
+STATS_FILE = "stats"
+STATS_RECORD = struct.Struct("<QQ")
+STATS_FIELDS = ("hits", "misses")
+
+_version = None
+
+
+def compiler_version():
+    """
+    Hash de los módulos del compilador y de la versión del bytecode de
+    Python (marshal no es portable entre versiones). None si no se pueden
+    leer los módulos (por ejemplo, en un ejecutable empaquetado).
+    """
+    global _version
+    if _version is None:
+        digest = hashlib.sha256()
+        digest.update(f"{CACHE_FORMAT}:".encode())
+        digest.update(importlib.util.MAGIC_NUMBER)
+        base = os.path.dirname(os.path.abspath(__file__))
+        try:
+            for name in COMPILER_MODULES:
+                with open(os.path.join(base, name), "rb") as f:
+                    digest.update(name.encode())
+                    digest.update(f.read())
+        except OSError:
+            _version = ""
+        else:
+            _version = digest.hexdigest()
+    return _version or None
+
+
+def default_directory():
+    """$WAX_CACHE_DIR, o 'wax' dentro de $XDG_CACHE_HOME (~/.cache)."""
+    directory = os.environ.get("WAX_CACHE_DIR")
+    if directory:
+        return directory
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "wax")
+
+
+class BuildCache:
+    """
+    Caché de CompilationResult en 'directory'. 'stats' cuenta lo que pasó
+    en este proceso: 'hits', 'misses', 'stores' y 'evicted'. Los totales
+    de todos los procesos se leen con totals().
+    """
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or default_directory()
+        self.max_bytes = max_bytes
+        self.version = compiler_version()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evicted": 0}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.version is not None
+
+    def key(self, source, filename, backend, optimize, step_budget=None, entry_function=True):
+        digest = hashlib.sha256()
+        for part in (self.version, backend, "O" if optimize else "-", filename):
+            digest.update(part.encode("utf-8", "surrogatepass"))
+            digest.update(b"\0")
+        if step_budget is not None:
+            # Sólo el código instrumentado cambia de clave; las demás siguen igual
+            digest.update(f"steps={step_budget}\0".encode())
+        if not entry_function:
+            digest.update(b"entry=0\0")
+        digest.update(source.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    # --- LECTURA ---
+
+    def load(self, source, filename, backend, optimize, step_budget=None, entry_function=True):
+        """El CompilationResult guardado para esta compilación, o None."""
+        if not self.enabled:
+            return None
+        path = self.path(self.key(source, filename, backend, optimize, step_budget, entry_function))
+        try:
+            with open(path, "rb") as f:
+                if not self.trusted(os.fstat(f.fileno())):
+                    # No se borra: tampoco es nuestra para borrarla
+                    self.count("misses")
+                    return None
+                entry = marshal.load(f)
+            if entry.get("format") != CACHE_FORMAT:
+                raise ValueError("formato distinto")
+            result = self.result_from_entry(source, entry)
+            result.step_budget = step_budget
+            result.entry_function = entry_function
+        except FileNotFoundError:
+            self.count("misses")
+            return None
+        except Exception:
+            # Entrada corrupta o de otra versión: se descarta
+            self.discard(path)
+            self.count("misses")
+            return None
+        try:
+            os.utime(path)      # orden LRU
+        except OSError:
+            pass
+        self.count("hits")
+        return result
+
+    def result_from_entry(self, source, entry):
+        result = CompilationResult(source)
+        result.syntax_errors = entry["syntax_errors"]
+        result.semantic_errors = entry["semantic_errors"]
+        result.symbol_log = entry["symbol_log"]
+        result.optimizer_stats = entry["optimizer_stats"]
+        result.python_code = entry["python_code"]
+        if entry["code"] is not None:
+            result.code_object = marshal.loads(entry["code"])
+        trees = entry["trees"]
+        result.load_trees(lambda: [None if tree is None else rebuild_tree(marshal.loads(tree))
+                                   for tree in trees])
+        result.from_cache = True
+        return result
+
+    # --- ESCRITURA ---
+
+    def store(self, result, filename, backend, optimize, step_budget=None, entry_function=True):
+        """Guarda 'result' (salvo que el generador haya fallado)."""
+        if not self.enabled or result.generator_error is not None:
+            return
+        trees = (result.ast, result.optimized_ast)
+        entry = {
+            "format": CACHE_FORMAT,
+            "syntax_errors": result.syntax_errors,
+            "semantic_errors": result.semantic_errors,
+            "symbol_log": result.symbol_log,
+            "optimizer_stats": result.optimizer_stats,
+            # Con el backend "ast" el texto se genera sólo si alguien lo pidió
+            "python_code": result._python_code,
+            "code": None if result.code_object is None else marshal.dumps(result.code_object),
+            "trees": [None if tree is None else marshal.dumps(flatten_tree(tree))
+                      for tree in trees],
+        }
+        path = self.path(self.key(result.source, filename, backend, optimize, step_budget,
+                                  entry_function))
+        try:
+            self.make_directory()
+            data = marshal.dumps(entry)
+        except ValueError:
+            return      # un valor que marshal no sabe guardar: no se cachea
+        except OSError:
+            return
+        try:
+            fd, temp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-", suffix=ENTRY_SUFFIX)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(temp, path)
+            except BaseException:
+                self.discard(temp)
+                raise
+        except OSError:
+            return
+        with self._stats_lock:
+            self.stats["stores"] += 1
+        self.evict()
+
+    def evict(self):
+        """Borra las entradas usadas hace más tiempo hasta quedar bajo 'max_bytes'."""
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.directory) as it:
+                for item in it:
+                    if item.name.endswith(ENTRY_SUFFIX) and not item.name.startswith("."):
+                        try:
+                            info = item.stat()
+                        except OSError:
+                            continue
+                        entries.append((info.st_mtime, info.st_size, item.path))
+                        total += info.st_size
+        except OSError:
+            return
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if self.discard(path):
+                with self._stats_lock:
+                    self.stats["evicted"] += 1
+            total -= size
+
+    def make_directory(self):
+        """Crea el directorio sólo para este usuario (los permisos no se
+        tocan si ya existía)."""
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+
+    @staticmethod
+    def trusted(info):
+        """True si el archivo con este os.stat() es del usuario actual."""
+        return not hasattr(os, "getuid") or info.st_uid == os.getuid()
+
+    def discard(self, path):
+        try:
+            os.unlink(path)
+            return True
+        except OSError:
+            return False
+
+    # --- ESTADÍSTICAS ---
+
+    def count(self, key):
+        """
+        Suma 1 a 'hits' o 'misses' en este proceso y en el archivo de
+        contadores del directorio, que siempre mide 16 bytes.
+        """
+        with self._stats_lock:
+            self.stats[key] += 1
+            self._count_shared(key)
+
+    def _count_shared(self, key):
+        try:
+            self.make_directory()
+            fd = os.open(os.path.join(self.directory, STATS_FILE), os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o600)
+            try:
+                if fcntl is not None:
+                    fcntl.lockf(fd, fcntl.LOCK_EX)     # se suelta al cerrar
+                counts = dict(zip(STATS_FIELDS, self.read_stats(fd)))
+                counts[key] += 1
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.write(fd, STATS_RECORD.pack(*(counts[field] for field in STATS_FIELDS)))
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+
+    @staticmethod
+    def read_stats(fd):
+        """(aciertos, fallos) del archivo de contadores; ceros si está vacío."""
+        os.lseek(fd, 0, os.SEEK_SET)
+        data = os.read(fd, STATS_RECORD.size)
+        if len(data) != STATS_RECORD.size:
+            return (0,) * len(STATS_FIELDS)
+        return STATS_RECORD.unpack(data)
+
+    def totals(self):
+        """Aciertos, fallos, entradas y bytes acumulados en el directorio."""
+        totals = {"hits": 0, "misses": 0, "entries": 0, "bytes": 0}
+        try:
+            fd = os.open(os.path.join(self.directory, STATS_FILE), os.O_RDONLY | getattr(os, "O_BINARY", 0))
+            try:
+                totals.update(zip(STATS_FIELDS, self.read_stats(fd)))
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+        try:
+            with os.scandir(self.directory) as it:
+                for item in it:
+                    if item.name.endswith(ENTRY_SUFFIX) and not item.name.startswith("."):
+                        totals["entries"] += 1
+                        totals["bytes"] += item.stat().st_size
+        except OSError:
+            pass
+        return totals
@@ -0,0 +1,40 @@
+# build_tables.py
+# Regenera las tablas precalculadas del compilador ('lextab.py' y 'parsetab.py').
+# Debe ejecutarse después de modificar las reglas de 'lexer.py' o la gramática
+# de 'parser.py'. Con --debug también escribe el reporte 'parser.out'.
+
+import os
+import sys
+import argparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TABLES = ("lextab.py", "parsetab.py")
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Regenera lextab.py y parsetab.py.")
+    arg_parser.add_argument("--debug", action="store_true", help="Escribe también 'parser.out'.")
+    args = arg_parser.parse_args()
+    if args.debug:
+        os.environ["WAX_DEBUG"] = "1"
+
+    for name in TABLES:
+        path = os.path.join(HERE, name)
+        if os.path.exists(path):
+            os.remove(path)
+
+    # Al importarse, lexer.py y parser.py regeneran las tablas que faltan
+    # (lextab.py con la firma de las reglas). En modo depuración el lexer
+    # se construye por reflexión, así que 'lextab.py' se escribe aparte.
+    import lexer
+    import parser
+
+    if lexer.WAX_DEBUG:
+        lexer.write_lextab(lexer.lexer, HERE)
+
+    for name in TABLES:
+        print(f"✓ {name}")
+    if args.debug:
+        print("✓ parser.out")
+
+if __name__ == "__main__":
+    sys.exit(main())
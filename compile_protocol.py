@@ -0,0 +1,145 @@
+# compile_protocol.py
+# Protocolo entre el servidor de compilación (compile_server.py) y su
+# cliente (wax_client.py). No importa nada del compilador, para que el
+# cliente arranque sin cargar PLY ni las tablas del parser.
+#
+# Sobre un socket Unix, cada mensaje es un objeto JSON en una sola línea
+# (UTF-8, terminado en "\n"). Una conexión puede enviar varias peticiones;
+# cada una recibe exactamente una respuesta, en orden.
+#
+# Peticiones:
+#   {"op": "ping"}
+#       -> {"ok": true, "pid": ..., "magic": "<MAGIC_NUMBER en hex>"}
+#   {"op": "compile", "argv": [...flags de main.py...], "cwd": "..."}
+#       -> {"ok": true, "exit": 0|1|2|null, "output": [[1|2, texto], ...],
+#           "run": {...} | null, "isolate": {...} | null,
+#           "code": "<base64>" | null, "magic": "..."}
+#       'output' es lo que main.py escribiría en stdout (1) y stderr (2),
+#       en orden. Con --execute y el programa compilado, 'exit' es null:
+#       'code' es el objeto código (marshal) y 'run' los argumentos de
+#       runtime.run_program(), para ejecutarlo en el proceso del cliente
+#       (con su stdin y su stdout reales); con --isolate, 'isolate' son
+#       los argumentos de exec_pool.run_isolated(). marshal no es portable
+#       entre versiones de Python: si 'magic' no coincide, el cliente no lo
+#       usa.
+#   {"op": "run", "argv": [...], "cwd": "...", "stdin": "..."}
+#       -> {"ok": true, "exit": 0|1|2, "output": [...]}
+#       Compila y ejecuta en el servidor; input() lee las líneas de 'stdin'
+#       (modo batch) y la salida del programa vuelve en 'output'. Se
+#       ejecuta siempre en un ExecutionPool del servidor, con los límites
+#       de la petición o los de por defecto.
+#   {"op": "shutdown"}
+#       -> {"ok": true} y el servidor se detiene.
+# Si la petición no se entiende: {"ok": false, "error": "..."}.
+
+import binascii
+import importlib.util
+import json
+import marshal
+import os
+import socket
+
+SOCKET_ENV = "WAX_SOCKET"
+
+MAGIC = importlib.util.MAGIC_NUMBER.hex()
+
+STDOUT = 1
+STDERR = 2
+
+
+def default_socket_path():
+    """$WAX_SOCKET, o 'wax-<uid>.sock' en $XDG_RUNTIME_DIR (o en el directorio temporal)."""
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    directory = os.environ.get("XDG_RUNTIME_DIR")
+    if not directory:
+        import tempfile     # se importa sólo aquí: cuesta unos ms al arrancar el cliente
+        directory = tempfile.gettempdir()
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(directory, f"wax-{uid}.sock")
+
+
+def send(stream, message):
+    stream.write(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+    stream.flush()
+
+
+def receive(stream):
+    """Siguiente mensaje de 'stream', o None si la conexión se cerró."""
+    line = stream.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+class Connection:
+    """Conexión de un cliente al servidor; se puede usar con 'with'."""
+    def __init__(self, path=None, timeout=None):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(path or default_socket_path())
+        except OSError:
+            self.sock.close()
+            raise
+        self.stream = self.sock.makefile("rwb")
+
+    def request(self, message):
+        send(self.stream, message)
+        response = receive(self.stream)
+        if response is None:
+            raise ConnectionError("el servidor cerró la conexión")
+        return response
+
+    def close(self):
+        self.stream.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class OutputLog:
+    """
+    Registro ordenado de lo que se escribe en stdout y stderr: stream(1) y
+    stream(2) devuelven objetos con write() que se pueden pasar a print().
+    """
+    def __init__(self):
+        self.chunks = []
+
+    def stream(self, fd):
+        return LogStream(self.chunks, fd)
+
+    def output(self):
+        """Lista [[fd, texto], ...] para el campo 'output' de la respuesta."""
+        return [[fd, "".join(parts)] for fd, parts in self.chunks]
+
+
+class LogStream:
+    def __init__(self, chunks, fd):
+        self.chunks = chunks
+        self.fd = fd
+
+    def write(self, text):
+        chunks = self.chunks
+        if chunks and chunks[-1][0] == self.fd:
+            chunks[-1][1].append(text)
+        else:
+            chunks.append((self.fd, [text]))
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+# binascii y no base64: base64 importa 're', que es lo más lento del arranque
+def encode_code(code_object):
+    return binascii.b2a_base64(marshal.dumps(code_object), newline=False).decode("ascii")
+
+
+def decode_code(text):
+    return marshal.loads(binascii.a2b_base64(text))
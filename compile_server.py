@@ -0,0 +1,233 @@
+# compile_server.py
+# Servidor de compilación: un proceso de larga duración que ya tiene
+# cargados el lexer, las tablas del parser y el resto del compilador, y
+# atiende peticiones de compilar (y de compilar y ejecutar) por un socket
+# Unix con el protocolo de compile_protocol.py. Así cada compilación no
+# paga el arranque de Python ni la carga de PLY como 'python main.py'.
+#
+# Cada conexión se atiende en su propio hilo con sus propios Compiler
+# (compiler.py es reentrante), así que varios clientes pueden compilar a
+# la vez. Los flags de cada petición son los de main.py y la salida es la
+# misma que escribiría main.py.
+#
+# La operación "run" nunca ejecuta el programa en el proceso del
+# servidor: un ciclo sin fin se llevaría el servidor y a todos sus
+# clientes. Siempre corre en un ExecutionPool (exec_pool.py) que el
+# servidor mantiene por cada combinación de límites: los de --timeout,
+# --cpu-limit y --memory-limit, o sus valores por defecto aunque la
+# petición no pida --isolate.
+#
+# Uso: python compile_server.py [--socket RUTA] [--no-cache]
+#      python wax_client.py programa.wax --execute
+
+import argparse
+import io
+import os
+import socket
+import socketserver
+import sys
+import threading
+
+from build_cache import BuildCache
+from compile_protocol import (MAGIC, STDERR, STDOUT, OutputLog, default_socket_path,
+                              encode_code, receive, send)
+from compiler import Compiler
+from exec_pool import ExecutionPool, run_isolated
+from main import build_arg_parser, compile_and_report, execution_options, isolation_limits, read_program
+
+
+class ArgumentsExit(Exception):
+    """Un RequestArgumentParser terminó (--help o flags inválidos)."""
+    def __init__(self, status):
+        super().__init__(status)
+        self.status = status
+
+
+class RequestArgumentParser(argparse.ArgumentParser):
+    """
+    ArgumentParser de main.py para una petición: escribe los mensajes en
+    'out'/'err' (los de la respuesta) y en lugar de terminar el proceso
+    lanza ArgumentsExit.
+    """
+    out = None
+    err = None
+
+    def _print_message(self, message, file=None):
+        if message:
+            (self.err if file is sys.stderr else self.out).write(message)
+
+    def exit(self, status=0, message=None):
+        if message:
+            self._print_message(message, sys.stderr)
+        raise ArgumentsExit(status)
+
+
+class CompileHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        compilers = {}      # Compiler de esta conexión por opciones
+        while True:
+            try:
+                request = receive(self.rfile)
+            except ValueError:
+                send(self.wfile, {"ok": False, "error": "JSON inválido"})
+                continue
+            except OSError:
+                return
+            if request is None:
+                return
+            op = request.get("op") if isinstance(request, dict) else None
+            if op == "ping":
+                response = {"ok": True, "pid": os.getpid(), "magic": MAGIC}
+            elif op in ("compile", "run"):
+                response = self.server.compile(request, compilers, run_here=op == "run")
+            elif op == "shutdown":
+                response = {"ok": True}
+            else:
+                response = {"ok": False, "error": f"operación desconocida: {op!r}"}
+            try:
+                send(self.wfile, response)
+            except OSError:
+                return
+            if op == "shutdown":
+                # shutdown() espera a serve_forever(), que corre en otro hilo
+                threading.Thread(target=self.server.shutdown).start()
+                return
+
+
+class CompileServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path=None, cache=True):
+        self.path = path or default_socket_path()
+        self.cache = BuildCache() if cache else None
+        self.pools = {}         # ExecutionPool por límites (--isolate)
+        self.pools_lock = threading.Lock()
+        remove_stale_socket(self.path)
+        super().__init__(self.path, CompileHandler)
+        os.chmod(self.path, 0o600)      # el servidor ejecuta código: sólo el dueño
+
+    def server_close(self):
+        super().server_close()
+        for pool in self.pools.values():
+            pool.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+    def compile(self, request, compilers, run_here=False):
+        log = OutputLog()
+        out, err = log.stream(STDOUT), log.stream(STDERR)
+        response = {"ok": True, "exit": None, "output": None, "run": None, "code": None,
+                    "isolate": None, "magic": MAGIC}
+        try:
+            response["exit"] = self.compile_request(request, compilers, run_here, out, err, response)
+        except ArgumentsExit as e:
+            response["exit"] = e.status
+        except Exception as e:
+            # Un error del compilador no debe tumbar la conexión ni el servidor
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        response["output"] = log.output()
+        return response
+
+    def compile_request(self, request, compilers, run_here, out, err, response):
+        """Hace lo que haría main.py con 'argv'; devuelve el código de salida."""
+        arg_parser = build_arg_parser(RequestArgumentParser)
+        arg_parser.prog = "main.py"
+        arg_parser.out, arg_parser.err = out, err
+        args = arg_parser.parse_args([str(arg) for arg in request.get("argv", [])])
+        if args.batch:
+            arg_parser.error("--batch no está disponible en el servidor (use main.py)")
+        if len(args.filename) > 1:
+            arg_parser.error("sin --batch se compila un solo archivo")
+        if args.max_steps is not None and args.max_steps < 1:
+            arg_parser.error("--max-steps debe ser al menos 1")
+        args.filename = args.filename[0]
+        cwd = request.get("cwd") or ""
+
+        data = read_program(args.filename, os.path.join(cwd, args.filename), out)
+        if data is None:
+            return 1
+
+        key = (args.backend, args.optimize, not args.no_cache, args.max_steps, args.entry_function)
+        compiler = compilers.get(key)
+        if compiler is None:
+            cache = None if args.no_cache else self.cache
+            compiler = compilers[key] = Compiler(args.backend, optimize=args.optimize, cache=cache,
+                                                 step_budget=args.max_steps,
+                                                 entry_function=args.entry_function)
+        result = compile_and_report(compiler, data, args, out, err)
+        if result is None:
+            return 1
+
+        if not args.execute:
+            print("\n✔ Compilación exitosa. Sin errores.", file=out)
+            return 0
+
+        options = execution_options(args)
+        limits = isolation_limits(args)
+        if options["input_file"]:
+            options["input_file"] = os.path.join(cwd, options["input_file"])
+        if not run_here:
+            # El cliente lo ejecuta con su propia entrada y salida
+            response["run"] = options
+            response["isolate"] = limits
+            response["code"] = encode_code(result.code_object)
+            return None
+        if limits is None:
+            # Sin --isolate también se aísla, con los límites por defecto
+            args.isolate = True
+            limits = isolation_limits(args)
+        stdin = io.StringIO(request.get("stdin") or "")
+        return run_isolated(result.code_object, options["input_file"], options["prompts"], stdin,
+                            out, pool=self.pool(limits))
+
+    def pool(self, limits):
+        key = tuple(sorted(limits.items()))
+        with self.pools_lock:
+            pool = self.pools.get(key)
+            if pool is None:
+                pool = self.pools[key] = ExecutionPool(**limits)
+            return pool
+
+
+def remove_stale_socket(path):
+    """Borra el socket de un servidor que ya no existe; error si sigue vivo."""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+    else:
+        raise OSError(f"ya hay un servidor escuchando en '{path}'")
+    finally:
+        probe.close()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Servidor de compilación de Wax.")
+    arg_parser.add_argument("--socket", metavar="RUTA",
+                            help="Socket Unix donde escuchar (por defecto: $WAX_SOCKET o "
+                                 "wax-<uid>.sock en $XDG_RUNTIME_DIR o el directorio temporal).")
+    arg_parser.add_argument("--no-cache", action="store_true",
+                            help="No usa la caché de compilación en disco.")
+    args = arg_parser.parse_args()
+
+    try:
+        server = CompileServer(args.socket, cache=not args.no_cache)
+    except OSError as e:
+        print(f"[Error Crítico] No se pudo abrir el socket: {e}")
+        sys.exit(1)
+    print(f"Servidor de compilación escuchando en {server.path} (pid {os.getpid()})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+# compiler.py
+# Orquesta las fases del compilador (léxico, sintáctico, semántico y
+# generación) sobre una instancia independiente.
+# Cada Compiler tiene su propio lexer clonado, su propio estado de parser y
+# crea un analizador y un generador nuevos por compilación, así que varias
+# instancias pueden compilar en paralelo (por ejemplo, en un pool de hilos)
+# sin compartir estado mutable.
+#
+# Hay dos backends de generación:
+#   "ast"    -> PyAstGenerator construye un ast.Module y se compila directo
+#               a un objeto código (sin volver a parsear texto Python).
+#   "source" -> CodeGenerator produce el texto Python y se compila ese texto.
+# En ambos casos el texto legible queda disponible en 'python_code'.
+#
+# Con optimize=True (flag -O) se ejecuta además el optimizador entre el
+# análisis semántico y la generación; 'result.ast' conserva el AST original
+# y 'result.optimized_ast' el que se generó.
+#
+# Con step_budget=N (main.py --max-steps) el código generado lleva un
+# presupuesto de N pasos: las vueltas de los ciclos y las llamadas a
+# funciones toman pasos, y al agotarse lanza
+# runtime.StepLimitExceeded con la línea del .wax (ver generator.py). Sin
+# presupuesto el código es el de siempre.
+#
+# Con entry_function=True (por defecto) el código de nivel superior se
+# genera dentro de la función de entrada _wax_main() y sus variables son
+# locales rápidas; con False (main.py --no-entry-function) queda a nivel
+# de módulo, como el texto Python que se generaba antes.
+#
+# Con una BuildCache (build_cache.py) el resultado de un código fuente ya
+# compilado con las mismas opciones se lee del disco sin pasar por ninguna
+# fase; sus tokens y su AST se reconstruyen sólo si alguien los pide.
+
+import contextlib
+import copy
+import gc
+import threading
+
+from lexer import lexer as base_lexer, TokenStream
+from parser import parser as base_parser, syntax_error_messages
+from semantic import SemanticAnalyzer
+from generator import CodeGenerator
+from pyast_generator import PyAstGenerator
+from optimizer import Optimizer
+
+BACKENDS = ("ast", "source")
+
+# El backend "ast" crea cientos de miles de objetos sin ciclos (nodos de
+# ast); cada recolección completa revisaría una y otra vez todo el AST de
+# Wax y lo que ya había en el proceso. Durante esa fase los objetos
+# existentes se congelan (gc.freeze): el recolector sigue activo para
+# todos los hilos (también para un programa que se esté ejecutando) y
+# sólo deja de recorrer lo que ya existía. Al terminar la última
+# generación en curso se descongelan. No se usa gc.disable(): apagaría el
+# recolector de todo el proceso mientras cualquier hilo compila.
+# gc.unfreeze() descongela todo, también lo que haya congelado el propio
+# programa que usa el compilador: si al empezar ya había objetos
+# congelados, no se congela ni se descongela nada. El backend "source"
+# genera strings y no gana nada con esto, así que no lo usa.
+_gc_lock = threading.Lock()
+_gc_freezes = 0         # generaciones en curso dentro de gc_frozen()
+_gc_owned = False       # True si el congelamiento actual es nuestro
+
+@contextlib.contextmanager
+def gc_frozen():
+    global _gc_freezes, _gc_owned
+    with _gc_lock:
+        if _gc_freezes == 0:
+            _gc_owned = gc.get_freeze_count() == 0
+        if _gc_owned:
+            gc.freeze()
+        _gc_freezes += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_freezes -= 1
+            if _gc_freezes == 0 and _gc_owned:
+                gc.unfreeze()
+                _gc_owned = False
+
+class CompilationResult:
+    """Resultado de compilar un programa: salida y errores de cada fase."""
+    def __init__(self, source):
+        self.source = source
+        self.syntax_errors = []
+        self.semantic_errors = []
+        self.symbol_log = []
+        self.optimizer_stats = {}   # Qué hizo cada pasada del optimizador
+        self.code_object = None     # Objeto código listo para exec()
+        self.generator_error = None # Excepción del generador, si falló
+        self.from_cache = False     # True si se leyó de una BuildCache
+        self.step_budget = None     # Presupuesto de pasos del código generado
+        self.entry_function = True  # Nivel superior dentro de _wax_main()
+        self._tokens = None
+        self._ast = None
+        self._optimized_ast = None  # AST que usó el generador con -O
+        self._python_code = None
+        self._load_trees = None
+
+    def load_trees(self, loader):
+        """
+        Difiere la reconstrucción de los AST: 'loader()' devuelve
+        [ast, optimized_ast] la primera vez que se pide cualquiera de ellos.
+        """
+        self._load_trees = loader
+
+    def _trees(self):
+        if self._load_trees is not None:
+            self._ast, self._optimized_ast = self._load_trees()
+            self._load_trees = None
+
+    @property
+    def tokens(self):
+        """Tokens del programa (se vuelven a analizar si vienen de la caché)."""
+        if self._tokens is None:
+            stream = TokenStream(base_lexer.clone())
+            stream.input(self.source)
+            self._tokens = stream.tokens
+        return self._tokens
+
+    @tokens.setter
+    def tokens(self, tokens):
+        self._tokens = tokens
+
+    @property
+    def ast(self):
+        self._trees()
+        return self._ast
+
+    @ast.setter
+    def ast(self, ast):
+        self._ast = ast
+
+    @property
+    def optimized_ast(self):
+        self._trees()
+        return self._optimized_ast
+
+    @optimized_ast.setter
+    def optimized_ast(self, ast):
+        self._optimized_ast = ast
+
+    @property
+    def python_code(self):
+        """
+        Código Python legible. Con el backend "ast" se genera sólo cuando
+        alguien lo pide (--code, la pestaña de la GUI).
+        """
+        if self._python_code is None and self.code_object is not None:
+            generator = CodeGenerator(self.step_budget, self.entry_function)
+            self._python_code = generator.generate(self.code_ast)
+        return self._python_code
+
+    @python_code.setter
+    def python_code(self, code):
+        self._python_code = code
+
+    @property
+    def code_ast(self):
+        """AST a partir del cual se genera el código (el optimizado con -O)."""
+        return self.ast if self.optimized_ast is None else self.optimized_ast
+
+    @property
+    def ok(self):
+        """True si el programa pasó todas las fases y hay código generado."""
+        return self.code_object is not None and not self.syntax_errors
+
+
+class Compiler:
+    """
+    Compilador reentrante. Cada hilo debe usar su propia instancia; una
+    misma instancia no se debe usar desde dos hilos a la vez.
+    """
+    def __init__(self, backend="ast", optimize=False, cache=None, step_budget=None,
+                 entry_function=True):
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend desconocido '{backend}' (opciones: {', '.join(BACKENDS)})")
+        if step_budget is not None and step_budget < 1:
+            raise ValueError("El presupuesto de pasos debe ser al menos 1")
+        self.backend = backend
+        self.optimize = optimize
+        self.step_budget = step_budget
+        self.entry_function = entry_function
+        self.cache = cache          # BuildCache opcional
+        # Las tablas LALR (action/goto) son de solo lectura y se comparten;
+        # la pila y el estado del parse quedan en esta copia.
+        self.lexer = base_lexer.clone()
+        self.parser = copy.copy(base_parser)
+        self.parser.errorfunc = self._syntax_error
+        self.analyzer = None
+        self.optimizer = None
+        self.generator = None
+        self._result = None
+
+    def _syntax_error(self, p):
+        self._result.syntax_errors.extend(syntax_error_messages(p, self.parser.symstack))
+
+    def compile(self, source, filename="<wax>"):
+        """
+        Compila 'source' y devuelve un CompilationResult. 'filename' es el
+        nombre que aparece en los tracebacks del programa ejecutado.
+        """
+        if self.cache is not None:
+            result = self.cache.load(source, filename, self.backend, self.optimize, self.step_budget,
+                                     self.entry_function)
+            if result is not None:
+                return result
+        result = self._compile(source, filename)
+        if self.cache is not None:
+            self.cache.store(result, filename, self.backend, self.optimize, self.step_budget,
+                             self.entry_function)
+        return result
+
+    def _compile(self, source, filename):
+        result = CompilationResult(source)
+        result.step_budget = self.step_budget
+        result.entry_function = self.entry_function
+        self._result = result
+
+        # FASE 1: LÉXICO (una sola pasada; el parser reutiliza el buffer)
+        stream = TokenStream(self.lexer)
+        stream.input(source)
+        result.tokens = stream.tokens
+
+        # FASE 2: SINTÁCTICO
+        result.ast = self.parser.parse(lexer=self.lexer, tokenfunc=stream.token)
+        self._result = None
+        if not result.ast:
+            return result
+
+        # FASE 3: SEMÁNTICO
+        self.analyzer = SemanticAnalyzer()
+        self.analyzer.analyze(result.ast)
+        result.semantic_errors = self.analyzer.errors
+        result.symbol_log = self.analyzer.symbol_log
+        if result.semantic_errors:
+            return result
+
+        # OPTIMIZACIÓN (opcional)
+        if self.optimize:
+            self.optimizer = Optimizer(result.symbol_log, self.analyzer.function_signatures)
+            with gc_frozen():
+                result.optimized_ast = self.optimizer.optimize(result.ast)
+            result.optimizer_stats = self.optimizer.stats
+
+        # FASE 4: GENERACIÓN DE CÓDIGO
+        try:
+            if self.backend == "ast":
+                self.generator = PyAstGenerator(self.step_budget, self.entry_function)
+                with gc_frozen():
+                    result.code_object = self.generator.compile(result.code_ast, filename)
+            else:
+                self.generator = CodeGenerator(self.step_budget, self.entry_function)
+                result.python_code = self.generator.generate(result.code_ast)
+                result.code_object = compile(result.python_code, filename, "exec")
+        except Exception as e:
+            result.generator_error = e
+        return result
@@ -0,0 +1,397 @@
+# exec_pool.py
+# Ejecución aislada de programas compilados en un pool de procesos
+# pre-creados. main.py --execute y la GUI ejecutan el objeto código dentro
+# del propio proceso del compilador: un 'while (true)' o un 'append' sin
+# fin se lo llevan entero. Aquí cada programa corre en un proceso worker
+# con:
+#   - límite de tiempo de CPU (RLIMIT_CPU, resolución de 1 s) y de memoria
+#     (RLIMIT_AS) mientras dura el trabajo;
+#   - límite de tiempo real: si no responde a tiempo, el worker se mata;
+#   - stdout y stderr capturados (con un tope de tamaño) y la entrada
+#     servida desde un texto, como en el modo batch de runtime.py.
+#
+# Los workers se crean con el método "forkserver" de multiprocessing: un
+# proceso servidor que ya importó este módulo y runtime.py hace fork de
+# cada worker, así crear uno cuesta poco y es seguro aunque el proceso que
+# usa el pool tenga hilos. Cada worker atiende hasta 'max_jobs' trabajos y
+# se recicla; también se recicla después de superar cualquier límite,
+# porque su estado ya no es confiable. El presupuesto de pasos del código
+# generado con --max-steps es la excepción: el programa se detiene solo
+# (estado "step_limit") y el worker sigue sirviendo. Sólo funciona en
+# sistemas Unix.
+
+import io
+import marshal
+import math
+import multiprocessing
+import os
+import queue
+import select
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None
+
+from runtime import (DEFAULT_CPU_SECONDS, DEFAULT_MEMORY_BYTES, DEFAULT_TIMEOUT, StepLimitExceeded,
+                     batch_input)
+
+DEFAULT_MAX_OUTPUT = 8 * 1024 * 1024    # caracteres de stdout (y de stderr)
+DEFAULT_MAX_JOBS = 200                  # trabajos antes de reciclar un worker
+
+# Estados de un ExecutionResult
+STATUSES = ("ok", "error", "step_limit", "timeout", "cpu_limit", "memory_limit", "output_limit",
+            "crashed")
+
+# Estados después de los cuales el worker sigue siendo confiable
+REUSABLE = ("ok", "error", "step_limit")
+
+
+class CpuLimitExceeded(Exception):
+    pass
+
+
+class OutputLimitExceeded(Exception):
+    pass
+
+
+class ExecutionResult:
+    """
+    Resultado de ejecutar un programa en el pool: 'status' (ver STATUSES),
+    lo que escribió en 'stdout' y 'stderr', el mensaje de la excepción si
+    falló ('error') y el tiempo real que tardó ('seconds').
+    """
+    def __init__(self, status, stdout="", stderr="", error=None, seconds=0.0):
+        self.status = status
+        self.stdout = stdout
+        self.stderr = stderr
+        self.error = error
+        self.seconds = seconds
+
+    @property
+    def ok(self):
+        return self.status == "ok"
+
+    def __repr__(self):
+        return f"ExecutionResult({self.status!r}, error={self.error!r}, seconds={self.seconds:.3f})"
+
+
+# ==============================
+# LADO DEL WORKER
+# ==============================
+
+class CappedOutput(io.StringIO):
+    """StringIO que lanza OutputLimitExceeded al pasar de 'limit' caracteres."""
+    def __init__(self, limit):
+        super().__init__()
+        self.remaining = limit
+
+    def write(self, text):
+        self.remaining -= len(text)
+        if self.remaining < 0:
+            raise OutputLimitExceeded("el programa escribió demasiada salida")
+        return super().write(text)
+
+
+def _cpu_exceeded(signum, frame):
+    raise CpuLimitExceeded("el programa superó su tiempo de CPU")
+
+
+def set_limits(cpu_seconds, memory_bytes):
+    """
+    Fija los límites blandos de CPU y memoria para el trabajo actual y
+    devuelve los anteriores. RLIMIT_CPU cuenta la CPU de todo el proceso,
+    así que el límite es lo ya usado más 'cpu_seconds'.
+    """
+    saved = []
+    if cpu_seconds:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        saved.append((resource.RLIMIT_CPU, resource.getrlimit(resource.RLIMIT_CPU)))
+        _, hard = saved[-1][1]
+        limit = math.ceil(usage.ru_utime + usage.ru_stime + cpu_seconds)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+    if memory_bytes and hasattr(resource, "RLIMIT_AS"):
+        saved.append((resource.RLIMIT_AS, resource.getrlimit(resource.RLIMIT_AS)))
+        _, hard = saved[-1][1]
+        if hard != resource.RLIM_INFINITY:
+            memory_bytes = min(memory_bytes, hard)
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, hard))
+        except (ValueError, OSError):
+            saved.pop()     # sistemas que no aplican RLIMIT_AS (macOS)
+    return saved
+
+
+def restore_limits(saved):
+    for kind, limits in reversed(saved):
+        resource.setrlimit(kind, limits)
+
+
+def run_job(job, limits):
+    """Ejecuta un trabajo (código, entrada, mensajes) y devuelve su resultado como dict."""
+    code_bytes, stdin, prompts = job
+    cpu_seconds, memory_bytes, max_output = limits
+    out, err = CappedOutput(max_output), CappedOutput(max_output)
+    response = {"status": "ok", "error": None}
+    stdout, stderr = sys.stdout, sys.stderr
+    start = time.perf_counter()
+    saved = []
+    try:
+        code_object = marshal.loads(code_bytes)
+        scope = {"input": batch_input(io.StringIO(stdin), prompts)}
+        sys.stdout, sys.stderr = out, err
+        saved = set_limits(cpu_seconds, memory_bytes)
+        exec(code_object, scope, scope)
+    except CpuLimitExceeded as e:
+        response.update(status="cpu_limit", error=str(e))
+    except MemoryError:
+        response.update(status="memory_limit", error="el programa superó su límite de memoria")
+    except OutputLimitExceeded as e:
+        response.update(status="output_limit", error=str(e))
+    except StepLimitExceeded as e:
+        response.update(status="step_limit", error=f"{type(e).__name__}: {e}")
+    except Exception as e:
+        response.update(status="error", error=f"{type(e).__name__}: {e}")
+    finally:
+        restore_limits(saved)
+        sys.stdout, sys.stderr = stdout, stderr
+    response["seconds"] = time.perf_counter() - start
+    response["stdout"] = out.getvalue()
+    response["stderr"] = err.getvalue()
+    return response
+
+
+def worker_main(conn, limits, max_jobs):
+    """Bucle de un worker: atiende trabajos hasta 'max_jobs' o hasta superar un límite."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)    # Ctrl+C lo maneja el proceso que usa el pool
+    signal.signal(signal.SIGXCPU, _cpu_exceeded)
+    for _ in range(max_jobs):
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            return
+        if job is None:
+            return
+        response = run_job(job, limits)
+        conn.send(response)
+        if response["status"] not in REUSABLE:
+            return
+
+
+# ==============================
+# LADO DEL POOL
+# ==============================
+
+class Worker:
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.jobs = 0
+
+
+class ExecutionPool:
+    """
+    Pool de 'workers' procesos (por defecto, uno por núcleo) que ejecutan
+    objetos código con límites. run() se puede llamar desde varios hilos a
+    la vez: cada llamada toma un worker libre o espera a que haya uno.
+    """
+    def __init__(self, workers=None, max_jobs=DEFAULT_MAX_JOBS, timeout=DEFAULT_TIMEOUT,
+                 cpu_seconds=DEFAULT_CPU_SECONDS, memory_bytes=DEFAULT_MEMORY_BYTES,
+                 max_output=DEFAULT_MAX_OUTPUT):
+        if resource is None:
+            raise OSError("la ejecución aislada necesita el módulo 'resource' (sistemas Unix)")
+        self.size = workers or multiprocessing.cpu_count()
+        self.max_jobs = max_jobs
+        self.timeout = timeout
+        self.limits = (cpu_seconds, memory_bytes, max_output)
+        self.context = multiprocessing.get_context("forkserver")
+        # El servidor importa el programa principal y este módulo una vez;
+        # los workers nacen con todo ya cargado
+        self.context.set_forkserver_preload(["__main__", __name__])
+        self.stats = {"jobs": 0, "spawned": 0, "recycled": 0, "killed": 0}
+        self._lock = threading.Lock()
+        self._idle = queue.SimpleQueue()
+        self._workers = set()
+        self._closed = False
+        for _ in range(self.size):
+            self._idle.put(self._spawn())
+
+    def _spawn(self):
+        conn, child_conn = self.context.Pipe()
+        process = self.context.Process(target=worker_main, args=(child_conn, self.limits, self.max_jobs),
+                                       name="wax-exec", daemon=True)
+        process.start()
+        child_conn.close()
+        worker = Worker(process, conn)
+        with self._lock:
+            self._workers.add(worker)
+            self.stats["spawned"] += 1
+        return worker
+
+    def _retire(self, worker, kill=False):
+        if kill:
+            worker.process.kill()
+        worker.process.join(1.0)
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join()
+        worker.conn.close()
+        with self._lock:
+            self._workers.discard(worker)
+            self.stats["killed" if kill else "recycled"] += 1
+
+    def run(self, code_object, stdin="", prompts=True, timeout=None):
+        """
+        Ejecuta 'code_object' con 'stdin' como entrada y devuelve un
+        ExecutionResult. 'timeout' reemplaza al del pool para este trabajo.
+        """
+        if self._closed:
+            raise ValueError("el pool está cerrado")
+        timeout = self.timeout if timeout is None else timeout
+        job = (marshal.dumps(code_object), stdin, prompts)
+        worker = self._idle.get()
+        start = time.perf_counter()
+        kill = False
+        try:
+            worker.conn.send(job)
+            worker.jobs += 1
+            if worker.conn.poll(timeout):
+                response = worker.conn.recv()
+                result = ExecutionResult(response["status"], response["stdout"], response["stderr"],
+                                         response["error"], response["seconds"])
+            else:
+                kill = True
+                result = ExecutionResult("timeout", error=f"el programa no terminó en {timeout:g} s",
+                                         seconds=time.perf_counter() - start)
+        except (EOFError, OSError):
+            # El worker murió (por ejemplo, el sistema lo mató por memoria)
+            kill = True
+            result = ExecutionResult("crashed", error="el proceso del programa terminó de forma inesperada",
+                                     seconds=time.perf_counter() - start)
+        with self._lock:
+            self.stats["jobs"] += 1
+        if kill or result.status not in REUSABLE or worker.jobs >= self.max_jobs:
+            self._retire(worker, kill)
+            worker = None if self._closed else self._spawn()
+        if worker is not None:
+            self._idle.put(worker)
+        return result
+
+    def map(self, jobs):
+        """
+        Ejecuta varios trabajos en paralelo; 'jobs' son tuplas (code_object,
+        stdin). Devuelve los ExecutionResult en el mismo orden.
+        """
+        with ThreadPoolExecutor(self.size) as threads:
+            return list(threads.map(lambda job: self.run(*job), jobs))
+
+    def close(self):
+        """Detiene los workers (los que están libres terminan; el resto se mata)."""
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+            self._retire(worker)
+        with self._lock:
+            busy = list(self._workers)
+        for worker in busy:
+            self._retire(worker, kill=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_input(stdin, seconds):
+    """
+    Lee toda la entrada de 'stdin' en a lo sumo 'seconds' segundos; None si
+    no terminó a tiempo. Con un descriptor de archivo real se espera con
+    select(), sin hilos: un pipe que nadie cierra no cuelga al que llama.
+    """
+    try:
+        fd = stdin.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return stdin.read()     # StringIO (servidor de compilación)
+    deadline = time.monotonic() + seconds
+    chunks = []
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+            return None
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            return b"".join(chunks).decode(stdin.encoding or "utf-8", "replace")
+        chunks.append(chunk)
+
+
+def run_isolated(code_object, input_file=None, prompts=True, stdin=None, out=None, pool=None,
+                 **limits):
+    """
+    Equivalente a runtime.run_program() para 'main.py --execute --isolate':
+    lee toda la entrada ('input_file' o 'stdin', salvo que sea una
+    terminal), ejecuta el programa en
+    'pool' (o en un pool de un worker creado para esta llamada, con
+    'limits') y escribe en 'out' su salida y el resultado. Devuelve el
+    código de salida.
+
+    El límite de tiempo real cubre también la lectura de 'stdin': el
+    programa recibe lo que quede después de leerla, y si la entrada no
+    termina a tiempo (un pipe que nadie cierra) el resultado es "timeout"
+    sin llegar a ejecutarlo.
+    """
+    if stdin is None:
+        stdin = sys.stdin       # None con pythonw
+    timeout = pool.timeout if pool is not None else limits.get("timeout", DEFAULT_TIMEOUT)
+    start = time.monotonic()
+    try:
+        if input_file:
+            with open(input_file, "r", encoding="utf-8") as f:
+                text = f.read()
+        elif stdin is None or stdin.isatty():
+            # Desde una terminal no se espera a Ctrl+D: input() recibe EOF
+            text = ""
+        else:
+            text = read_input(stdin, timeout)
+    except OSError as e:
+        print(f"[Error Crítico] No se pudo leer la entrada '{input_file}': {e.strerror}", file=out)
+        return 1
+    remaining = timeout - (time.monotonic() - start)
+
+    print("\n=== FASE 5: EJECUTANDO CÓDIGO... ===", file=out)
+    print("--- Salida del Programa ---", file=out)
+    if text is None or remaining <= 0:
+        result = ExecutionResult("timeout", error=f"la entrada estándar no terminó en {timeout:g} s",
+                                 seconds=time.monotonic() - start)
+    elif pool is None:
+        with ExecutionPool(workers=1, **limits) as own_pool:
+            result = own_pool.run(code_object, text, prompts, remaining)
+    else:
+        result = pool.run(code_object, text, prompts, remaining)
+    if result.status == "timeout" and text is not None:
+        result.error = f"el programa no terminó en {timeout:g} s (contando la lectura de la entrada)"
+    (out or sys.stdout).write(result.stdout)
+    if result.stderr:
+        print(result.stderr, end="", file=out if out is not None else sys.stderr)
+
+    if result.ok:
+        print("---------------------------", file=out)
+        print("✓ Ejecución finalizada.", file=out)
+        return 0
+    print(f"\n[Error de Ejecución] El programa generado falló.", file=out)
+    print(f"    > {result.error}", file=out)
+    return 1
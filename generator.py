@@ -1,9 +1,62 @@
 # generator.py
 # Traduce el AST verificado a código Python ejecutable.
 
+from ast_nodes import dispatch_table, trampoline
+from loop_analysis import find_range_loops
+from scope_analysis import entry_globals
+
+# Operadores encadenados por la izquierda (a + b + c ...) que se emiten en un
+# solo paréntesis anidado. Las cadenas más largas se parten en tramos con una
+# variable temporal para no rebasar el límite de anidamiento de CPython.
+CHAIN_CHUNK = 64
+
+# Función sintetizada que contiene el código de nivel superior del programa
+ENTRY_FUNCTION = "_wax_main"
+
+# Presupuesto de pasos (step_budget): el prólogo crea un iterador con un
+# elemento por paso (itertools.repeat(None, N)) y cada paso es tomar el
+# siguiente con un 'for' de Python: un FOR_ITER, sin llamadas a funciones
+# ni enteros nuevos. Un contador en una variable costaría bastante más.
+#   - while y for generales: el ciclo entero se vuelve
+#         for _wax_step in _wax_steps:
+#             if not (cond): break
+#             ...
+#         else: raise _wax_StepLimitExceeded(línea, presupuesto)
+#     (un paso por cada evaluación de la condición);
+#   - entrada de cada función: 'for _wax_step in _wax_steps: break' +
+#     else (así también se corta una recursión sin fin). En funciones
+#     mínimas como fib cuesta cerca de un 40% (ver bench_steps.py);
+#   - con presupuesto los for con forma de contador no se traducen a
+#     range(): se generan como los for generales y toman un paso por
+#     vuelta, así el presupuesto acota también un for de miles de millones
+#     de vueltas. Un range() con un paso al entrar no lo acotaba, y
+#     cobrarlo por vuelta (con zip o con un for de un paso dentro del
+#     cuerpo) resultó más lento que el while.
+STEPS = "_wax_steps"
+STEP_VAR = "_wax_step"
+STEP_ERROR = "_wax_StepLimitExceeded"
+STEP_REPEAT = "_wax_repeat"
+
 class CodeGenerator:
-    def __init__(self):
+    # Traducir los for con forma de contador a 'for ... in range()'
+    lower_range_loops = True
+    # Envolver el código de nivel superior en ENTRY_FUNCTION para que sus
+    # variables sean locales rápidas de Python en lugar de globales (valor
+    # por defecto; Compiler(entry_function=False) y --no-entry-function
+    # generan el nivel superior a nivel de módulo, como antes)
+    wrap_main = True
+
+    def __init__(self, step_budget=None, wrap_main=None):
+        if wrap_main is not None:
+            self.wrap_main = wrap_main
         self.indent_level = 0
+        self.temp_count = 0
+        # Pasos que puede dar el programa (None: sin instrumentar)
+        self.step_budget = step_budget
+        # FOR traducibles a 'for ... in range()' (ver loop_analysis)
+        self.range_loops = {}
+        # Tabla de despacho tipo de nodo -> método (calculada una vez por clase)
+        self._visitors = dispatch_table(type(self), 'visit_')
 
     def indent(self):
         """Devuelve un string de indentación del nivel actual."""
@@ -12,14 +65,44 @@ class CodeGenerator:
     def generate(self, ast):
         """Punto de entrada principal. Genera código para una lista de nodos."""
         code_lines = ["import sys"]
+        if self.step_budget is not None:
+            code_lines.append(f"from itertools import repeat as {STEP_REPEAT}")
+            code_lines.append(f"from runtime import StepLimitExceeded as {STEP_ERROR}")
+            code_lines.append(f"{STEPS} = {STEP_REPEAT}(None, {self.step_budget})")
+        lower = self.lower_range_loops and self.step_budget is None
+        self.range_loops = find_range_loops(ast) if lower else {}
+        if self.wrap_main:
+            # def _wax_main():
+            #     global <variables que leen las funciones>, <funciones>
+            #     ...código de nivel superior...
+            # _wax_main()
+            code_lines.append(f"def {ENTRY_FUNCTION}():")
+            self.indent_level = 1
+            global_names = entry_globals(ast)
+            if global_names:
+                code_lines.append(f"{self.indent()}global {', '.join(sorted(global_names))}")
+        start = len(code_lines)
         for node in ast:
             # Visita cada nodo de alto nivel (global)
             line = self.visit(node)
             if line:
-                code_lines.append(line)
+                code_lines.append(f"{self.indent()}{line}")
+        if self.wrap_main:
+            if len(code_lines) == start:
+                code_lines.append(f"{self.indent()}pass")
+            self.indent_level = 0
+            code_lines.append(f"{ENTRY_FUNCTION}()")
         return "\n".join(code_lines)
 
+    # Los visitantes con hijos son generadores: piden el código de cada hijo
+    # con 'yield self._visit(...)' y 'trampoline' los ejecuta con una pila
+    # explícita, así que la profundidad del AST no consume la pila de Python.
+
     def visit(self, node):
+        """Genera el código de un nodo (o de una lista de nodos)."""
+        return trampoline(self._visit(node))
+
+    def _visit(self, node):
         """Llama al método 'visit_TIPO' apropiado para un nodo."""
         if node is None:
             return ""
@@ -28,10 +111,11 @@ class CodeGenerator:
         if isinstance(node, list):
             return self.visit_program(node)
 
-        method_name = f'visit_{node["type"]}'
         # Llama al método (ej. visit_DECLARATION) o a generic_visit si no existe
-        method = getattr(self, method_name, self.generic_visit)
-        return method(node)
+        method = self._visitors.get(node["type"])
+        if method is None:
+            return self.generic_visit(node)
+        return method(self, node)
 
     def generic_visit(self, node):
         """Fallback para nodos no implementados (ej. Type, PARAM)."""
@@ -47,10 +131,13 @@ class CodeGenerator:
         self.indent_level += 1
         block_code = []
         for stmt in node_list:
-            line = self.visit(stmt)
+            line = yield self._visit(stmt)
             if line:
                 # Añade la indentación correcta a cada línea generada
                 block_code.append(f"{self.indent()}{line}")
+        if not block_code:
+            # Bloque vacío (o vaciado por el optimizador): Python exige una sentencia
+            block_code.append(f"{self.indent()}pass")
         self.indent_level -= 1
         return "\n".join(block_code)
 
@@ -60,24 +147,24 @@ class CodeGenerator:
         # Wax: wax mi_var:int = 5
         # Py:  mi_var = 5
         # children: [0]=TypeNode, [1]=IdentNode, [2]=ExprNode
-        var_name = self.visit(node["children"][1])
-        expr = self.visit(node["children"][2])
+        var_name = yield self._visit(node["children"][1])
+        expr = yield self._visit(node["children"][2])
         return f"{var_name} = {expr}"
 
     def visit_ASSIGN(self, node):
         # Wax: mi_var = 10
         # Py:  mi_var = 10
         # children: [0]=IdentNode, [1]=ExprNode
-        var_name = self.visit(node["children"][0])
-        expr = self.visit(node["children"][1])
+        var_name = yield self._visit(node["children"][0])
+        expr = yield self._visit(node["children"][1])
         return f"{var_name} = {expr}"
     
     #Generar código para asignaciones compuestas
     def visit_ASSIGN_COMPOUND(self, node):
         # Wax: a += 5
         # Py:  a += 5
-        var_name = self.visit(node["children"][0])
-        expr = self.visit(node["children"][1])
+        var_name = yield self._visit(node["children"][0])
+        expr = yield self._visit(node["children"][1])
         operator = node["value"]  # +=, -=, *=, /=
         return f"{var_name} {operator} {expr}"
     
@@ -85,7 +172,7 @@ class CodeGenerator:
     def visit_INCREMENT(self, node):
         # Wax: i++; o ++i; o i--; o --i;
         # Py:  i += 1 o i -= 1
-        var_name = self.visit(node["children"][0])
+        var_name = yield self._visit(node["children"][0])
         operator = node["value"]  # ++, --
         
         if operator == '++':
@@ -96,44 +183,49 @@ class CodeGenerator:
     def visit_LIST_APPEND(self, node):
         # Wax: mi_lista.append(5)
         # Py:  mi_lista.append(5)
-        list_name = self.visit(node["children"][0])
-        element = self.visit(node["children"][1])
+        list_name = yield self._visit(node["children"][0])
+        element = yield self._visit(node["children"][1])
         return f"{list_name}.append({element})"
 
     def visit_LIST_REMOVE(self, node):
         # Wax: mi_lista.remove(0)  # índice
         # Py:  del mi_lista[0]
-        list_name = self.visit(node["children"][0])
-        index = self.visit(node["children"][1])
+        list_name = yield self._visit(node["children"][0])
+        index = yield self._visit(node["children"][1])
         return f"del {list_name}[{index}]"
 
     def visit_PRINT(self, node):
         # Wax: print(x)
         # Py:  print(x)
-        expr = self.visit(node["children"][0])
-        return f"print({expr}, flush=True)"
+        # Cuándo se vacía la salida lo decide quien ejecuta el programa (ver
+        # runtime.program_output): línea por línea en modo interactivo o en
+        # bloques grandes; input() siempre la vacía antes de leer.
+        expr = yield self._visit(node["children"][0])
+        return f"print({expr})"
 
     def visit_IF(self, node):
         # Wax: if (cond) { ... }
         # Py:  if cond: \n    ...
-        condition = self.visit(node["children"][0])
-        block = self.visit(node["children"][1]) # El bloque es una lista 'program'
+        condition = yield self._visit(node["children"][0])
+        block = yield self._visit(node["children"][1]) # El bloque es una lista 'program'
         return f"if {condition}:\n{block}"
 
     def visit_IF_ELSE(self, node):
         # Wax: if (cond) { ... } else { ... }
         # Py:  if cond: \n    ... \n else: \n    ...
-        condition = self.visit(node["children"][0])
-        if_block = self.visit(node["children"][1])
-        else_block = self.visit(node["children"][2])
+        condition = yield self._visit(node["children"][0])
+        if_block = yield self._visit(node["children"][1])
+        else_block = yield self._visit(node["children"][2])
         # El 'else:' debe estar al nivel de indentación actual
         return f"if {condition}:\n{if_block}\n{self.indent()}else:\n{else_block}"
 
     def visit_WHILE(self, node):
         # Wax: while (cond) { ... }
         # Py:  while cond: \n    ...
-        condition = self.visit(node["children"][0])
-        block = self.visit(node["children"][1])
+        condition = yield self._visit(node["children"][0])
+        block = yield self._visit(node["children"][1])
+        if self.step_budget is not None:
+            return self.step_loop(condition, block, node["lineno"])
         return f"while {condition}:\n{block}"
     
     def visit_FOR(self, node):
@@ -149,18 +241,23 @@ class CodeGenerator:
         increment = node["children"][4]
         body = node["children"][5]
         
-        var_name = self.visit(var_name_node)
-        init_value = self.visit(init_expr)
-        cond = self.visit(condition)
+        var_name = yield self._visit(var_name_node)
+
+        spec = self.range_loops.get(node)
+        if spec is not None:
+            return (yield self.visit_range_for(var_name, spec, body))
+
+        init_value = yield self._visit(init_expr)
+        cond = yield self._visit(condition)
         
         # Generar el código del incremento
-        inc_code = self.visit_for_increment(increment)
+        inc_code = yield self.visit_for_increment(increment)
         
         # Convertir el body (lista de statements) en código
         self.indent_level += 1
         body_code = []
         for stmt in body:
-            line = self.visit(stmt)
+            line = yield self._visit(stmt)
             if line:
                 body_code.append(f"{self.indent()}{line}")
         
@@ -171,13 +268,56 @@ class CodeGenerator:
         body_str = "\n".join(body_code)
         
         # Generar el código completo
-        return f"{var_name} = {init_value}\nwhile {cond}:\n{body_str}"
+        # (el 'while' va al mismo nivel que la inicialización)
+        if self.step_budget is not None:
+            loop = self.step_loop(cond, body_str, node["lineno"])
+            return f"{var_name} = {init_value}\n{self.indent()}{loop}"
+        return f"{var_name} = {init_value}\n{self.indent()}while {cond}:\n{body_str}"
     
+    def visit_range_for(self, var_name, spec, body):
+        # Wax: for (wax i:int = 0; i <= n; i += 2) { ... }
+        # Py:  for i in range(0, n + 1, 2):
+        #          ...
+        start = yield self._visit(spec["start"])
+        stop = spec["stop"]
+        if stop["type"] == "NUMBER":
+            stop = str(stop["value"] + spec["offset"])
+        else:
+            stop = yield self._visit(stop)
+            if spec["offset"]:
+                stop = f"{stop} {'+' if spec['offset'] > 0 else '-'} 1"
+        args = f"{start}, {stop}" if spec["step"] == 1 else f"{start}, {stop}, {spec['step']}"
+
+        self.indent_level += 1
+        body_code = []
+        for stmt in body:
+            line = yield self._visit(stmt)
+            if line:
+                body_code.append(f"{self.indent()}{line}")
+        if not body_code:
+            body_code.append(f"{self.indent()}pass")
+        self.indent_level -= 1
+
+        body_str = "\n".join(body_code)
+        return f"for {var_name} in range({args}):\n{body_str}"
+
+    def step_loop(self, condition, block, line):
+        """Ciclo 'while condition' que toma un paso en cada evaluación de la condición."""
+        inner = "    " * (self.indent_level + 1)
+        return (f"for {STEP_VAR} in {STEPS}:\n{inner}if not ({condition}): break\n{block}\n"
+                f"{self.indent()}else:\n{inner}raise {STEP_ERROR}({line}, {self.step_budget})")
+
+    def step_check(self, line):
+        """Toma un paso o lanza StepLimitExceeded."""
+        inner = "    " * (self.indent_level + 1)
+        return (f"for {STEP_VAR} in {STEPS}: break\n"
+                f"{self.indent()}else:\n{inner}raise {STEP_ERROR}({line}, {self.step_budget})")
+
     def visit_for_increment(self, node):
         """Genera código para el incremento del for"""
         if node["type"] == "FOR_INCREMENT":
             # i++ o i--
-            var_name = self.visit(node["children"][0])
+            var_name = yield self._visit(node["children"][0])
             operator = node["value"]
             if operator == '++':
                 return f"{var_name} += 1"
@@ -185,8 +325,8 @@ class CodeGenerator:
                 return f"{var_name} -= 1"
         elif node["type"] == "FOR_INCREMENT_EXPR":
             # i += 1, i = i + 1, etc.
-            var_name = self.visit(node["children"][0])
-            expr = self.visit(node["children"][1])
+            var_name = yield self._visit(node["children"][0])
+            expr = yield self._visit(node["children"][1])
             operator = node["value"]
             return f"{var_name} {operator} {expr}"
 
@@ -194,26 +334,33 @@ class CodeGenerator:
         # Wax: wax function mi_func:int(a:int) { ... }
         # Py:  def mi_func(a): \n    ...
         # children: [0]=ReturnType, [1]=IdentNode, [2...]=ParamList, [3]=ProgramBlock
-        func_name = self.visit(node["children"][1])
+        func_name = yield self._visit(node["children"][1])
         
         # Visitar manualmente los nodos de parámetros
         param_nodes = node["children"][2]
-        params = [self.visit(p) for p in param_nodes]
+        params = []
+        for p in param_nodes:
+            params.append((yield self._visit(p)))
         param_str = ", ".join(params)
         
-        block = self.visit(node["children"][3])
+        block = yield self._visit(node["children"][3])
+        if self.step_budget is not None:
+            # Cada llamada cuesta un paso (la recursión sin fin también se corta)
+            self.indent_level += 1
+            block = f"{self.indent()}{self.step_check(node['lineno'])}\n{block}"
+            self.indent_level -= 1
         return f"def {func_name}({param_str}):\n{block}"
 
     def visit_PARAM(self, node):
         # Devuelve solo el nombre del parámetro, Python no necesita el tipo
         # children: [0]=IdentNode, [1].TypeNode
-        return self.visit(node["children"][0])
+        return (yield self._visit(node["children"][0]))
 
     def visit_RETURN_VALUE(self, node):
         # Wax: return x
         # Py:  return x
         # El parser lo puso en una lista, así que tomamos el primer elemento
-        expr = self.visit(node["children"][0])
+        expr = yield self._visit(node["children"][0])
         return f"return {expr}"
 
     def visit_RETURN_EMPTY(self, node):
@@ -233,7 +380,9 @@ class CodeGenerator:
         return node["value"]
 
     def visit_NUMBER(self, node):
-        return str(node["value"])
+        # El optimizador puede dejar literales negativos: (-2) ** 2
+        text = str(node["value"])
+        return f"({text})" if text.startswith("-") else text
 
     def visit_STRING(self, node):
         # Añadimos las comillas que el parser quitó
@@ -246,66 +395,111 @@ class CodeGenerator:
     def visit_LIST(self, node):
         # Wax: [1, 2, 3]
         # Py:  [1, 2, 3]
-        items = [self.visit(item) for item in node["children"]]
+        items = []
+        for item in node["children"]:
+            items.append((yield self._visit(item)))
         return f"[{', '.join(items)}]"
 
     def visit_LIST_ACCESS(self, node):
         # Wax: mi_lista[i]
         # Py:  mi_lista[i]
-        list_name = self.visit(node["children"][0])
-        index = self.visit(node["children"][1])
+        list_name = yield self._visit(node["children"][0])
+        index = yield self._visit(node["children"][1])
         return f"{list_name}[{index}]"
 
     def visit_BINOP(self, node):
         # Wax: a + b, a % b, a ** b
         # Py:  (a + b), (a % b), (a ** b)
-        left = self.visit(node["children"][0])
-        right = self.visit(node["children"][1])
-        op = node["value"]
-        
         # Python usa los mismos operadores
-        return f"({left} {op} {right})"
+        return self._operator_chain(node)
 
     def visit_LOGIC(self, node):
         # Wax: a || b
         # Py:  (a or b)
-        left = self.visit(node["children"][0])
-        right = self.visit(node["children"][1])
-        op = "or" if node["value"] == "||" else "and"
-        return f"({left} {op} {right})"
+        return self._operator_chain(node)
+
+    def _operator_op(self, node):
+        if node["type"] == "LOGIC":
+            return "or" if node["value"] == "||" else "and"
+        return node["value"]
+
+    def _operator_chain(self, node):
+        """
+        Genera una cadena de BINOP/LOGIC asociada por la izquierda
+        ((a + b) + c ...) recorriendo su espina izquierda en un bucle.
+        Si la cadena es larga se emite por tramos de CHAIN_CHUNK operadores:
+            (_wax_t0 := ((a + b) + ...), _wax_t0 := ((_wax_t0 + x) + ...), _wax_t0)[-1]
+        que evalúa los operandos en el mismo orden (y con el mismo
+        cortocircuito en and/or) que la expresión anidada.
+        """
+        spine = []
+        while node["type"] in ("BINOP", "LOGIC"):
+            spine.append(node)
+            node = node["children"][0]
+        spine.reverse()
+
+        code = yield self._visit(node)
+        if len(spine) <= CHAIN_CHUNK:
+            for op_node in spine:
+                right = yield self._visit(op_node["children"][1])
+                code = f"({code} {self._operator_op(op_node)} {right})"
+            return code
+
+        temp = f"_wax_t{self.temp_count}"
+        self.temp_count += 1
+        chunks = []
+        for start in range(0, len(spine), CHAIN_CHUNK):
+            if start:
+                code = temp
+            for op_node in spine[start:start + CHAIN_CHUNK]:
+                right = yield self._visit(op_node["children"][1])
+                code = f"({code} {self._operator_op(op_node)} {right})"
+            chunks.append(f"{temp} := {code}")
+        return f"({', '.join(chunks)}, {temp})[-1]"
     
+    def visit_BIND(self, node):
+        # Argumento de una llamada expandida por el optimizador (-O), que se
+        # guarda en una temporal en su primer uso
+        # Py:  (_wax_a0 := argumento)
+        target, value = node["children"]
+        code = yield self._visit(value)
+        return f"({target['value']} := {code})"
+
     def visit_NOT(self, node):
         # Wax: !condicion
         # Py:  not condicion
-        operand = self.visit(node["children"][0])
+        operand = yield self._visit(node["children"][0])
         return f"(not {operand})"
     
     def visit_UNARY_MINUS(self, node):
         # Wax: -x
         # Py:  -x
-        operand = self.visit(node["children"][0])
+        operand = yield self._visit(node["children"][0])
         return f"(-{operand})"
     
     def visit_FUNC_CALL(self, node):
         # Wax: mi_func(a, b)
         # Py:  mi_func(a, b)
         # children: [0]=IdentNode, [1...]=Args
-        func_name = self.visit(node["children"][0])
-        args = [self.visit(arg) for arg in node["children"][1:]]
+        func_name = yield self._visit(node["children"][0])
+        args = []
+        for arg in node["children"][1:]:
+            args.append((yield self._visit(arg)))
         return f"{func_name}({', '.join(args)})"
 
     def visit_INPUT(self, node):
         # Wax: input() o input("mensaje")
-        # Py:  import sys; sys.stdout.flush(); input() o input("mensaje")
+        # Py:  input() o input("mensaje")
+        # El input() de Python vacía sys.stdout antes de leer, así que lo
+        # impreso hasta ese momento siempre se ve. Con --input batch, main.py
+        # lo reemplaza por runtime.batch_input (sin vaciar la salida).
         if node.get("children") and len(node["children"]) > 0:
-            # input con mensaje - forzamos flush antes
-            message = self.visit(node["children"][0])
-            return f"(sys.stdout.flush() or input({message}))"
+            message = yield self._visit(node["children"][0])
+            return f"input({message})"
         else:
-            # input sin mensaje
-            return "(sys.stdout.flush() or input())"
+            return "input()"
         
     def visit_EXPR_STATEMENT(self, node):
         # La traduccion de un 'EXPR_STATEMENT' es solo la expresion misma.
         # Por ej: enRango(1,2,3) se traduce a enRango(1,2,3) en Python.
-        return self.visit(node["children"][0])
\ No newline at end of file
+        return (yield self._visit(node["children"][0]))
\ No newline at end of file
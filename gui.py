@@ -1,26 +1,34 @@
 # gui.py
 # Interfaz gráfica del compilador WAX (Versión con números de línea nativos y input interactivo)
+#
+# La compilación y la ejecución corren en hilos aparte para que la ventana
+# siga respondiendo: el compilador avisa con la señal 'compiled' y el
+# programa (ver program_runner.py) con 'output_ready', 'input_requested' y
+# 'finished'. Las señales se emiten desde esos hilos y Qt las entrega en
+# el hilo de la interfaz, que es el único que toca los widgets; input()
+# abre el diálogo desde ahí y el hilo del programa espera la respuesta.
 
 import sys
 import io
 import json
-import contextlib
+import threading
 
 # --- Importaciones del Compilador ---
-from lexer import lexer
-from parser import parser
-from semantic import SemanticAnalyzer
-from generator import CodeGenerator
+from compiler import Compiler
+from ast_nodes import Node
+from output_log import DEFAULT_MAX_LINES, OutputLog
+from program_runner import ProgramRunner
 
 # --- Importaciones de PySide6 ---
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget,
     QHBoxLayout, QVBoxLayout, QTextEdit,
     QPushButton, QCheckBox, QTabWidget,
-    QSplitter, QPlainTextEdit, QInputDialog
+    QSplitter, QPlainTextEdit, QInputDialog,
+    QLabel, QSpinBox, QFileDialog
 )
-from PySide6.QtCore import Qt, QSize, QRect
-from PySide6.QtGui import QFont, QPainter, QColor, QTextFormat
+from PySide6.QtCore import Qt, QSize, QRect, QObject, Signal, QTimer
+from PySide6.QtGui import QFont, QPainter, QColor, QTextFormat, QTextCursor
 
 # ===============================================
 #               PROGRAMA.WAX
@@ -214,6 +222,78 @@ class CodeEditor(QPlainTextEdit):
             bottom = top + self.blockBoundingRect(block).height()
             blockNumber += 1
 
+# ===============================================
+# CLASE 3: LA CONSOLA DE SALIDA
+# (Agrega texto al final en lotes, como una terminal)
+# ===============================================
+class OutputConsole(QPlainTextEdit):
+    """
+    Consola de solo lectura para la salida de los programas. write() sólo
+    acumula el texto en un OutputLog; un timer lo agrega al final del
+    widget como mucho cada 'refresh_ms', así imprimir un millón de líneas
+    cuesta unos pocos repintados. Se conservan las últimas 'max_lines'
+    líneas y save() guarda la salida completa. close_log() libera el
+    archivo temporal del OutputLog al cerrar la ventana.
+    """
+    max_lines = DEFAULT_MAX_LINES
+    refresh_ms = 33     # ~30 refrescos por segundo
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setMaximumBlockCount(self.max_lines)
+        self.log = OutputLog(self.max_lines)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.refresh_ms)
+        self.timer.timeout.connect(self.flush)
+
+    def write(self, text):
+        if self.log.closed:
+            return
+        self.log.write(text)
+        if text and not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        """Muestra ya lo que está pendiente."""
+        self.timer.stop()
+        text, truncated = self.log.take_pending()
+        if not text:
+            return
+        # Sólo se sigue el final si el usuario no se desplazó hacia arriba
+        bar = self.verticalScrollBar()
+        follow = truncated or bar.value() == bar.maximum()
+        if truncated:
+            super().setPlainText(text)
+        else:
+            cursor = QTextCursor(self.document())
+            cursor.movePosition(QTextCursor.MoveOperation.End)
+            cursor.insertText(text)
+        if follow:
+            bar.setValue(bar.maximum())
+
+    def setText(self, text):
+        """Reemplaza todo el contenido (como QTextEdit.setText)."""
+        self.clear()
+        self.write(text)
+        self.flush()
+
+    def clear(self):
+        self.timer.stop()
+        if not self.log.closed:
+            self.log.clear()
+        super().clear()
+
+    def save(self, path):
+        self.log.save(path)
+
+    def close_log(self):
+        """Descarta lo pendiente y borra el archivo temporal de la salida."""
+        self.timer.stop()
+        self.log.close()
+
 # ===============================================
 # FUNCIÓN PERSONALIZADA DE INPUT
 # ===============================================
@@ -226,6 +306,59 @@ def custom_input(prompt="", parent_widget=None):
         return text
     return ""
 
+# ===============================================
+# SEÑALES DE LOS HILOS DE TRABAJO
+# ===============================================
+class WorkerSignals(QObject):
+    """
+    Puente entre los hilos de compilación y ejecución y la ventana: se
+    crea en el hilo de la interfaz, así las señales emitidas desde otro
+    hilo llegan encoladas a los slots de CompilerApp.
+    """
+    compiled = Signal(object)           # CompileReport
+    output_ready = Signal()             # hay salida pendiente en el runner
+    input_requested = Signal(str)       # prompt de input()
+    finished = Signal(str, object)      # estado y mensaje de error (o None)
+
+
+class CompileReport:
+    """
+    Resultado de una compilación y el texto de las pestañas de depuración.
+    'error' es la excepción si la compilación misma falló (un bug del
+    compilador); entonces 'result' es None.
+    """
+    def __init__(self, result, tokens="", ast="", table="", python_code="", error=None):
+        self.result = result
+        self.tokens = tokens
+        self.ast = ast
+        self.table = table
+        self.python_code = python_code
+        self.error = error
+
+
+def compile_report(compiler, code):
+    """Compila y formatea tokens, AST, tabla y código Python (en el hilo de trabajo)."""
+    result = compiler.compile(code)
+    report = CompileReport(result)
+    if result.ast and not result.syntax_errors and not result.semantic_errors:
+        report.tokens = "\n".join([f"{tok.type}: {tok.value} (linea {tok.lineno})" for tok in result.tokens])
+        report.ast = format_ast_string(result.ast, stream=io.StringIO())
+        report.table = json.dumps(result.symbol_log, indent=2)
+    if result.ok:
+        # Con el backend "ast" el texto se genera al pedirlo: aquí y no en
+        # el hilo de la interfaz
+        report.python_code = result.python_code
+    return report
+
+
+def compile_in_background(compiler, code, done):
+    """Cuerpo del hilo de compilación: llama a done(report) pase lo que pase."""
+    try:
+        report = compile_report(compiler, code)
+    except Exception as e:
+        report = CompileReport(None, error=e)
+    done(report)
+
 # ==============================
 # CLASE PRINCIPAL DE LA APLICACIÓN
 # (Modificada para usar 'CodeEditor' y manejar input())
@@ -251,9 +384,35 @@ class CompilerApp(QMainWindow):
         self.btn_execute = QPushButton("Ejecutar (F6)")
         self.btn_execute.setShortcut("F6")
         self.btn_execute.setEnabled(False)
+
+        self.btn_stop = QPushButton("Detener")
+        self.btn_stop.setShortcut("Shift+F6")
+        self.btn_stop.setEnabled(False)
     
+        # Presupuesto de pasos del programa (0 = sin límite): un ciclo sin
+        # fin se detiene con StepLimitExceeded en lugar de congelar la ventana
+        self.spin_steps = QSpinBox()
+        self.spin_steps.setRange(0, 2_000_000_000)
+        self.spin_steps.setSingleStep(1_000_000)
+        self.spin_steps.setSpecialValueText("Sin límite")
+        self.spin_steps.setToolTip("Vueltas de ciclos y llamadas a funciones que puede dar el programa")
+
         controls_layout.addWidget(self.btn_compile)
         controls_layout.addWidget(self.btn_execute)
+        controls_layout.addWidget(self.btn_stop)
+
+        self.btn_save_output = QPushButton("Guardar salida")
+        self.btn_save_output.setToolTip("Guarda en un archivo toda la salida, también la que ya no se muestra")
+        controls_layout.addWidget(self.btn_save_output)
+        controls_layout.addWidget(QLabel("Límite de pasos:"))
+        controls_layout.addWidget(self.spin_steps)
+
+        # Nivel superior dentro de _wax_main() (variables locales rápidas);
+        # sin marcar, la pestaña "Codigo Python" lo muestra a nivel de módulo
+        self.check_entry = QCheckBox("Función de entrada")
+        self.check_entry.setChecked(True)
+        self.check_entry.setToolTip("Genera el código de nivel superior dentro de _wax_main()")
+        controls_layout.addWidget(self.check_entry)
         controls_layout.addStretch()
 
         # 2. Editor de Código (Izquierda)
@@ -261,11 +420,10 @@ class CompilerApp(QMainWindow):
         self.code_input.setFont(font)
         self.code_input.setPlainText(DEFAULT_WAX_CODE)
 
-        # 3. Panel de Salida (Derecha) - Sigue usando QTextEdit
+        # 3. Panel de Salida (Derecha) - Errores y salida en una OutputConsole
         self.output_tabs = QTabWidget()
-        self.tab_errors = QTextEdit() # Sigue siendo QTextEdit
+        self.tab_errors = OutputConsole()
         self.tab_errors.setFont(font)
-        self.tab_errors.setReadOnly(True)
         
         self.tab_tokens = QTextEdit()
         self.tab_tokens.setFont(font)
@@ -305,6 +463,21 @@ class CompilerApp(QMainWindow):
 
         self.btn_compile.clicked.connect(self.compile_code)
         self.btn_execute.clicked.connect(self.execute_code)
+        self.btn_stop.clicked.connect(self.stop_program)
+        self.btn_save_output.clicked.connect(self.save_output)
+
+        self.signals = WorkerSignals()
+        self.signals.compiled.connect(self.show_compile_report)
+        self.signals.output_ready.connect(self.show_program_output)
+        self.signals.input_requested.connect(self.ask_program_input)
+        self.signals.finished.connect(self.program_finished)
+
+        # Instancia propia del compilador (lexer y parser independientes)
+        self.compiler = Compiler()
+        # Objeto código de la última compilación exitosa
+        self.code_object = None
+        # Programa en ejecución (ProgramRunner) o None
+        self.runner = None
 
     def clear_outputs(self):
         self.tab_errors.clear()
@@ -312,6 +485,7 @@ class CompilerApp(QMainWindow):
         self.tab_ast.clear()
         self.tab_table.clear()
         self.tab_python.clear()
+        self.code_object = None
 
     def compile_code(self):
         self.clear_outputs()
@@ -324,24 +498,30 @@ class CompilerApp(QMainWindow):
             self.output_tabs.setCurrentWidget(self.tab_errors)
             return
 
-        # --- FASE 1: LÉXICO ---
-        lexer.input(code)
-        token_list = []
-        while True:
-            tok = lexer.token()
-            if not tok:
-                break
-            token_list.append(tok)
-
-        # --- FASE 2: SINTÁCTICO ---
-        lexer.lineno = 1
-        ast = None
-        stderr_capture = io.StringIO()
-        with contextlib.redirect_stderr(stderr_capture):
-            ast = parser.parse(code, lexer=lexer)
-        
-        parser_errors = stderr_capture.getvalue()
-        if parser_errors:
+        # --- FASES 1 a 4: léxico, sintáctico, semántico y generación ---
+        # Corren en un hilo aparte; el resultado llega a show_compile_report
+        step_budget = self.spin_steps.value() or None
+        entry_function = self.check_entry.isChecked()
+        if (self.compiler.step_budget, self.compiler.entry_function) != (step_budget, entry_function):
+            self.compiler = Compiler(step_budget=step_budget, entry_function=entry_function)
+        self.btn_compile.setEnabled(False)
+        self.tab_errors.setText("Compilando...")
+        compiler = self.compiler
+        threading.Thread(target=compile_in_background, args=(compiler, code, self.signals.compiled.emit),
+                         name="wax-compile", daemon=True).start()
+
+    def show_compile_report(self, report):
+        self.btn_compile.setEnabled(True)
+        if report.error is not None:
+            e = report.error
+            self.tab_errors.setText(f"--- Error Interno del Compilador ---\n{type(e).__name__}: {e}")
+            self.output_tabs.setCurrentWidget(self.tab_errors)
+            return
+        result = report.result
+        ast = result.ast
+
+        if result.syntax_errors:
+            parser_errors = "\n".join(result.syntax_errors) + "\n"
             self.tab_errors.setText(f"--- Errores de Sintaxis ---\n{parser_errors}")
             self.output_tabs.setCurrentWidget(self.tab_errors)
             return
@@ -351,104 +531,100 @@ class CompilerApp(QMainWindow):
             self.output_tabs.setCurrentWidget(self.tab_errors)
             return
 
-        # --- FASE 3: SEMÁNTICO ---
-        analyzer = SemanticAnalyzer()
-        analyzer.analyze(ast)
-
-        if analyzer.errors:
-            self.tab_errors.setText("--- Errores Semánticos ---\n" + "\n".join(analyzer.errors))
+        if result.semantic_errors:
+            self.tab_errors.setText("--- Errores Semánticos ---\n" + "\n".join(result.semantic_errors))
+            self.output_tabs.setCurrentWidget(self.tab_errors)
+        elif result.generator_error:
+            # Esto es por si nuestro generador tiene un bug
+            e = result.generator_error
+            self.tab_errors.setText(f"--- Error del Generador de Código ---\n¡Ocurrió un error inesperado al generar el código!\n\n{type(e).__name__}: {e}")
             self.output_tabs.setCurrentWidget(self.tab_errors)
         else:
             self.tab_errors.setText("✓ Compilación exitosa. Sin errores.")
-            try:
-                generator = CodeGenerator()
-                python_code = generator.generate(ast)
-                self.tab_python.setText(python_code)
-                self.btn_execute.setEnabled(True)
-            except Exception as e:
-                # Esto es por si nuestro generador tiene un bug
-                self.tab_errors.setText(f"--- Error del Generador de Código ---\n¡Ocurrió un error inesperado al generar el código!\n\n{type(e).__name__}: {e}")
-                self.output_tabs.setCurrentWidget(self.tab_errors)
-
-        # --- FASE 4: REPORTE ---
-        if not analyzer.errors:
-            # Tokens
-            tokens_str = "\n".join([f"{tok.type}: {tok.value} (linea {tok.lineno})" for tok in token_list])
-            self.tab_tokens.setText(tokens_str)
-            
-            # AST
-            ast_str = format_ast_string(ast, stream=io.StringIO())
-            self.tab_ast.setText(ast_str)
-            
-            # Tabla de símbolos
-            table_str = json.dumps(analyzer.symbol_log, indent=2)
-            self.tab_table.setText(table_str)
+            self.tab_python.setText(report.python_code)
+            self.code_object = result.code_object
+            self.btn_execute.setEnabled(True)
+
+        # --- FASE 4: REPORTE (tokens, AST y tabla de símbolos) ---
+        if not result.semantic_errors:
+            self.tab_tokens.setText(report.tokens)
+            self.tab_ast.setText(report.ast)
+            self.tab_table.setText(report.table)
 
     def execute_code(self):
-        """Ejecuta el código de la pestaña 'Código Python' con soporte para input()."""
+        """
+        Ejecuta el programa compilado (el objeto código de la última
+        compilación; la pestaña 'Código Python' es su versión legible)
+        en un hilo aparte, con soporte para input(). El botón "Detener"
+        lo corta.
+        """
         
-        python_code = self.tab_python.toPlainText()
-        if not python_code:
+        if self.code_object is None:
             self.tab_errors.setText("No hay código Python para ejecutar.")
             self.output_tabs.setCurrentWidget(self.tab_errors)
             return
-        
-        # Preparamos un buffer para capturar salida
-        output_lines = []
-        
-        # Creamos una función input personalizada que usa este widget
-        def gui_input(prompt=""):
-            # Mostramos primero todo lo que se ha impreso hasta ahora
-            if output_lines:
-                current_output = "\n".join(output_lines)
-                self.tab_errors.setText(f"--- Ejecutando... ---\n{current_output}")
-                self.output_tabs.setCurrentWidget(self.tab_errors)
-                QApplication.processEvents()  # Forzar actualización de UI
-            
-            # Mostramos el diálogo
-            text, ok = QInputDialog.getText(self, "Input", prompt)
-            
-            # Guardamos en el log lo que el usuario escribió
-            if ok:
-                output_lines.append(f"{prompt}{text}")
-                return text
-            return ""
-        
-        # Función print personalizada
-        def gui_print(*args, **kwargs):
-            line = " ".join(str(arg) for arg in args)
-            output_lines.append(line)
-            # Actualizamos la UI en tiempo real
-            current_output = "\n".join(output_lines)
-            self.tab_errors.setText(f"--- Ejecutando... ---\n{current_output}")
-            self.output_tabs.setCurrentWidget(self.tab_errors)
-            QApplication.processEvents()
-        
-        try:
-            # Creamos un namespace con nuestras funciones personalizadas
-            exec_globals = {
-                'input': gui_input,
-                'print': gui_print,
-                '__builtins__': __builtins__
-            }
-            
-            # Ejecutamos el código  
-            exec(python_code, exec_globals, exec_globals)
-            
-            # Mostramos la salida final
-            final_output = "\n".join(output_lines)
-            self.tab_errors.setText(f"--- Ejecución Finalizada ---\n{final_output}\n\n✓ Programa terminado exitosamente.")
-            
-        except Exception as e:
-            # Si hay error, mostramos lo que se ejecutó hasta el momento
-            partial_output = "\n".join(output_lines)
-            self.tab_errors.setText(
-                f"--- Salida Parcial ---\n{partial_output}\n\n"
-                f"--- Error de Ejecución ---\n{type(e).__name__}: {e}"
-            )
-            
-        finally:
-            self.output_tabs.setCurrentWidget(self.tab_errors)
+
+        self.tab_errors.setText("--- Ejecutando... ---\n")
+        self.output_tabs.setCurrentWidget(self.tab_errors)
+        # Compilar limpiaría la salida del programa: se espera a que termine
+        self.btn_compile.setEnabled(False)
+        self.btn_execute.setEnabled(False)
+        self.btn_stop.setEnabled(True)
+
+        signals = self.signals
+        self.runner = ProgramRunner(self.code_object, signals.output_ready.emit,
+                                    signals.input_requested.emit, signals.finished.emit)
+        self.runner.start()
+
+    def stop_program(self):
+        if self.runner is not None:
+            self.btn_stop.setEnabled(False)
+            self.runner.cancel()
+
+    def show_program_output(self):
+        if self.runner is not None:
+            self.tab_errors.write(self.runner.take_output())
+
+    def ask_program_input(self, prompt):
+        # Mostramos primero todo lo que se ha impreso hasta ahora
+        self.show_program_output()
+        self.tab_errors.flush()
+        # El hilo del programa espera en input() hasta que respondamos
+        text, ok = QInputDialog.getText(self, "Input", prompt)
+        if self.runner is not None:
+            self.runner.answer(text if ok else "")
+
+    def program_finished(self, status, error):
+        self.show_program_output()
+        if status == "ok":
+            self.tab_errors.write("\n✓ Programa terminado exitosamente.")
+        elif status == "cancelled":
+            self.tab_errors.write("\n--- Ejecución detenida ---")
+        else:
+            self.tab_errors.write(f"\n--- Error de Ejecución ---\n{error}")
+        self.tab_errors.flush()
+        self.output_tabs.setCurrentWidget(self.tab_errors)
+        self.runner = None
+        self.btn_stop.setEnabled(False)
+        self.btn_compile.setEnabled(True)
+        self.btn_execute.setEnabled(self.code_object is not None)
+
+    def save_output(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Guardar salida", "salida.txt",
+                                              "Texto (*.txt);;Todos los archivos (*)")
+        if path:
+            try:
+                self.tab_errors.save(path)
+            except OSError as e:
+                self.tab_errors.write(f"\nNo se pudo guardar la salida: {e}\n")
+
+    def closeEvent(self, event):
+        # Un programa que sigue corriendo no debe sobrevivir a la ventana
+        if self.runner is not None:
+            self.runner.cancel()
+            self.runner.join(1.0)
+        self.tab_errors.close_log()
+        super().closeEvent(event)
 
 # ==============================
 # FUNCIÓN DE FORMATO DE AST
@@ -458,10 +634,13 @@ def format_ast_string(node_list, indent="", stream=None):
         stream = io.StringIO()
     if not isinstance(node_list, list):
         node_list = [node_list]
-    for node in node_list:
+    # Recorrido con pila explícita (nodo, indentación), sin recursión
+    stack = [(node, indent) for node in reversed(node_list)]
+    while stack:
+        node, indent = stack.pop()
         if not node:
             continue
-        if isinstance(node, dict):
+        if isinstance(node, Node):
             node_type = node.get("type", "N/A")
             line = node.get("lineno", "N/A")
             label = f"{indent}├── {node_type} [linea {line}]"
@@ -473,9 +652,9 @@ def format_ast_string(node_list, indent="", stream=None):
             children = node.get("children", [])
             if children:
                 child_indent = indent + "│   "
-                format_ast_string(children, child_indent, stream)
+                stack.extend((child, child_indent) for child in reversed(children))
         elif isinstance(node, list):
-            format_ast_string(node, indent, stream)
+            stack.extend((child, indent) for child in reversed(node))
     return stream.getvalue()
 
 # ==============================
@@ -1,8 +1,21 @@
 # lexer.py
 # Contiene toda la lógica para el análisis léxico (reconocimiento de tokens).
 
+import hashlib
+import os
+import tempfile
 import ply.lex as lex
 
+# Modo depuración (WAX_DEBUG=1): el lexer se reconstruye por reflexión
+# validando las reglas y el parser muestra sus advertencias y escribe
+# 'parser.out'. En modo normal se cargan las tablas precalculadas
+# 'lextab.py' y 'parsetab.py' (se regeneran con 'python build_tables.py').
+# Como yacc con '_lr_signature' en parsetab.py, lextab.py guarda un hash
+# de las reglas ('_lexsignature'): si falta o no coincide con las reglas
+# de este archivo, el lexer se construye por reflexión y la tabla se
+# reescribe, en lugar de usar en silencio una tabla vieja.
+WAX_DEBUG = os.environ.get("WAX_DEBUG", "") not in ("", "0")
+
 # ==============================
 # LÉXICO
 # ==============================
@@ -35,7 +48,7 @@ tokens = (
     "COLON","COMMA","LBRACKET","RBRACKET",
     "COMMENT_LINE","COMMENT_BLOCK",
     "DOT"
-) + tuple(keywords.values())
+) + tuple(dict.fromkeys(keywords.values())) # "true" y "false" comparten BOOL
 
 # Símbolos
 t_PLUSEQ     = r"\+="   
@@ -114,5 +127,92 @@ def t_error(t):
     print(f"Illegal character '{t.value[0]}' at line {t.lineno}")
     t.lexer.skip(1)
 
+# ==============================
+# FLUJO DE TOKENS (UNA SOLA PASADA)
+# ==============================
+class TokenStream:
+    """
+    Analiza el código fuente una sola vez y guarda los tokens en un buffer.
+    El reporte de tokens y el parser consumen ese mismo buffer: el parser
+    los recibe a través de 'token()' (parámetro 'tokenfunc' de PLY).
+    benchmarks/bench_lexing.py comprueba que el lexer recorre cada carácter
+    una sola vez por compilación.
+    """
+    def __init__(self, lexer):
+        self.lexer = lexer
+        self.tokens = []
+        self.pos = 0
+
+    def input(self, data):
+        """Tokeniza 'data' completo y reinicia la lectura del buffer."""
+        self.lexer.lineno = 1
+        self.lexer.input(data)
+        self.tokens = list(iter(self.lexer.token, None))
+        self.pos = 0
+
+    def token(self):
+        """Devuelve el siguiente token del buffer, o None al final."""
+        if self.pos >= len(self.tokens):
+            return None
+        tok = self.tokens[self.pos]
+        self.pos += 1
+        return tok
+
+# ==============================
+# TABLA PRECALCULADA (lextab.py)
+# ==============================
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def rules_signature():
+    """
+    Hash de lo que PLY guarda en lextab.py: los tokens, las expresiones
+    regulares de las reglas 't_' en su orden de definición, y lo que se
+    ignora. Editar cualquier regla cambia la firma.
+    """
+    parts = [repr(tokens), repr(sorted(keywords.items()))]
+    for name, value in globals().items():
+        if name.startswith("t_"):
+            parts.append(f"{name}={value.__doc__ if callable(value) else value!r}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+LEX_SIGNATURE = rules_signature()
+
+def write_lextab(lexobj, outputdir=HERE):
+    """
+    Escribe lextab.py con la firma de las reglas. Se escribe en un
+    directorio temporal y se mueve, así otro proceso que lo importe a la
+    vez nunca ve un archivo a medias.
+    """
+    tmpdir = tempfile.mkdtemp(dir=outputdir, prefix=".lextab-")
+    try:
+        lexobj.writetab("lextab", tmpdir)
+        path = os.path.join(tmpdir, "lextab.py")
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(f"_lexsignature  = {LEX_SIGNATURE!r}\n")
+        os.replace(path, os.path.join(outputdir, "lextab.py"))
+    finally:
+        for name in os.listdir(tmpdir):
+            os.remove(os.path.join(tmpdir, name))
+        os.rmdir(tmpdir)
+
+def build_lexer():
+    if WAX_DEBUG:
+        return lex.lex()
+    try:
+        import lextab
+        current = getattr(lextab, "_lexsignature", None) == LEX_SIGNATURE
+    except ImportError:
+        current = False
+    if current:
+        return lex.lex(optimize=True, lextab="lextab", errorlog=lex.NullLogger())
+    # Tabla ausente o de otras reglas: se construye por reflexión (validando
+    # las reglas) y se reescribe si el directorio lo permite
+    lexobj = lex.lex()
+    try:
+        write_lextab(lexobj)
+    except OSError:
+        pass
+    return lexobj
+
 # Construye el lexer
-lexer = lex.lex()
\ No newline at end of file
+lexer = build_lexer()
\ No newline at end of file
@@ -0,0 +1,11 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('AND', 'APPEND', 'BOOL', 'COLON', 'COMMA', 'COMMENT_BLOCK', 'COMMENT_LINE', 'DOT', 'DOUBLE', 'ELSE', 'EQEQ', 'EQUAL', 'FOR', 'FUNCTION', 'GE', 'GT', 'IDENT', 'IF', 'INPUT', 'INT', 'LBRACE', 'LBRACKET', 'LE', 'LPAREN', 'LT', 'MINUS', 'MINUSEQ', 'MINUSMINUS', 'MOD', 'NOT', 'NOTEQ', 'OR', 'PLUS', 'PLUSEQ', 'PLUSPLUS', 'POW', 'PRINT', 'RBRACE', 'RBRACKET', 'REMOVE', 'RETURN', 'RPAREN', 'SEMI', 'SLASH', 'SLASHEQ', 'STAR', 'STAREQ', 'STR', 'STRING', 'VOID', 'WAX', 'WHILE'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_COMMENT_LINE>\\#.*)|(?P<t_COMMENT_BLOCK>/\\*[^*]*\\*+(?:[^/*][^*]*\\*+)*/)|(?P<t_IDENT>[a-zA-Z_][a-zA-Z0-9_]*)|(?P<t_DOUBLE>\\d+\\.\\d+)|(?P<t_INT>\\d+)|(?P<t_STRING>"([^"\\\\]|\\\\.)*")|(?P<t_newline>\\n+)|(?P<t_PLUSPLUS>\\+\\+)|(?P<t_POW>\\*\\*)|(?P<t_OR>\\|\\|)|(?P<t_PLUSEQ>\\+=)|(?P<t_STAREQ>\\*=)|(?P<t_MINUSEQ>-=)|(?P<t_SLASHEQ>/=)|(?P<t_MINUSMINUS>--)|(?P<t_EQEQ>==)|(?P<t_NOTEQ>!=)|(?P<t_LE><=)|(?P<t_GE>>=)|(?P<t_PLUS>\\+)|(?P<t_STAR>\\*)|(?P<t_AND>&&)|(?P<t_LPAREN>\\()|(?P<t_RPAREN>\\))|(?P<t_LBRACE>\\{)|(?P<t_RBRACE>\\})|(?P<t_LBRACKET>\\[)|(?P<t_RBRACKET>\\])|(?P<t_DOT>\\.)|(?P<t_NOT>!)|(?P<t_MINUS>-)|(?P<t_SLASH>/)|(?P<t_MOD>%)|(?P<t_LT><)|(?P<t_GT>>)|(?P<t_EQUAL>=)|(?P<t_SEMI>;)|(?P<t_COMMA>,)|(?P<t_COLON>:)', [None, ('t_COMMENT_LINE', 'COMMENT_LINE'), ('t_COMMENT_BLOCK', 'COMMENT_BLOCK'), ('t_IDENT', 'IDENT'), ('t_DOUBLE', 'DOUBLE'), ('t_INT', 'INT'), ('t_STRING', 'STRING'), None, ('t_newline', 'newline'), (None, 'PLUSPLUS'), (None, 'POW'), (None, 'OR'), (None, 'PLUSEQ'), (None, 'STAREQ'), (None, 'MINUSEQ'), (None, 'SLASHEQ'), (None, 'MINUSMINUS'), (None, 'EQEQ'), (None, 'NOTEQ'), (None, 'LE'), (None, 'GE'), (None, 'PLUS'), (None, 'STAR'), (None, 'AND'), (None, 'LPAREN'), (None, 'RPAREN'), (None, 'LBRACE'), (None, 'RBRACE'), (None, 'LBRACKET'), (None, 'RBRACKET'), (None, 'DOT'), (None, 'NOT'), (None, 'MINUS'), (None, 'SLASH'), (None, 'MOD'), (None, 'LT'), (None, 'GT'), (None, 'EQUAL'), (None, 'SEMI'), (None, 'COMMA'), (None, 'COLON')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
+_lexsignature  = '4735020370ac9acdfb8aa7ce0547bb1bc72bafa6b72fd2af4433bf51b047f880'
@@ -0,0 +1,259 @@
+# loop_analysis.py
+# Análisis previo a la generación: detecta los 'for' de Wax con forma de
+# contador (for (wax i:int = a; i < b; i++) ...) que se pueden traducir a
+# 'for i in range(a, b)' de Python sin cambiar el comportamiento.
+# Ambos generadores (texto y ast) consultan el mismo resultado.
+
+from ast_nodes import walk
+
+# Operadores que, aplicados a enteros, siempre dan un entero
+INT_OPS = frozenset(("+", "-", "*", "%"))
+
+# Condición del for -> (sentido del paso, ajuste del límite de range())
+# i < b -> range(a, b)     i <= b -> range(a, b + 1)
+# i > b -> range(a, b, -k) i >= b -> range(a, b - 1, -k)
+BOUNDS = {"<": (1, 0), "<=": (1, 1), ">": (-1, 0), ">=": (-1, -1)}
+MIRRORED = {"<": ">", "<=": ">=", ">": "<", ">=": "<="}
+
+
+def expr_names(expr):
+    """
+    Devuelve (forma_entera, nombres): si la expresión sólo usa enteros
+    literales, variables y operadores de INT_OPS (o menos unario), y el
+    conjunto de variables que lee.
+    """
+    names = set()
+    for node in walk(expr):
+        kind = node.type
+        if kind == "IDENT":
+            names.add(node.value)
+        elif kind == "NUMBER":
+            if not isinstance(node.value, int):
+                return False, names
+        elif kind == "BINOP":
+            if node.value not in INT_OPS:
+                return False, names
+        elif kind in ("BIND", "Identifier"):
+            continue    # (t := valor) vale lo mismo que 'valor'
+        elif kind != "UNARY_MINUS":
+            return False, names
+    return True, names
+
+
+def written_names(tree):
+    """Nombres que una sentencia (o bloque) asigna o declara."""
+    names = set()
+    for node in walk(tree):
+        kind = node.type
+        if kind in ("ASSIGN", "ASSIGN_COMPOUND", "INCREMENT"):
+            names.add(node.children[0].value)
+        elif kind in ("DECLARATION", "FOR", "FUNCTION"):
+            names.add(node.children[1].value)
+        elif kind == "ASSIGN_MULTI":
+            names.update(ident.value for ident in node.children[0])
+        elif kind in ("PARAM", "BIND"):
+            names.add(node.children[0].value)
+    return names
+
+
+def int_exact_names(ast):
+    """
+    Variables que en tiempo de ejecución siempre contienen un int de Python.
+    El tipo 'int' de Wax no lo garantiza (a = b / 2 guarda un float), así
+    que se calcula el mayor conjunto de nombres cuyas escrituras, en todo
+    el programa, sólo combinan enteros y nombres del propio conjunto. Los
+    parámetros cuentan como escritos con los argumentos de cada llamada.
+    """
+    # nombre -> lista de (forma_entera, nombres leídos) de cada escritura
+    writes = {}
+    opaque = (False, frozenset())
+
+    def add(name, expr_info):
+        writes.setdefault(name, []).append(expr_info)
+
+    params = {}
+    calls = []
+    for node in walk(ast):
+        kind = node.type
+        if kind == "DECLARATION":
+            add(node.children[1].value, expr_names(node.children[2]))
+        elif kind in ("ASSIGN", "BIND"):
+            add(node.children[0].value, expr_names(node.children[1]))
+        elif kind == "ASSIGN_COMPOUND":
+            name = node.children[0].value
+            add(name, opaque if node.value == "/=" else expr_names(node.children[1]))
+        elif kind == "FOR":
+            add(node.children[1].value, expr_names(node.children[2]))
+        elif kind == "FOR_INCREMENT_EXPR":
+            name = node.children[0].value
+            add(name, opaque if node.value == "/=" else expr_names(node.children[1]))
+        elif kind == "ASSIGN_MULTI":
+            for ident in node.children[0]:
+                add(ident.value, opaque)
+        elif kind == "FUNCTION":
+            add(node.children[1].value, opaque)
+            names = params[node.children[1].value] = [p.children[0].value for p in node.children[2]]
+            for name in names:
+                writes.setdefault(name, [])
+        elif kind == "FUNC_CALL":
+            calls.append(node)
+        # INCREMENT y FOR_INCREMENT (+1 / -1) conservan el entero
+
+    # Las llamadas pueden aparecer antes que la definición de la función
+    for node in calls:
+        names = params.get(node.children[0].value, ())
+        for name, arg in zip(names, node.children[1:]):
+            add(name, expr_names(arg))
+
+    exact = set(writes)
+    changed = True
+    while changed:
+        changed = False
+        for name in list(exact):
+            for is_int, names in writes[name]:
+                if not is_int or not names <= exact:
+                    exact.discard(name)
+                    changed = True
+                    break
+    return exact
+
+
+def for_step(increment):
+    """Paso constante del incremento del for, o None si no es constante."""
+    if increment.type == "FOR_INCREMENT":
+        return 1 if increment.value == "++" else -1
+    if increment.value not in ("+=", "-="):
+        return None
+    amount = increment.children[1]
+    sign = 1
+    if amount.type == "UNARY_MINUS":
+        sign, amount = -1, amount.children[0]
+    if amount.type != "NUMBER" or not isinstance(amount.value, int) or amount.value == 0:
+        return None
+    step = sign * amount.value
+    return step if increment.value == "+=" else -step
+
+
+def range_spec(node, exact, visible):
+    """
+    Si el FOR 'node' tiene forma de contador seguro devuelve un dict con
+    'start', 'stop' (nodos Wax), 'offset' (ajuste del límite) y 'step';
+    si no, None y el generador usa la traducción con while.
+    """
+    _, ident, init, condition, increment, body = node.children
+    var = ident.value
+    # Si la variable ya existía fuera del for, su valor final (que difiere
+    # entre while y range) se puede leer después del ciclo.
+    if visible(var):
+        return None
+    step = for_step(increment)
+    if step is None or condition.type != "BINOP" or condition.value not in BOUNDS:
+        return None
+
+    left, right = condition.children
+    op = condition.value
+    if left.type == "IDENT" and left.value == var:
+        bound = right
+    elif right.type == "IDENT" and right.value == var:
+        bound, op = left, MIRRORED[op]
+    else:
+        return None
+    direction, offset = BOUNDS[op]
+    if (step > 0) != (direction > 0):
+        return None
+
+    init_int, init_names = expr_names(init)
+    bound_int, bound_names = expr_names(bound)
+    if not (init_int and bound_int and init_names <= exact and bound_names <= exact):
+        return None
+    if var in bound_names or written_names(body) & (bound_names | {var}):
+        return None
+    return {"start": init, "stop": bound, "offset": offset, "step": step}
+
+
+def global_declarations(ast):
+    """
+    Variables declaradas fuera de toda función (en cualquier bloque): en
+    Python todas quedan como globales del módulo.
+    """
+    names = set()
+    stack = list(ast)
+    while stack:
+        node = stack.pop()
+        if node is None:
+            continue
+        kind = node.type
+        if kind == "DECLARATION":
+            names.add(node.children[1].value)
+        elif kind in ("IF", "WHILE"):
+            stack.extend(node.children[1])
+        elif kind == "IF_ELSE":
+            stack.extend(node.children[1])
+            stack.extend(node.children[2])
+        elif kind == "FOR":
+            stack.extend(node.children[5])
+    return names
+
+
+def find_range_loops(ast):
+    """
+    Recorre el programa siguiendo los ámbitos de Wax y devuelve un dict
+    nodo FOR -> especificación de range() para cada for traducible.
+    """
+    exact = int_exact_names(ast)
+    global_names = global_declarations(ast)
+
+    loops = {}
+    scopes = [set()]
+    saved = []          # pilas de ámbitos guardadas al entrar a una función
+    in_function = [False]
+
+    def visible(name):
+        if in_function[0] and name in global_names:
+            return True
+        return any(name in scope for scope in scopes)
+
+    ENTER, EXIT, LEAVE_FUNCTION = object(), object(), object()
+    stack = [(stmt, None) for stmt in reversed(ast)]
+    while stack:
+        item, data = stack.pop()
+        if item is ENTER:
+            scopes.append(set(data))
+            continue
+        if item is EXIT:
+            scopes.pop()
+            continue
+        if item is LEAVE_FUNCTION:
+            scopes[:], in_function[0] = saved.pop()
+            continue
+        if item is None:
+            continue
+        kind = item.type
+        if kind == "DECLARATION":
+            scopes[-1].add(item.children[1].value)
+        elif kind in ("IF", "WHILE"):
+            stack.append((EXIT, None))
+            stack.extend((stmt, None) for stmt in reversed(item.children[1]))
+            stack.append((ENTER, ()))
+        elif kind == "IF_ELSE":
+            for block in (item.children[2], item.children[1]):
+                stack.append((EXIT, None))
+                stack.extend((stmt, None) for stmt in reversed(block))
+                stack.append((ENTER, ()))
+        elif kind == "FOR":
+            spec = range_spec(item, exact, visible)
+            if spec is not None:
+                loops[item] = spec
+            stack.append((EXIT, None))
+            stack.extend((stmt, None) for stmt in reversed(item.children[5]))
+            stack.append((ENTER, (item.children[1].value,)))
+        elif kind == "FUNCTION":
+            scopes[-1].add(item.children[1].value)
+            params = [param.children[0].value for param in item.children[2]]
+            saved.append((list(scopes), in_function[0]))
+            # Dentro de la función es visible todo lo que lo era al definirla
+            scopes[:] = [set().union(*scopes), set(params)]
+            in_function[0] = True
+            stack.append((LEAVE_FUNCTION, None))
+            stack.extend((stmt, None) for stmt in reversed(item.children[3]))
+    return loops
@@ -9,27 +9,32 @@ import json
 import io
 import contextlib
 
-from lexer import lexer
-from parser import parser
-from semantic import SemanticAnalyzer
-from generator import CodeGenerator  # <-- 1. IMPORTAR EL GENERADOR
+from compiler import Compiler, BACKENDS
+from ast_nodes import Node
+from build_cache import BuildCache, default_directory
+from runtime import (DEFAULT_CPU_SECONDS, DEFAULT_MEMORY_BYTES, DEFAULT_TIMEOUT, INPUT_MODES,
+                     OUTPUT_MODES, run_program)
 
 # ==============================
 # FUNCIÓN DE UTILIDAD (print_ast)
 # ==============================
-def print_ast(node_list, indent=""):
+def print_ast(node_list, indent="", file=None):
     """
     Imprime el AST de forma legible en la consola.
     Esta versión maneja correctamente listas anidadas (bloques 'program').
+    Usa una pila explícita, así que no depende del límite de recursión.
     """
     if not isinstance(node_list, list):
         node_list = [node_list]
 
-    for node in node_list:
+    # Pila de (nodo, indentación); se apila al revés para conservar el orden
+    stack = [(node, indent) for node in reversed(node_list)]
+    while stack:
+        node, indent = stack.pop()
         if not node:
             continue
 
-        if isinstance(node, dict):
+        if isinstance(node, Node):
             node_type = node.get("type", "N/A")
             line = node.get("lineno", "N/A")
             label = f"{indent}├── {node_type} [linea {line}]"
@@ -40,29 +45,82 @@ def print_ast(node_list, indent=""):
             if "datatype" in node and node["datatype"] is not None:
                 label += f" ({node['datatype']})"
 
-            print(label)
+            print(label, file=file)
             
             children = node.get("children", [])
             if children:
                 child_indent = indent + "│   "
-                print_ast(children, child_indent)
+                stack.extend((child, child_indent) for child in reversed(children))
         
         elif isinstance(node, list):
-            print_ast(node, indent)
+            stack.extend((child, indent) for child in reversed(node))
 
 # ==============================
-# EJECUCIÓN PRINCIPAL
+# COMPILACIÓN POR LOTES (--batch)
 # ==============================
-def main():
+def run_batch(args):
+    """Compila los archivos de --batch y devuelve el código de salida."""
+    # Se importa aquí: carga multiprocessing, que retrasa el arranque de main.py
+    from batch_compiler import compile_paths, expand_paths
+
+    paths = expand_paths(args.filename)
+    if not paths:
+        print("[Error Crítico] No se encontró ningún archivo .wax.")
+        return 1
+
+    cache_directory = None if args.no_cache else default_directory()
+    summary = compile_paths(paths, args.jobs, args.backend, args.optimize, cache_directory,
+                            args.entry_function)
+
+    # Con el resumen en la salida estándar, el reporte legible va a stderr
+    out = sys.stderr if args.summary == "-" else sys.stdout
+    for record in summary["files"]:
+        if record["status"] != "ok":
+            print(f"✗ {record['path']}: {record['status']}", file=out)
+            for message in record["diagnostics"]:
+                print(f"    {message}", file=out)
+    print(f"\n✔ {summary['ok']} de {summary['total']} archivos compilados sin errores "
+          f"en {summary['elapsed']:.2f} s ({summary['files_per_second']:.1f} archivos/s, "
+          f"{summary['jobs']} procesos, {summary['cached']} desde la caché).", file=out)
+
+    if args.cache_stats and cache_directory:
+        totals = BuildCache(cache_directory).totals()
+        print(f"[Caché] acumulado: {totals['hits']} aciertos, {totals['misses']} fallos | "
+              f"{totals['entries']} entradas, {totals['bytes'] / 1024:.1f} KiB en {cache_directory}",
+              file=out)
+
+    if args.summary == "-":
+        json.dump(summary, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    elif args.summary:
+        try:
+            with open(args.summary, "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2, ensure_ascii=False)
+        except OSError as e:
+            print(f"[Error Crítico] No se pudo escribir el resumen '{args.summary}': {e.strerror}")
+            return 1
+    return 1 if summary["failed"] else 0
+
+# ==============================
+# ARGUMENTOS DE LA LÍNEA DE COMANDOS
+# ==============================
+def build_arg_parser(parser_class=argparse.ArgumentParser):
+    """
+    Parser de los argumentos de main.py. El servidor de compilación
+    (compile_server.py) lo usa con una subclase que captura los mensajes
+    en lugar de escribirlos y terminar el proceso.
+    """
     # --- 1. Configurar el Parser de Argumentos ---
-    arg_parser = argparse.ArgumentParser(
+    arg_parser = parser_class(
         description="Compilador 'Wax' (Lexer, Parser, Analyzer, Generator).",
         epilog="Por defecto (sin flags), solo reportará errores si los encuentra."
     )
     
     arg_parser.add_argument(
         "filename",
-        help="El archivo .wax que se va a compilar."
+        nargs="+",
+        help="El archivo .wax que se va a compilar (con --batch: archivos, "
+             "directorios o patrones glob)."
     )
     arg_parser.add_argument(
         "--tokens",
@@ -84,13 +142,134 @@ def main():
     arg_parser.add_argument(
         "--code",
         action="store_true",
-        help="Muestra el código Python generado (FASE 4)."
+        help="Muestra el código Python generado (FASE 4). Sus print() no llevan "
+             "flush=True (ver --output): ejecutado por separado hacia un pipe, "
+             "use 'python -u' para ver cada línea en cuanto se imprime."
     )
     arg_parser.add_argument(
         "--execute",
         action="store_true",
         help="Ejecuta el código Python generado (FASE 5)."
     )
+    arg_parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="ast",
+        help="Cómo se genera el código ejecutable: 'ast' compila un árbol ast de Python "
+             "directamente; 'source' genera el texto Python y lo compila (por defecto: ast)."
+    )
+    arg_parser.add_argument(
+        "-O", "--optimize",
+        action="store_true",
+        help="Optimiza el programa antes de generar el código (plegado y "
+             "propagación de constantes, expansión de funciones pequeñas en línea, "
+             "invariantes fuera de los ciclos, subexpresiones comunes, eliminación "
+             "de código muerto)."
+    )
+    arg_parser.add_argument(
+        "--entry-function",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Genera el código de nivel superior dentro de una función de entrada "
+             "_wax_main() para que sus variables sean locales rápidas de Python (por "
+             "defecto). Con --no-entry-function queda a nivel de módulo, con variables "
+             "globales y sin declaraciones 'global': el código de --code se parece "
+             "más al programa Wax, pero los ciclos son más lentos."
+    )
+    arg_parser.add_argument(
+        "--max-steps",
+        type=int,
+        metavar="N",
+        help="Genera el código con un presupuesto de N pasos (cada vuelta de un while o "
+             "de un for y cada llamada a una función toma uno): al agotarse, el programa se detiene con "
+             "StepLimitExceeded y la línea del .wax. Con o sin --isolate."
+    )
+    arg_parser.add_argument(
+        "--output",
+        choices=OUTPUT_MODES,
+        default="interactive",
+        help="Cómo se escribe la salida del programa con --execute: 'interactive' la "
+             "vacía después de cada línea; 'buffered' la acumula en bloques grandes y "
+             "sólo la vacía antes de input(), al terminar y si hay un error "
+             "(por defecto: interactive). El código generado ya no lleva "
+             "print(..., flush=True): esto lo decide quien lo ejecuta."
+    )
+    arg_parser.add_argument(
+        "--input",
+        choices=INPUT_MODES,
+        default="interactive",
+        help="Cómo lee input() con --execute: 'interactive' lee una línea cada vez; "
+             "'batch' lee toda la entrada de una vez (stdin o --input-file) y sirve "
+             "cada input() desde ese búfer (por defecto: interactive)."
+    )
+    arg_parser.add_argument(
+        "--input-file",
+        metavar="ARCHIVO",
+        help="Lee la entrada del programa de ARCHIVO en lugar de stdin (implica --input batch)."
+    )
+    arg_parser.add_argument(
+        "--no-prompts",
+        action="store_true",
+        help="No imprime los mensajes de input(\"...\") (implica --input batch)."
+    )
+    arg_parser.add_argument(
+        "--isolate",
+        action="store_true",
+        help="Con --execute, ejecuta el programa en un proceso aparte con límites de "
+             "tiempo, CPU, memoria y salida; la entrada se lee completa antes de empezar "
+             "(como --input batch)."
+    )
+    arg_parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        metavar="SEG",
+        help=f"Con --isolate, segundos de tiempo real, incluida la lectura de la entrada "
+             f"estándar (por defecto: {DEFAULT_TIMEOUT:g})."
+    )
+    arg_parser.add_argument(
+        "--cpu-limit",
+        type=int,
+        default=DEFAULT_CPU_SECONDS,
+        metavar="SEG",
+        help=f"Con --isolate, segundos de CPU (por defecto: {DEFAULT_CPU_SECONDS})."
+    )
+    arg_parser.add_argument(
+        "--memory-limit",
+        type=int,
+        default=DEFAULT_MEMORY_BYTES // (1024 * 1024),
+        metavar="MB",
+        help=f"Con --isolate, memoria en MiB (por defecto: {DEFAULT_MEMORY_BYTES // (1024 * 1024)})."
+    )
+    arg_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="No usa la caché de compilación (por defecto se guarda en ~/.cache/wax "
+             "o en $WAX_CACHE_DIR y se reutiliza si el archivo no cambió)."
+    )
+    arg_parser.add_argument(
+        "--cache-stats",
+        action="store_true",
+        help="Muestra los aciertos y fallos de la caché de compilación."
+    )
+    arg_parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Compila todos los archivos indicados (los directorios se recorren "
+             "buscando .wax) en un pool de procesos; no muestra fases ni ejecuta."
+    )
+    arg_parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        metavar="N",
+        help="Con --batch, número de procesos (por defecto: uno por núcleo)."
+    )
+    arg_parser.add_argument(
+        "--summary",
+        metavar="ARCHIVO",
+        help="Con --batch, escribe el resumen en JSON (estado, diagnósticos y tiempo "
+             "de cada archivo) en ARCHIVO, o en la salida estándar con '-'."
+    )
     # -------------------------------
 
     arg_parser.add_argument(
@@ -98,98 +277,160 @@ def main():
         action="store_true",
         help="Muestra la salida de todas las fases (tokens, AST, tabla y código)."
     )
-    
-    args = arg_parser.parse_args()
+    return arg_parser
 
-    # --- 2. Lectura del Archivo ---
+
+def isolation_limits(args):
+    """Límites de exec_pool.run_isolated() para --isolate, o None sin --isolate."""
+    if not args.isolate:
+        return None
+    return {
+        "timeout": args.timeout,
+        "cpu_seconds": args.cpu_limit,
+        "memory_bytes": args.memory_limit * 1024 * 1024,
+    }
+
+
+def execution_options(args):
+    """Argumentos de runtime.run_program() que corresponden a 'args'."""
+    batch = args.input == "batch" or args.input_file or args.no_prompts
+    return {
+        "output": args.output,
+        "input_mode": "batch" if batch else "interactive",
+        "input_file": args.input_file,
+        "prompts": not args.no_prompts,
+    }
+
+# ==============================
+# FASES 1 A 4 Y REPORTES
+# ==============================
+def read_program(filename, path=None, out=None):
+    """Lee el archivo .wax ('path', por defecto 'filename'); None si no existe."""
     try:
-        with open(args.filename, "r", encoding="utf-8") as f:
-            data = f.read()
+        with open(path or filename, "r", encoding="utf-8") as f:
+            return f.read()
     except FileNotFoundError:
-        print(f"[Error Crítico] No se encontró el archivo '{args.filename}'")
-        sys.exit(1)
+        print(f"[Error Crítico] No se encontró el archivo '{filename}'", file=out)
+        return None
 
-    # --- 3. Ejecutar Fases (Recolección) ---
 
-    # FASE 1: LÉXICO
-    lexer.input(data)
-    token_list = []
-    while True:
-        tok = lexer.token()
-        if not tok:
-            break
-        token_list.append(tok)
+def compile_and_report(compiler, data, args, out=None, err=None):
+    """
+    Compila 'data' y escribe en 'out' (stdout por defecto) los errores y las
+    fases que piden los flags. Devuelve el CompilationResult, o None si el
+    programa no compiló. Los errores sintácticos van a 'err' (stderr).
+    """
+    # FASES 1 a 4: léxico, sintáctico, semántico y generación
+    result = compiler.compile(data, args.filename)
 
-    # FASE 2: SINTÁCTICO
-    lexer.lineno = 1
-    ast = parser.parse(data, lexer=lexer)
-    
-    if not ast:
-        print("[Error Crítico] Falló el análisis sintáctico. No se puede continuar.")
-        sys.exit(1)
+    cache = compiler.cache
+    if cache is not None and args.cache_stats:
+        totals = cache.totals()
+        state = "acierto" if result.from_cache else "fallo"
+        print(f"[Caché] {state} | acumulado: {totals['hits']} aciertos, {totals['misses']} fallos | "
+              f"{totals['entries']} entradas, {totals['bytes'] / 1024:.1f} KiB en {cache.directory}",
+              file=out)
+
+    for message in result.syntax_errors:
+        print(message, file=err if err is not None else sys.stderr)
 
-    # FASE 3: SEMÁNTICO
-    analyzer = SemanticAnalyzer()
-    analyzer.analyze(ast)
+    # Sólo se reconstruye el AST de una entrada de la caché si hace falta
+    if result.code_object is None and not result.ast:
+        print("[Error Crítico] Falló el análisis sintáctico. No se puede continuar.", file=out)
+        return None
 
     # --- 4. Reporte de Errores Semánticos ---
-    if analyzer.errors:
-        print("\n=== SE ENCONTRARON ERRORES ===")
-        for error in analyzer.errors:
-            print(error)
-        print("[Error Crítico] Falló el análisis semántico.")
-        sys.exit(1)
+    if result.semantic_errors:
+        print("\n=== SE ENCONTRARON ERRORES ===", file=out)
+        for error in result.semantic_errors:
+            print(error, file=out)
+        print("[Error Crítico] Falló el análisis semántico.", file=out)
+        return None
 
     # --- 5. FASE 4: GENERACIÓN DE CÓDIGO ---
     # (Solo se ejecuta si las fases anteriores pasaron)
-    python_code = None
-    try:
-        generator = CodeGenerator()
-        python_code = generator.generate(ast)
-    except Exception as e:
-        print(f"\n[Error Crítico] Falló el generador de código.")
-        print(f"    > {type(e).__name__}: {e}")
-        sys.exit(1)
+    if result.generator_error:
+        e = result.generator_error
+        print(f"\n[Error Crítico] Falló el generador de código.", file=out)
+        print(f"    > {type(e).__name__}: {e}", file=out)
+        return None
+
+    # --- 6. REPORTE DE LAS FASES ---
 
-    # --- 6. FASES 5 y 6: REPORTE Y EJECUCIÓN ---
-    
     if args.tokens or args.all:
-        print("\n=== FASE 1: TOKENS ===")
-        for tok in token_list:
-            print(f"{tok.type}: {tok.value} (linea {tok.lineno})")
+        print("\n=== FASE 1: TOKENS ===", file=out)
+        for tok in result.tokens:
+            print(f"{tok.type}: {tok.value} (linea {tok.lineno})", file=out)
 
     if args.ast or args.all:
-        print("\n=== FASE 2: AST (ÁRBOL DE SINTAXIS) ===")
-        print_ast(ast)
+        print("\n=== FASE 2: AST (ÁRBOL DE SINTAXIS) ===", file=out)
+        print_ast(result.ast, file=out)
 
     if args.table or args.all:
-        print("\n=== FASE 3: REGISTRO DE SÍMBOLOS ===")
-        print(json.dumps(analyzer.symbol_log, indent=2))
+        print("\n=== FASE 3: REGISTRO DE SÍMBOLOS ===", file=out)
+        print(json.dumps(result.symbol_log, indent=2), file=out)
+
+    if args.optimize and (args.code or args.all):
+        print("\n=== OPTIMIZACIÓN (-O) ===", file=out)
+        stats = result.optimizer_stats
+        print(f"Expresiones constantes plegadas: {stats.get('folded', 0)}", file=out)
+        print(f"Constantes propagadas: {stats.get('propagated', 0)}", file=out)
+        print(f"Llamadas expandidas en línea: {stats.get('inlined', 0)}", file=out)
+        print(f"Expresiones invariantes sacadas de ciclos: {stats.get('hoisted', 0)}", file=out)
+        print(f"Subexpresiones comunes reutilizadas: {stats.get('reused', 0)}", file=out)
+        print(f"Nodos eliminados (código muerto): {stats.get('removed', 0)}", file=out)
 
     if args.code or args.all:
-        print("\n=== FASE 4: CÓDIGO PYTHON GENERADO ===")
-        print(python_code)
+        print("\n=== FASE 4: CÓDIGO PYTHON GENERADO ===", file=out)
+        print(result.python_code, file=out)
+
+    return result
+
+# ==============================
+# EJECUCIÓN PRINCIPAL
+# ==============================
+def main():
+    arg_parser = build_arg_parser()
+    args = arg_parser.parse_args()
+
+    if args.batch:
+        if (args.tokens or args.ast or args.table or args.code or args.execute or args.all
+                or args.max_steps is not None):
+            arg_parser.error("--batch sólo compila; no se combina con --tokens, --ast, "
+                             "--table, --code, --execute, --max-steps ni --all")
+        if args.jobs is not None and args.jobs < 1:
+            arg_parser.error("--jobs debe ser al menos 1")
+        sys.exit(run_batch(args))
+    if len(args.filename) > 1:
+        arg_parser.error("sin --batch se compila un solo archivo")
+    if args.max_steps is not None and args.max_steps < 1:
+        arg_parser.error("--max-steps debe ser al menos 1")
+    args.filename = args.filename[0]
+
+    # --- 2. Lectura del Archivo ---
+    data = read_program(args.filename)
+    if data is None:
+        sys.exit(1)
 
+    # --- 3. Ejecutar Fases ---
+    cache = None if args.no_cache else BuildCache()
+    compiler = Compiler(args.backend, optimize=args.optimize, cache=cache, step_budget=args.max_steps,
+                        entry_function=args.entry_function)
+    result = compile_and_report(compiler, data, args)
+    if result is None:
+        sys.exit(1)
+
+    # --- 7. FASE 5: EJECUCIÓN ---
     if args.execute:
-        print("\n=== FASE 5: EJECUTANDO CÓDIGO... ===")
-        print("--- Salida del Programa ---")
-        try:
-            # NO capturamos stdout para que input() funcione correctamente
-            # El código se ejecuta directamente mostrando todo en tiempo real
-            shared_scope = {}
-            exec(python_code, shared_scope,shared_scope)
-            
-            print("---------------------------")
-            print("✓ Ejecución finalizada.")
+        options = execution_options(args)
+        limits = isolation_limits(args)
+        if limits is not None:
+            from exec_pool import run_isolated     # como en run_batch: carga multiprocessing
+            sys.exit(run_isolated(result.code_object, options["input_file"], options["prompts"], **limits))
+        sys.exit(run_program(result.code_object, **options))
 
-        except Exception as e:
-            print(f"\n[Error de Ejecución] El programa generado falló.")
-            print(f"    > {type(e).__name__}: {e}")
-            sys.exit(1)
-    
-    if not args.execute:
-        print("\n✔ Compilación exitosa. Sin errores.")
+    print("\n✔ Compilación exitosa. Sin errores.")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
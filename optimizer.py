@@ -0,0 +1,1416 @@
+# optimizer.py
+# Etapa opcional (-O) entre el análisis semántico y la generación de código.
+# Pasadas: plegado y propagación de constantes, expansión en línea de
+# funciones pequeñas, extracción de expresiones invariantes de los ciclos y
+# eliminación de código muerto (sentencias inalcanzables, ramas con
+# condición constante, funciones que nunca se llaman y asignaciones a
+# variables que nunca se leen).
+# Las pasadas reciben el AST ya validado y devuelven un AST nuevo: los
+# subárboles que no cambian se comparten con el original, que queda intacto
+# (la pestaña/flag del AST sigue mostrando lo que se escribió).
+# Todas recorren el árbol con 'trampoline', sin recursión nativa.
+
+import math
+import operator
+
+from ast_nodes import Node, dispatch_table, trampoline, walk
+from loop_analysis import BOUNDS, for_step, int_exact_names, written_names
+
+# Tipos de Wax cuyos valores son inmutables y se pueden propagar
+SCALAR_TYPES = frozenset(("int", "double", "string", "bool"))
+
+# Operadores de BINOP -> misma operación de Python que ejecuta el código generado
+BINARY_OPERATORS = {
+    "+": operator.add, "-": operator.sub, "*": operator.mul,
+    "/": operator.truediv, "%": operator.mod, "**": operator.pow,
+    "==": operator.eq, "!=": operator.ne, "<": operator.lt,
+    "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+}
+
+# Límites de tamaño de un resultado plegado (los mismos que usa el
+# optimizador de CPython): más grande que esto no vale la pena escribirlo
+# como literal en el código generado.
+MAX_INT_BITS = 128
+MAX_STRING_LENGTH = 4096
+
+# Sentencias que vuelven a asignar una variable ya declarada
+REASSIGN_TYPES = frozenset(("ASSIGN", "ASSIGN_COMPOUND", "INCREMENT"))
+
+# Marca de "no es una constante" (None no sirve: no es un valor de Wax)
+NOT_CONSTANT = object()
+
+# Sentencias que guardan un valor en una variable: tipo -> (índice del
+# destino, índice del valor o None)
+STORE_TYPES = {
+    "DECLARATION": (1, 2), "ASSIGN": (0, 1),
+    "ASSIGN_COMPOUND": (0, 1), "INCREMENT": (0, None),
+}
+
+# Aritmética entera que nunca lanza una excepción (sin /, % ni **)
+SAFE_INT_OPS = frozenset(("+", "-", "*"))
+SAFE_COMPARISONS = frozenset(("<", "<=", ">", ">="))
+COMPARISONS = SAFE_COMPARISONS | {"==", "!="}
+
+
+def constant_value(node):
+    """Valor de Python de un literal, o NOT_CONSTANT."""
+    kind = node.type
+    if kind in ("NUMBER", "BOOL"):
+        return node.value
+    if kind == "STRING" and plain_string(node.value):
+        return node.value
+    return NOT_CONSTANT
+
+
+def plain_string(text):
+    """
+    True si el texto se escribe tal cual entre comillas en el código
+    generado. Los generadores vuelven a interpretar los escapes del valor,
+    así que sólo se pliegan strings sin barras, comillas ni saltos.
+    """
+    return not any(char in text for char in '\\"\n\r')
+
+
+def constant_node(value, lineno):
+    """Literal de Wax con el valor 'value', o None si no se puede escribir."""
+    if value.__class__ is bool:
+        return Node("BOOL", value=value, datatype="bool", lineno=lineno)
+    if value.__class__ is int:
+        if value.bit_length() > MAX_INT_BITS:
+            return None
+        return Node("NUMBER", value=value, datatype="int", lineno=lineno)
+    if value.__class__ is float:
+        if not math.isfinite(value):
+            return None
+        return Node("NUMBER", value=value, datatype="double", lineno=lineno)
+    if value.__class__ is str:
+        if len(value) > MAX_STRING_LENGTH or not plain_string(value):
+            return None
+        return Node("STRING", value=value, datatype="string", lineno=lineno)
+    return None
+
+
+def node_count(tree):
+    """Número de nodos de Wax en un subárbol (o bloque)."""
+    return sum(1 for _ in walk(tree))
+
+
+def statements(tree):
+    """
+    Recorre las sentencias de un bloque y de sus bloques anidados, sin
+    entrar en las expresiones.
+    """
+    stack = [tree]
+    while stack:
+        item = stack.pop()
+        if item.__class__ is list:
+            stack.extend(item)
+            continue
+        yield item
+        for child in item.children:
+            if child.__class__ is list:
+                stack.append(child)
+
+
+def with_children(node, children):
+    """'node' con otros hijos (el mismo nodo si no cambió ninguno)."""
+    for new, old in zip(children, node.children):
+        if new is not old:
+            return Node(node.type, children, node.value, node.datatype, node.lineno)
+    return node
+
+
+class Rewriter:
+    """
+    Base de las pasadas: visita cada nodo y devuelve su reemplazo. Por
+    defecto reconstruye el nodo con sus hijos visitados. En un bloque, un
+    visitante de sentencia puede devolver None para eliminarla o una lista
+    de sentencias para sustituirla.
+    """
+    def __init__(self, optimizer):
+        self.optimizer = optimizer
+        self.stats = optimizer.stats
+        self._visitors = dispatch_table(type(self), 'visit_')
+
+    def count(self, key, amount=1):
+        self.stats[key] = self.stats.get(key, 0) + amount
+
+    def run(self, ast):
+        return trampoline(self._visit(ast))
+
+    def _visit(self, node):
+        if node is None:
+            return None
+        if isinstance(node, list):
+            return self.visit_block(node)
+        method = self._visitors.get(node.type)
+        if method is None:
+            return self.generic_visit(node)
+        return method(self, node)
+
+    def visit_block(self, nodes):
+        block = []
+        for item in nodes:
+            new = yield self._visit(item)
+            if new.__class__ is list:
+                block.extend(new)
+            elif new is not None:
+                block.append(new)
+        if len(block) == len(nodes) and all(new is old for new, old in zip(block, nodes)):
+            return nodes
+        return block
+
+    def generic_visit(self, node):
+        if not node.children:
+            return node
+        return self.visit_children(node)
+
+    def visit_children(self, node):
+        children = []
+        for child in node.children:
+            children.append((yield self._visit(child)))
+        return with_children(node, children)
+
+
+class ConstantFolder(Rewriter):
+    """
+    Pliega BINOP, LOGIC, NOT y UNARY_MINUS con operandos literales y
+    propaga las declaraciones 'wax' de tipo escalar que nunca se vuelven a
+    asignar. El valor plegado es exactamente el que calcularía Python al
+    ejecutar el código generado (7 / 2 -> 3.5, 6 / 2 -> 3.0, 2 ** -1 -> 0.5),
+    así que un resultado 'int' sigue siendo int y uno 'double' sigue siendo
+    float. Lo que fallaría en ejecución (1 / 0, "a" + 1) no se pliega.
+    """
+    def __init__(self, optimizer):
+        super().__init__(optimizer)
+        self.candidates = set()
+        self.constants = {}     # nombre -> literal de su declaración
+
+    def run(self, ast):
+        self.candidates = self.propagation_candidates(ast)
+        self.constants = {}
+        return super().run(ast)
+
+    def propagation_candidates(self, ast):
+        """
+        Variables con una sola declaración en todo el programa (según la
+        tabla de símbolos del analizador), de tipo escalar y sin ninguna
+        asignación posterior: cada lectura de ese nombre es su valor inicial.
+        """
+        declared = {}
+        for entry in self.optimizer.symbol_log:
+            if entry['line']:  # las funciones integradas tienen línea 0
+                declared.setdefault(entry['name'], []).append(entry['type_info'])
+        names = {name for name, types in declared.items()
+                 if len(types) == 1 and types[0] in SCALAR_TYPES}
+        for node in statements(ast):
+            kind = node.type
+            if kind in REASSIGN_TYPES:
+                names.discard(node.children[0].value)
+            elif kind == "FOR":
+                names.discard(node.children[4].children[0].value)
+            elif kind == "ASSIGN_MULTI":
+                names.difference_update(ident.value for ident in node.children[0])
+        return names
+
+    # --- SENTENCIAS ---
+
+    def visit_DECLARATION(self, node):
+        var_type, ident, value = node.children
+        value = yield self._visit(value)
+        if ident.value in self.candidates and constant_value(value) is not NOT_CONSTANT:
+            self.constants[ident.value] = value
+        return with_children(node, [var_type, ident, value])
+
+    def visit_ASSIGN_MULTI(self, node):
+        # Los destinos son nodos IDENT: sólo se visitan los valores
+        targets, values = node.children
+        values = yield self._visit(values)
+        return with_children(node, [targets, values])
+
+    # --- EXPRESIONES ---
+
+    def visit_BIND(self, node):
+        # Temporal de una llamada expandida con un valor constante: sus
+        # lecturas (siempre después, en la misma expresión) usan el literal
+        target, value = node.children
+        value = yield self._visit(value)
+        if constant_value(value) is NOT_CONSTANT:
+            return with_children(node, [target, value])
+        self.constants[target.value] = value
+        return value
+
+    def visit_IDENT(self, node):
+        value = self.constants.get(node.value)
+        if value is None:
+            return node
+        self.count("propagated")
+        return Node(value.type, value=value.value, datatype=value.datatype, lineno=node.lineno)
+
+    def visit_BINOP(self, node):
+        # Se pliega a lo largo de la espina izquierda (a + b + c ...) en un
+        # bucle, como en los generadores, para no apilar un generador por
+        # operador en cadenas muy largas.
+        spine = []
+        while node.type in ("BINOP", "LOGIC"):
+            spine.append(node)
+            node = node.children[0]
+        result = yield self._visit(node)
+        for op_node in reversed(spine):
+            right = yield self._visit(op_node.children[1])
+            result = self.fold_operator(op_node, result, right)
+        return result
+
+    visit_LOGIC = visit_BINOP
+
+    def fold_operator(self, node, left, right):
+        left_value = constant_value(left)
+        if node.type == "LOGIC":
+            if left_value is NOT_CONSTANT:
+                return with_children(node, [left, right])
+            # Igual que 'or'/'and' de Python: true || x -> true, false || x -> x
+            self.count("folded")
+            if node.value == "||":
+                return left if left_value else right
+            return right if left_value else left
+
+        right_value = constant_value(right)
+        if left_value is NOT_CONSTANT or right_value is NOT_CONSTANT:
+            return with_children(node, [left, right])
+        folded = self.evaluate(node.value, left_value, right_value, node.lineno)
+        if folded is None:
+            return with_children(node, [left, right])
+        self.count("folded")
+        return folded
+
+    def evaluate(self, op, left, right, lineno):
+        """Literal con el resultado de 'left op right', o None."""
+        if op == "**" and left.__class__ is int and right.__class__ is int:
+            # Evita calcular potencias enormes sólo para descartarlas
+            if right > 0 and abs(left) > 1 and (abs(left).bit_length() - 1) * right > MAX_INT_BITS:
+                return None
+        try:
+            value = BINARY_OPERATORS[op](left, right)
+        except (ArithmeticError, TypeError, ValueError):
+            return None
+        return constant_node(value, lineno)
+
+    def visit_NOT(self, node):
+        operand = yield self._visit(node.children[0])
+        value = constant_value(operand)
+        if value is NOT_CONSTANT:
+            return with_children(node, [operand])
+        self.count("folded")
+        return constant_node(not value, node.lineno)
+
+    def visit_UNARY_MINUS(self, node):
+        operand = yield self._visit(node.children[0])
+        value = constant_value(operand)
+        folded = None
+        if value is not NOT_CONSTANT and value.__class__ is not str:
+            folded = constant_node(-value, node.lineno)
+        if folded is None:
+            return with_children(node, [operand])
+        self.count("folded")
+        return folded
+
+
+# Tamaño máximo (en nodos de Wax) de la expresión de una función que se
+# expande en línea en cada llamada (también después de expandir las
+# llamadas que ella misma hace)
+INLINE_BUDGET = 24
+
+# Argumentos que se pueden repetir (o descartar) al sustituirlos en el
+# cuerpo: leerlos no tiene efectos. El resto se guarda en una temporal.
+SIMPLE_TYPES = frozenset(("NUMBER", "STRING", "BOOL", "IDENT"))
+
+# Tipos de Wax que en Python siempre son int o float
+NUMERIC_TYPES = frozenset(("int", "double"))
+
+
+def return_expression(body):
+    """
+    Expresión que devuelve una función de un solo return, o None. También
+    reconoce los predicados 'if (c) { return true; } return false;' (y con
+    else), que equivalen a 'return c;' o 'return !c;'.
+    """
+    if len(body) == 1 and body[0].type == "RETURN_VALUE":
+        values = body[0].children
+        return values[0] if len(values) == 1 else None
+    if len(body) == 2 and body[0].type == "IF" and body[1].type == "RETURN_VALUE":
+        condition, then_block = body[0].children
+        else_block = body[1:]
+    elif len(body) == 1 and body[0].type == "IF_ELSE":
+        condition, then_block, else_block = body[0].children
+    else:
+        return None
+    results = []
+    for block in (then_block, else_block):
+        if len(block) != 1 or block[0].type != "RETURN_VALUE" or len(block[0].children) != 1:
+            return None
+        results.append(block[0].children[0])
+    if not all(result.type == "BOOL" for result in results) or results[0].value == results[1].value:
+        return None
+    if results[0].value:
+        return condition
+    return Node("NOT", [condition], lineno=condition.lineno)
+
+
+def always_bool(expr):
+    """True si 'expr' siempre da un bool de Python (comparaciones, !, && y || de ellas)."""
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        if node.type == "LOGIC":
+            stack.extend(node.children)
+        elif not (node.type in ("BOOL", "NOT") or
+                  (node.type == "BINOP" and node.value in COMPARISONS)):
+            return False
+    return True
+
+
+def numeric(expr):
+    """
+    True si 'expr' siempre da un int o float de Python. Las variables que
+    crea la expansión (IDENT y BIND) llevan en 'datatype' el tipo del
+    parámetro que sustituyen; las demás no se consideran.
+    """
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        kind = node.type
+        if kind in ("IDENT", "BIND"):
+            if node.datatype not in NUMERIC_TYPES:
+                return False
+        elif (kind == "BINOP" and node.value in SAFE_INT_OPS) or kind == "UNARY_MINUS":
+            stack.extend(node.children)
+        elif kind != "NUMBER":
+            return False
+    return True
+
+
+def harmless(node):
+    """True si, con sus operandos ya evaluados, 'node' no tiene efectos y no puede lanzar."""
+    kind = node.type
+    if kind == "BINOP":
+        if node.value in ("==", "!="):
+            return True
+        if node.value in SAFE_INT_OPS or node.value in SAFE_COMPARISONS:
+            return all(numeric(child) for child in node.children)
+        return False
+    if kind == "UNARY_MINUS":
+        return numeric(node.children[0])
+    return kind in ("NUMBER", "STRING", "BOOL", "IDENT", "NOT", "LOGIC", "BIND")
+
+
+class Expansion:
+    """
+    Copia de la expresión de una función para una llamada concreta, con la
+    línea de la llamada y los parámetros sustituidos por los argumentos.
+    Los literales y las variables se sustituyen directamente; cada argumento
+    compuesto se guarda en una temporal en su primer uso (nodo BIND):
+        cuadrado(i % 10)  ->  (_wax_a0 := i % 10) * _wax_a0
+    Eso equivale a evaluarlo antes del cuerpo, como en la llamada, si ese
+    primer uso no es condicional (lado derecho de && o ||), las temporales
+    se ligan en el orden de los argumentos y hasta ligar la última el cuerpo
+    sólo hace operaciones sin efectos que no lanzan excepciones. Si no, la
+    copia no es válida ('complete' da False) y la llamada se mantiene.
+    """
+    def __init__(self, optimizer, params, types, args, line):
+        self.optimizer = optimizer
+        self.line = line
+        self.valid = True
+        self.params = {}        # parámetro -> (argumento, tipo)
+        self.pending = []       # parámetros con argumento compuesto aún sin ligar
+        self.temps = {}         # parámetro o temporal de la expresión -> (temporal de la copia, tipo)
+        for param, param_type, arg in zip(params, types, args):
+            self.params[param] = (arg, param_type)
+            if arg.type not in SIMPLE_TYPES:
+                self.pending.append(param)
+
+    def complete(self):
+        return self.valid and not self.pending
+
+    def copy(self, expr, conditional=False):
+        kind = expr.type
+        if kind == "IDENT":
+            name = expr.value
+            if name in self.temps:
+                temp, datatype = self.temps[name]
+                return Node("IDENT", value=temp, datatype=datatype, lineno=self.line)
+            if name in self.params:
+                return self.bind(name, conditional)
+        elif kind == "BIND":
+            # Temporal de una llamada ya expandida dentro de la expresión:
+            # cada copia usa la suya
+            value = yield self.copy(expr.children[1], conditional)
+            temp = self.optimizer.new_temp()
+            self.temps[expr.children[0].value] = (temp, expr.datatype)
+            target = Node("Identifier", value=temp, lineno=self.line)
+            return Node("BIND", [target, value], datatype=expr.datatype, lineno=self.line)
+        children = []
+        for index, child in enumerate(expr.children):
+            children.append((yield self.copy(child, conditional or (kind == "LOGIC" and index == 1))))
+        node = Node(kind, children, expr.value, expr.datatype, self.line)
+        if self.pending and not harmless(node):
+            self.valid = False
+        return node
+
+    def bind(self, param, conditional):
+        arg, param_type = self.params[param]
+        if arg.type in SIMPLE_TYPES:
+            return Node(arg.type, value=arg.value, datatype=arg.datatype or param_type, lineno=arg.lineno)
+        if conditional or self.pending[0] != param:
+            self.valid = False
+            return arg
+        self.pending.pop(0)
+        temp = self.optimizer.new_temp()
+        self.temps[param] = (temp, param_type)
+        target = Node("Identifier", value=temp, lineno=self.line)
+        return Node("BIND", [target, arg], datatype=param_type, lineno=self.line)
+
+
+class FunctionInliner(Rewriter):
+    """
+    Sustituye las llamadas a funciones pequeñas (una sola expresión de
+    retorno de hasta INLINE_BUDGET nodos) y no recursivas por su expresión
+    (ver Expansion). Antes de copiarla se expanden en ella las llamadas a
+    otras funciones expandibles, una vez por función.
+    """
+    def run(self, ast):
+        self.inlineable = self.inlineable_functions(ast)
+        if not self.inlineable:
+            return ast
+        self.templates = {}     # nombre -> expresión ya expandida, o None si es muy grande
+        inlined = self.stats.get("inlined", 0)
+        ast = super().run(ast)
+        if self.stats.get("inlined", 0) != inlined:
+            # Lo que quedó constante al sustituir los argumentos se vuelve a plegar
+            ast = ConstantFolder(self.optimizer).run(ast)
+        return ast
+
+    def inlineable_functions(self, ast):
+        """Nombre -> (parámetros, tipos, expresión) de las funciones que se pueden expandir."""
+        counts = self.optimizer.symbol_counts()
+        candidates = {}
+        for node in ast:
+            if node.type != "FUNCTION":
+                continue
+            name = node.children[1].value
+            signature = self.optimizer.signatures.get(name)
+            if signature is None or signature['return_type'] == "void" or counts.get(name) != 1:
+                continue
+            params = [param.children[0].value for param in node.children[2]]
+            expr = return_expression(node.children[3])
+            if expr is None or node_count(expr) > INLINE_BUDGET:
+                continue
+            # La expresión se copia a otro ámbito: cualquier otro nombre que
+            # lea debe ser único en el programa para significar lo mismo allí.
+            reads = {item.value for item in walk(expr) if item.type == "IDENT"}
+            if any(counts.get(read) != 1 for read in reads.difference(params)):
+                continue
+            candidates[name] = (params, signature['param_types'], expr, reads)
+
+        # Grafo de llamadas entre candidatas: las que se alcanzan a sí
+        # mismas (recursión directa o mutua) no se expanden.
+        recursive = set()
+        for name in candidates:
+            pending, seen = [name], set()
+            while pending:
+                for callee in candidates[pending.pop()][3]:
+                    if callee == name:
+                        recursive.add(name)
+                    elif callee in candidates and callee not in seen:
+                        seen.add(callee)
+                        pending.append(callee)
+        return {name: spec[:3] for name, spec in candidates.items() if name not in recursive}
+
+    def visit_FUNC_CALL(self, node):
+        children = [node.children[0]]
+        for arg in node.children[1:]:
+            children.append((yield self._visit(arg)))
+        name = node.children[0].value
+        spec = self.inlineable.get(name)
+        if spec is None or len(children) - 1 != len(spec[0]):
+            return with_children(node, children)
+
+        params, types, expr = spec
+        if name not in self.templates:
+            # Sin recursión entre candidatas, esto termina
+            template = yield self._visit(expr)
+            self.templates[name] = template if node_count(template) <= INLINE_BUDGET else None
+        template = self.templates[name]
+        if template is None:
+            return with_children(node, children)
+        expansion = Expansion(self.optimizer, params, types, children[1:], node.lineno)
+        body = yield expansion.copy(template)
+        if not expansion.complete():
+            return with_children(node, children)
+        self.count("inlined")
+        return body
+
+    def visit_NOT(self, node):
+        # !enRango(...) expandido da !!(condición): se quita la doble negación
+        operand = yield self._visit(node.children[0])
+        if operand.type == "NOT" and always_bool(operand.children[0]):
+            self.count("folded")
+            return operand.children[0]
+        return with_children(node, [operand])
+
+
+class StatementRewriter(Rewriter):
+    """
+    Rewriter que sólo recorre sentencias: las expresiones no contienen
+    bloques, así que se devuelven tal cual sin visitarlas.
+    """
+    def generic_visit(self, node):
+        for child in node.children:
+            if child.__class__ is list:
+                return self.visit_children(node)
+        return node
+
+    def visit_children(self, node):
+        children = []
+        for child in node.children:
+            if child.__class__ is list:
+                child = yield self.visit_block(child)
+            children.append(child)
+        return with_children(node, children)
+
+    def remove(self, tree):
+        """Cuenta los nodos de 'tree' como eliminados y devuelve None."""
+        self.count("removed", node_count(tree))
+        return None
+
+
+def terminates(stmt):
+    """True si la sentencia siempre termina la función (return en todo camino)."""
+    stack = [stmt]
+    while stack:
+        stmt = stack.pop()
+        kind = stmt.type
+        if kind == "IF_ELSE":
+            then_block, else_block = stmt.children[1], stmt.children[2]
+            if not (then_block and else_block):
+                return False
+            stack.append(then_block[-1])
+            stack.append(else_block[-1])
+        elif kind not in ("RETURN_VALUE", "RETURN_EMPTY"):
+            return False
+    return True
+
+
+class UnreachableCode(StatementRewriter):
+    """
+    Quita las ramas cuya condición (ya plegada) es constante y las
+    sentencias que siguen a un return en el mismo bloque, incluidas las que
+    siguen a un if/else que retorna por ambas ramas.
+    """
+    def visit_block(self, nodes):
+        block = []
+        for index, item in enumerate(nodes):
+            new = yield self._visit(item)
+            if new.__class__ is list:
+                block.extend(new)
+            elif new is not None:
+                block.append(new)
+            if block and block[-1].__class__ is Node and terminates(block[-1]):
+                if index + 1 < len(nodes):
+                    self.remove(nodes[index + 1:])
+                break
+        if len(block) == len(nodes) and all(new is old for new, old in zip(block, nodes)):
+            return nodes
+        return block
+
+    def visit_IF(self, node):
+        condition, body = node.children
+        value = constant_value(condition)
+        if value is NOT_CONSTANT:
+            body = yield self.visit_block(body)
+            return with_children(node, [condition, body])
+        if not value:
+            return self.remove(node)
+        # if (true) { ... } -> el bloque en su lugar (Python no tiene
+        # ámbitos de bloque, así que el código generado es equivalente)
+        self.count("removed", node_count(condition) + 1)
+        return (yield self.visit_block(body))
+
+    def visit_IF_ELSE(self, node):
+        condition, then_block, else_block = node.children
+        value = constant_value(condition)
+        if value is NOT_CONSTANT:
+            then_block = yield self.visit_block(then_block)
+            else_block = yield self.visit_block(else_block)
+            return with_children(node, [condition, then_block, else_block])
+        kept, dropped = (then_block, else_block) if value else (else_block, then_block)
+        self.count("removed", node_count(condition) + node_count(dropped) + 1)
+        return (yield self.visit_block(kept))
+
+    def visit_WHILE(self, node):
+        condition, body = node.children
+        value = constant_value(condition)
+        if value is not NOT_CONSTANT and not value:
+            return self.remove(node)
+        body = yield self.visit_block(body)
+        return with_children(node, [condition, body])
+
+
+class UnusedFunctions(StatementRewriter):
+    """
+    Quita las funciones que no se alcanzan desde el código de nivel
+    superior siguiendo el grafo de llamadas (cualquier mención del nombre
+    cuenta como uso).
+    """
+    def run(self, ast):
+        self.reachable = self.reachable_functions(ast)
+        return super().run(ast)
+
+    @staticmethod
+    def references(tree, functions):
+        """
+        Nombres que lee 'tree' fuera de las funciones que contiene; esas
+        funciones se registran en 'functions' (nombre -> nodos FUNCTION).
+        """
+        names = set()
+        stack = [tree]
+        while stack:
+            item = stack.pop()
+            if item is None:
+                continue
+            if item.__class__ is list:
+                stack.extend(item)
+                continue
+            if item.type == "FUNCTION":
+                functions.setdefault(item.children[1].value, []).append(item)
+                continue
+            if item.type == "IDENT":
+                names.add(item.value)
+            stack.extend(item.children)
+        return names
+
+    def reachable_functions(self, ast):
+        functions = {}
+        pending = list(self.references(ast, functions))
+        reachable = set()
+        while pending:
+            name = pending.pop()
+            if name in reachable:
+                continue
+            reachable.add(name)
+            for function in functions.get(name, ()):
+                pending.extend(self.references(function.children[3], functions))
+        return reachable
+
+    def visit_FUNCTION(self, node):
+        if node.children[1].value not in self.reachable:
+            return self.remove(node)
+        return self.generic_visit(node)
+
+
+# Propiedades de una expresión que calcula Purity.flags (bits)
+PURE = 1        # evaluarla no tiene efectos (puede lanzar una excepción)
+SAFE = 2        # no tiene efectos y nunca lanza una excepción
+SAFE_INT = 4    # además siempre da un int (ver loop_analysis.int_exact_names)
+CONCAT = 8      # concatenación segura de literales y str(...)
+
+# Sentencias que impiden que una función sea pura
+IMPURE_TYPES = frozenset(("PRINT", "INPUT", "LIST_APPEND", "LIST_REMOVE", "FUNCTION"))
+
+
+class Purity:
+    """
+    Qué efectos tiene evaluar cada expresión de un programa, para las
+    pasadas que mueven o eliminan código. Una función de Wax es pura si no
+    imprime, no lee la entrada, no modifica listas (append/remove), sólo
+    asigna sus propias variables y sólo llama a str() y a otras funciones
+    puras: su resultado depende sólo de los argumentos y de las globales
+    que lee. Todo se calcula la primera vez que se pide.
+    """
+    def __init__(self, ast, optimizer):
+        self.ast = ast
+        self.optimizer = optimizer
+        self._exact = None
+        self._functions = None
+        self._flags = {}        # nodo -> bits
+
+    def exact_names(self):
+        """Variables que siempre guardan un int."""
+        if self._exact is None:
+            self._exact = int_exact_names(self.ast)
+        return self._exact
+
+    def functions(self):
+        """Nombre -> (tipo de retorno, nombres que lee de fuera) de las funciones puras."""
+        if self._functions is None:
+            self._functions = self.pure_functions()
+        return self._functions
+
+    def pure_functions(self):
+        counts = self.optimizer.symbol_counts()
+        found = {}      # nombre -> (tipo de retorno, lecturas, llamadas)
+        for node in statements(self.ast):
+            if node.type != "FUNCTION" or counts.get(node.children[1].value) != 1:
+                continue
+            local = {param.children[0].value for param in node.children[2]}
+            local.update(item.children[1].value for item in statements(node.children[3])
+                         if item.type in ("DECLARATION", "FOR"))
+            reads, calls = set(), set()
+            for item in walk(node.children[3]):
+                kind = item.type
+                if kind in IMPURE_TYPES:
+                    break
+                if kind in REASSIGN_TYPES and item.children[0].value not in local:
+                    break
+                if kind == "ASSIGN_MULTI" and any(ident.value not in local for ident in item.children[0]):
+                    break
+                if kind == "IDENT":
+                    reads.add(item.value)
+                elif kind == "FUNC_CALL" and item.children[0].value != "str":
+                    calls.add(item.children[0].value)
+            else:
+                found[node.children[1].value] = (node.children[0].value, reads - local, calls)
+
+        # Sólo son puras si todas las funciones a las que llaman lo son;
+        # sus lecturas incluyen las de esas funciones.
+        changed = True
+        while changed:
+            changed = False
+            for name, (return_type, reads, calls) in list(found.items()):
+                if not calls <= found.keys():
+                    del found[name]
+                    changed = True
+                    continue
+                for callee in calls:
+                    if not found[callee][1] <= reads:
+                        reads |= found[callee][1]
+                        changed = True
+        return {name: (return_type, reads) for name, (return_type, reads, _) in found.items()}
+
+    def flags(self, expr):
+        """Bits PURE, SAFE, SAFE_INT y CONCAT de 'expr' (de abajo hacia arriba, sin recursión)."""
+        known = self._flags
+        stack = [expr]
+        while stack:
+            node = stack[-1]
+            if node in known:
+                stack.pop()
+                continue
+            pending = [child for child in node.children if child.__class__ is not list
+                       and child not in known]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            known[node] = self.node_flags(node)
+        return known[expr]
+
+    def node_flags(self, node):
+        kind = node.type
+        if kind == "NUMBER":
+            return PURE | SAFE | (SAFE_INT if node.value.__class__ is int else 0)
+        if kind == "STRING":
+            return PURE | SAFE | CONCAT
+        if kind == "BOOL":
+            return PURE | SAFE
+        if kind == "IDENT":
+            return PURE | SAFE | (SAFE_INT if node.value in self.exact_names() else 0)
+        known = self._flags
+        if kind == "FUNC_CALL":
+            args = PURE | SAFE
+            for arg in node.children[1:]:
+                args &= known[arg]
+            name = node.children[0].value
+            if name == "str" and len(node.children) == 2:
+                return args | (CONCAT if args & SAFE else 0)
+            # Una llamada puede no terminar o lanzar: nunca es SAFE
+            return args & PURE if name in self.functions() else 0
+        both = PURE | SAFE | SAFE_INT | CONCAT
+        for child in node.children:
+            if child.__class__ is not list:
+                both &= known[child]
+        if kind in ("LIST", "NOT", "LOGIC"):
+            return both & (PURE | SAFE)
+        if kind == "LIST_ACCESS":
+            return both & PURE
+        if kind == "UNARY_MINUS":
+            return both & PURE | (SAFE | SAFE_INT if both & SAFE_INT else 0)
+        if kind == "BINOP":
+            op = node.value
+            flags = both & PURE
+            if op in ("==", "!="):
+                flags |= both & SAFE
+            elif (op in SAFE_INT_OPS or op in SAFE_COMPARISONS) and both & SAFE_INT:
+                flags |= SAFE | (SAFE_INT if op in SAFE_INT_OPS else 0)
+            elif op == "%" and both & SAFE_INT and node.children[1].type == "NUMBER" and node.children[1].value:
+                # Resto entre un entero y una constante distinta de cero
+                flags |= SAFE | SAFE_INT
+            if op == "+" and both & CONCAT:
+                flags |= SAFE | CONCAT
+            return flags
+        return 0
+
+    def safe(self, expr):
+        """True si evaluar 'expr' no tiene efectos y nunca lanza una excepción."""
+        return bool(self.flags(expr) & SAFE)
+
+
+# Expresiones que vale la pena guardar en una temporal (las hojas ya son
+# una lectura de variable o un literal)
+HOIST_TYPES = frozenset(("BINOP", "LOGIC", "NOT", "UNARY_MINUS", "FUNC_CALL", "LIST_ACCESS"))
+
+
+def counted_loop(node):
+    """
+    True si el FOR tiene la forma que loop_analysis.range_spec traduce a
+    range() (i < límite con paso constante), aunque luego no se traduzca.
+    """
+    _, ident, _, condition, increment, _ = node.children
+    if for_step(increment) is None or condition.type != "BINOP" or condition.value not in BOUNDS:
+        return False
+    return any(side.type == "IDENT" and side.value == ident.value for side in condition.children)
+
+
+class LoopInvariants(StatementRewriter):
+    """
+    Saca de los WHILE y FOR las expresiones que dan lo mismo en todas las
+    iteraciones y las calcula una vez antes del ciclo:
+        while (k < limite * 2) { ... }  ->  _wax_a0 = limite * 2
+                                            while k < _wax_a0: ...
+    Una expresión es invariante si las variables que lee (y las globales
+    que leen las funciones puras a las que llama) no se asignan en el
+    ciclo, y las listas que lee no se modifican en él (ni pueden hacerlo
+    las funciones no puras que llame). Las que no tienen efectos ni lanzan
+    excepciones se sacan de cualquier parte del ciclo; las que pueden
+    lanzar (llamadas, índices, divisiones) sólo de la condición, si se
+    evalúan siempre (no a la derecha de && o ||) y antes de ellas la
+    condición no hace nada que pueda lanzar: así se evalúan igual que en
+    la primera comprobación del ciclo.
+    """
+    def run(self, ast):
+        self.purity = self.optimizer.purity(ast)
+        self.created = set()    # asignaciones a temporales que creó esta pasada
+        declared = {}
+        for entry in self.optimizer.symbol_log:
+            declared.setdefault(entry['name'], set()).add(entry['type_info'])
+        # Sólo los escalares no cambian por llamar a una función
+        self.scalars = {name for name, types in declared.items() if types <= SCALAR_TYPES}
+        return super().run(ast)
+
+    def visit_WHILE(self, node):
+        condition, body = node.children
+        body = yield self.visit_block(body)
+        self.enter_loop([condition, body], set())
+        condition = yield self.hoist_expr(condition, True)
+        body = yield self.hoist_tree(body)
+        return self.leave_loop(node, [condition, body])
+
+    def visit_FOR(self, node):
+        var_type, ident, init, condition, increment, body = node.children
+        body = yield self.visit_block(body)
+        self.enter_loop([condition, increment, body], {ident.value})
+        # Un for con forma de contador se traduce a range(), que ya evalúa
+        # el límite una sola vez. Si no, la condición se evalúa después de
+        # la inicialización.
+        if not counted_loop(node):
+            condition = yield self.hoist_expr(condition, self.purity.safe(init))
+        increment = yield self.hoist_tree(increment)
+        body = yield self.hoist_tree(body)
+        return self.leave_loop(node, [var_type, ident, init, condition, increment, body])
+
+    def enter_loop(self, parts, written):
+        """Prepara el análisis de un ciclo: qué nombres cambian en él."""
+        opaque = False      # modifica listas o llama a alguna función no pura
+        pure = self.purity.functions()
+        for node in walk(parts):
+            kind = node.type
+            if kind in ("LIST_APPEND", "LIST_REMOVE"):
+                # Otra variable puede apuntar a la misma lista
+                opaque = True
+            elif kind == "BIND":
+                written.add(node.children[0].value)
+            elif kind == "FUNC_CALL" and node.children[0].value not in pure:
+                opaque = opaque or node.children[0].value != "str"
+        written |= written_names(parts)
+        self.written = written
+        self.opaque = opaque
+        self.hoisted = []
+        self.prefix_safe = True
+
+    def leave_loop(self, node, children):
+        node = with_children(node, children)
+        if not self.hoisted:
+            return node
+        return self.hoisted + [node]
+
+    def invariant_name(self, name):
+        return name not in self.written and (name in self.scalars or not self.opaque)
+
+    def hoist_tree(self, item):
+        """Saca las expresiones invariantes sin efectos ni excepciones de un bloque o sentencia."""
+        if item.__class__ is list:
+            block = []
+            for stmt in item:
+                if stmt in self.created:
+                    # Temporal de un ciclo interno: si su valor tampoco cambia
+                    # aquí y no puede lanzar, sale entera a este ciclo
+                    target, value = stmt.children
+                    value, invariant, _ = yield self.hoist_node(value, False, False)
+                    if invariant and self.purity.safe(value):
+                        self.hoisted.append(stmt)
+                        continue
+                    stmt = with_children(stmt, [target, value])
+                    self.created.add(stmt)
+                else:
+                    stmt = yield self.hoist_tree(stmt)
+                block.append(stmt)
+            if len(block) == len(item) and all(new is old for new, old in zip(block, item)):
+                return item
+            return block
+        if item.type == "FUNCTION":
+            return item
+        children = []
+        for child in item.children:
+            if child.__class__ is list or child.type in ("FOR_INCREMENT", "FOR_INCREMENT_EXPR"):
+                child = yield self.hoist_tree(child)
+            elif child.type not in ("Identifier", "Type"):
+                child = yield self.hoist_expr(child, False)
+            children.append(child)
+        return with_children(item, children)
+
+    def hoist_expr(self, expr, in_condition):
+        """
+        Reemplaza las mayores subexpresiones invariantes de 'expr' por
+        temporales. 'in_condition' indica que 'expr' es la condición del
+        ciclo y puede sacar también expresiones que lancen excepciones.
+        """
+        replaced, invariant, _ = yield self.hoist_node(expr, in_condition, False)
+        if invariant:
+            replaced = self.hoist(replaced, in_condition)
+        return replaced
+
+    def hoist_node(self, node, in_condition, conditional):
+        """(nodo nuevo, es invariante, se puede sacar aunque lance)."""
+        movable = in_condition and not conditional and self.prefix_safe
+        kind = node.type
+        if not node.children:
+            if kind == "IDENT":
+                return node, self.invariant_name(node.value), movable
+            return node, kind != "INPUT", movable
+
+        # Las llamadas: el nombre de la función no es una lectura de variable
+        start = 1 if kind == "FUNC_CALL" else 0
+        if start:
+            function = self.purity.functions().get(node.children[0].value)
+            invariant = node.children[0].value == "str" or (
+                function is not None and all(self.invariant_name(read) for read in function[1]))
+        else:
+            invariant = kind not in ("BIND", "INPUT")
+        results = []
+        for index, child in enumerate(node.children[start:], start):
+            result = yield self.hoist_node(child, in_condition,
+                                           conditional or (kind == "LOGIC" and index == 1))
+            results.append(result)
+            invariant = invariant and result[1]
+
+        children = node.children[:start]
+        for child, child_invariant, child_movable in results:
+            if child_invariant and not invariant:
+                child = self.hoist(child, child_movable)
+            children.append(child)
+        node = with_children(node, children)
+        if in_condition and self.prefix_safe and not self.purity.safe(node):
+            self.prefix_safe = False
+        return node, invariant, movable
+
+    def hoist(self, expr, movable):
+        """Guarda 'expr' en una temporal antes del ciclo si vale la pena y es correcto."""
+        if expr.type not in HOIST_TYPES or (expr.type == "UNARY_MINUS" and expr.children[0].type == "NUMBER"):
+            return expr
+        flags = self.purity.flags(expr)
+        if not flags & PURE or not (flags & SAFE or movable):
+            return expr
+        if expr.type == "FUNC_CALL":
+            # Una lista nueva en cada llamada no se puede compartir entre iteraciones
+            function = self.purity.functions().get(expr.children[0].value)
+            if function is not None and function[0] == "list":
+                return expr
+        temp = self.optimizer.new_temp()
+        target = Node("Identifier", value=temp, lineno=expr.lineno)
+        self.count("hoisted")
+        assign = Node("ASSIGN", [target, expr], lineno=expr.lineno)
+        self.created.add(assign)
+        self.hoisted.append(assign)
+        return Node("IDENT", value=temp, lineno=expr.lineno)
+
+
+# Nodos que pueden formar una subexpresión común: su valor sólo depende
+# de las variables que leen (y del contenido de las listas, en LIST_ACCESS)
+CSE_TYPES = frozenset(("IDENT", "NUMBER", "STRING", "BOOL", "BINOP", "UNARY_MINUS", "LIST_ACCESS"))
+
+# Las que vale la pena guardar para reutilizarlas
+CSE_ROOTS = frozenset(("BINOP", "LIST_ACCESS"))
+
+# Tamaño máximo (en nodos) de una subexpresión que se recuerda
+CSE_MAX_NODES = 32
+
+# Sentencias que CommonSubexpressions analiza; las que no contienen nada
+# que reescribir se conservan sin recorrerlas
+CSE_STATEMENTS = frozenset(("DECLARATION", "ASSIGN", "ASSIGN_COMPOUND", "INCREMENT",
+                            "ASSIGN_MULTI", "LIST_APPEND", "LIST_REMOVE", "PRINT",
+                            "EXPR_STATEMENT", "RETURN_VALUE", "IF", "IF_ELSE",
+                            "WHILE", "FOR", "FUNCTION"))
+
+
+class Available:
+    """Valor de una subexpresión ya calculado en el bloque básico actual."""
+    def __init__(self, key, reads, lists):
+        self.key = key
+        self.reads = reads      # variables que lee
+        self.lists = lists      # lee una posición de una lista
+        self.name = None        # variable que lo guarda
+        self.temp = True        # False si 'name' es la variable de una asignación
+        self.stmt = None        # sentencia de la definición
+        self.outer = ()         # sentencias que la contienen
+
+
+class BlockValues:
+    """Subexpresiones disponibles en un bloque básico, con sus invalidaciones."""
+    def __init__(self):
+        self.available = {}     # clave -> Available
+        self.by_name = {}       # variable -> claves que dependen de ella
+        self.lists = set()      # claves que leen listas
+
+    def add(self, entry, names):
+        self.available[entry.key] = entry
+        for name in names:
+            self.by_name.setdefault(name, set()).add(entry.key)
+        if entry.lists:
+            self.lists.add(entry.key)
+
+    def invalidate(self, name):
+        for key in self.by_name.pop(name, ()):
+            self.available.pop(key, None)
+
+    def invalidate_lists(self):
+        for key in self.lists:
+            self.available.pop(key, None)
+        self.lists.clear()
+
+
+class CommonSubexpressions(Rewriter):
+    """
+    Reutiliza dentro de un bloque básico (sentencias seguidas sin if ni
+    ciclos de por medio) los valores de 'lista[i]' y de las operaciones
+    que se repiten: la primera aparición se guarda en una temporal
+    (nodo BIND) y las siguientes la leen.
+        total += v[i] * v[i];  ->  total += (_wax_a0 := v[i]) * _wax_a0
+    Si el valor es todo lo que se asigna a una variable, las siguientes
+    apariciones leen esa variable. Un valor deja de estar disponible cuando
+    se asigna (=, op=, ++, --) una variable que lee; los de listas, además,
+    con cualquier append/remove (otra variable puede ser la misma lista) o
+    llamada a una función no pura. Las apariciones a la derecha de && y ||
+    pueden reutilizar un valor, pero no definirlo. Las condiciones e
+    incrementos de los for no se tocan: su forma decide la traducción a
+    range().
+    """
+    def run(self, ast):
+        self.purity = self.optimizer.purity(ast)
+        self.interned = {}      # forma de una subexpresión -> clave
+        self.defs = {}          # nodo -> Available que define
+        self.uses = {}          # nodo -> Available que reutiliza
+        self.touched = set()    # sentencias que contienen un nodo a reescribir
+        self.analyze(ast)
+        if not self.uses:
+            return ast
+        for entry in self.uses.values():
+            if entry.name is None:
+                entry.name = self.optimizer.new_temp()
+                self.touched.add(entry.stmt)
+                self.touched.update(entry.outer)
+        self.count("reused", len(self.uses))
+        return super().run(ast)
+
+    # --- ANÁLISIS ---
+
+    def analyze(self, ast):
+        blocks = [(ast, ())]    # bloque, sentencias que lo contienen
+        while blocks:
+            block, outer = blocks.pop()
+            values = BlockValues()
+            for stmt in block:
+                if stmt is None:
+                    continue
+                kind = stmt.type
+                self.outer, self.stmt = outer, stmt
+                if kind in ("DECLARATION", "ASSIGN"):
+                    target, value = stmt.children[-2:]
+                    self.scan(value, values)
+                    values.invalidate(target.value)
+                    entry = self.defs.get(value)
+                    if entry is not None and target.value not in entry.reads and entry.key in values.available:
+                        # Las siguientes apariciones leen la variable asignada
+                        entry.name, entry.temp = target.value, False
+                        values.add(entry, (target.value,))
+                elif kind == "ASSIGN_COMPOUND":
+                    self.scan(stmt.children[1], values)
+                    values.invalidate(stmt.children[0].value)
+                elif kind == "INCREMENT":
+                    values.invalidate(stmt.children[0].value)
+                elif kind == "ASSIGN_MULTI":
+                    for value in stmt.children[1]:
+                        self.scan(value, values)
+                    for ident in stmt.children[0]:
+                        values.invalidate(ident.value)
+                elif kind in ("LIST_APPEND", "LIST_REMOVE"):
+                    self.scan(stmt.children[1], values)
+                    values.invalidate_lists()
+                elif kind in ("PRINT", "EXPR_STATEMENT", "RETURN_VALUE"):
+                    self.scan(stmt.children[0], values)
+                elif kind in ("IF", "IF_ELSE"):
+                    # La condición todavía es parte del bloque; las ramas no
+                    self.scan(stmt.children[0], values)
+                    blocks.extend((branch, outer + (stmt,)) for branch in stmt.children[1:])
+                    values = BlockValues()
+                elif kind == "WHILE":
+                    # La condición se vuelve a evaluar después del cuerpo
+                    self.scan(stmt.children[0], BlockValues())
+                    blocks.append((stmt.children[1], outer + (stmt,)))
+                    values = BlockValues()
+                elif kind in ("FOR", "FUNCTION"):
+                    blocks.append((stmt.children[-1], outer + (stmt,)))
+                    values = BlockValues()
+                else:
+                    values = BlockValues()
+
+    def scan(self, expr, values):
+        """
+        Recorre 'expr' en orden de evaluación. Al terminar cada nodo calcula
+        su clave (la forma de la subexpresión, con las claves de sus hijos);
+        si ese valor ya estaba disponible el nodo lo reutiliza y se
+        descartan las definiciones hechas dentro de él, que desaparecen.
+        """
+        if not expr.children:
+            return
+        infos = {}      # nodo -> (clave, tamaño, lecturas, lee listas)
+        interned = self.interned
+        log = []        # definiciones y reutilizaciones, para deshacerlas
+        stack = [(expr, False, None)]
+        while stack:
+            node, conditional, mark = stack.pop()
+            kind = node.type
+            if mark is None:
+                children = node.children
+                if children:
+                    stack.append((node, conditional, len(log)))
+                    last = len(children) - 1
+                    for index in range(last, -1, -1):
+                        child = children[index]
+                        if child.__class__ is not list:
+                            stack.append((child, conditional or (kind == "LOGIC" and index == 1), None))
+                    continue
+            elif kind == "FUNC_CALL":
+                name = node.children[0].value
+                if values.lists and name != "str" and name not in self.purity.functions():
+                    values.invalidate_lists()
+                continue
+            elif kind == "BIND":
+                values.invalidate(node.children[0].value)
+                continue
+            if kind not in CSE_TYPES:
+                continue
+            # Nodo terminado: su clave sale de las de sus hijos
+            size, keys, lists = 1, [], kind == "LIST_ACCESS"
+            reads = (node.value,) if kind == "IDENT" else ()
+            for child in node.children:
+                info = infos.get(child)
+                if info is None:
+                    break
+                keys.append(info[0])
+                size += info[1]
+                reads = info[2].union(reads) if reads else info[2]
+                lists = lists or info[3]
+            else:
+                if size > CSE_MAX_NODES:
+                    continue
+                value = node.value
+                if value.__class__ is float:
+                    value = repr(value)     # 0.0 y -0.0 son iguales como clave
+                key = interned.setdefault((kind, node.value.__class__, value, tuple(keys)), len(interned))
+                reads = frozenset(reads)
+                infos[node] = (key, size, reads, lists)
+                if kind not in CSE_ROOTS:
+                    continue
+                entry = values.available.get(key)
+                if entry is not None:
+                    self.undo(log, mark, values)
+                    self.uses[node] = entry
+                    log.append((node, None))
+                    self.touched.add(self.stmt)
+                    self.touched.update(self.outer)
+                elif not conditional:
+                    entry = self.defs[node] = Available(key, reads, lists)
+                    entry.stmt, entry.outer = self.stmt, self.outer
+                    values.add(entry, reads)
+                    log.append((node, entry))
+
+    def undo(self, log, mark, values):
+        """Descarta lo registrado dentro de un nodo que se reemplaza por una lectura."""
+        for node, entry in log[mark:]:
+            if entry is None:
+                del self.uses[node]
+            else:
+                del self.defs[node]
+                if values.available.get(entry.key) is entry:
+                    del values.available[entry.key]
+        del log[mark:]
+
+    # --- REESCRITURA ---
+
+    def generic_visit(self, node):
+        if node.type in CSE_STATEMENTS and node not in self.touched:
+            return node
+        return super().generic_visit(node)
+
+    def visit_candidate(self, node):
+        entry = self.uses.get(node)
+        if entry is not None:
+            return Node("IDENT", value=entry.name, lineno=node.lineno)
+        return self.rewrite_candidate(node)
+
+    def rewrite_candidate(self, node):
+        new = yield self.visit_children(node)
+        entry = self.defs.get(node)
+        if entry is not None and entry.temp and entry.name is not None:
+            target = Node("Identifier", value=entry.name, lineno=node.lineno)
+            return Node("BIND", [target, new], lineno=node.lineno)
+        return new
+
+    visit_BINOP = visit_LIST_ACCESS = visit_candidate
+
+
+class DeadStores(StatementRewriter):
+    """
+    Quita las asignaciones a variables cuyo valor nunca se lee. Una
+    variable está viva si se lee fuera de una asignación eliminable o en la
+    asignación de otra variable viva. Sólo se eliminan asignaciones cuyo
+    valor no tiene efectos ni puede lanzar una excepción en Python (sin
+    llamadas, input(), índices, divisiones, y aritmética sólo sobre
+    variables que siempre guardan un int; ver loop_analysis.int_exact_names).
+    """
+    def run(self, ast):
+        self.purity = self.optimizer.purity(ast)
+        self.removable = {}     # sentencia -> True si se puede eliminar
+        self.live = self.live_names(ast)
+        return super().run(ast)
+
+    def store_removable(self, stmt):
+        kind = stmt.type
+        if kind == "INCREMENT":
+            return True
+        value = stmt.children[STORE_TYPES[kind][1]]
+        if kind == "ASSIGN_COMPOUND":
+            return (stmt.value[:-1] in SAFE_INT_OPS     # '+=' -> '+'
+                    and stmt.children[0].value in self.purity.exact_names()
+                    and self.purity.flags(value) & SAFE_INT)
+        return self.purity.safe(value)
+
+    def live_names(self, ast):
+        roots = set()
+        depends = {}    # variable -> nombres que leen sus asignaciones eliminables
+        stack = [ast]
+        while stack:
+            item = stack.pop()
+            if item is None:
+                continue
+            if item.__class__ is list:
+                stack.extend(item)
+                continue
+            kind = item.type
+            if kind in STORE_TYPES:
+                removable = self.removable[item] = self.store_removable(item)
+                target_index, value_index = STORE_TYPES[kind]
+                target = item.children[target_index].value
+                reads = set()
+                if value_index is not None:
+                    reads = {node.value for node in walk(item.children[value_index])
+                             if node.type == "IDENT"}
+                if removable:
+                    depends.setdefault(target, set()).update(reads)
+                else:
+                    # Se conserva: lo que lee (y la propia variable en x += ...) sigue vivo
+                    roots |= reads
+                    if kind == "ASSIGN_COMPOUND":
+                        roots.add(target)
+                continue
+            if kind == "IDENT":
+                roots.add(item.value)
+            stack.extend(item.children)
+
+        live = set()
+        pending = list(roots)
+        while pending:
+            name = pending.pop()
+            if name not in live:
+                live.add(name)
+                pending.extend(depends.get(name, ()))
+        return live
+
+    def visit_store(self, node):
+        target = node.children[STORE_TYPES[node.type][0]].value
+        if target in self.live or not self.removable.get(node):
+            return node
+        return self.remove(node)
+
+    visit_DECLARATION = visit_ASSIGN = visit_store
+    visit_ASSIGN_COMPOUND = visit_INCREMENT = visit_store
+
+
+class Optimizer:
+    """
+    Ejecuta las pasadas de optimización en orden. 'stats' acumula lo que
+    hizo cada pasada: 'folded' y 'propagated' (constantes), 'inlined'
+    (llamadas expandidas), 'hoisted' (expresiones sacadas de ciclos),
+    'reused' (subexpresiones comunes reutilizadas) y 'removed' (nodos
+    eliminados como código muerto).
+    'signatures' son las firmas de las funciones de nivel superior que
+    registra el analizador semántico en su primer paso.
+    """
+    # Pasadas en el orden en que se aplican; las que eliminan código van
+    # al final para ver las condiciones ya constantes y las funciones que
+    # ya no se llaman después de expandirlas. Los ciclos se revisan cuando
+    # ya no queda código inalcanzable, y DeadStores quita después las
+    # temporales que nadie lee. Las subexpresiones comunes se buscan al
+    # final, con las invariantes ya fuera y sin asignaciones muertas.
+    passes = (ConstantFolder, FunctionInliner, UnreachableCode, UnusedFunctions,
+              LoopInvariants, DeadStores, CommonSubexpressions)
+
+    def __init__(self, symbol_log, signatures=None):
+        self.symbol_log = symbol_log
+        self.signatures = signatures or {}
+        self.stats = {}
+        self.temp_count = 0
+        self._purity = None
+
+    def symbol_counts(self):
+        """Nombre -> cuántas veces se declara en todo el programa."""
+        counts = {}
+        for entry in self.symbol_log:
+            counts[entry['name']] = counts.get(entry['name'], 0) + 1
+        return counts
+
+    def purity(self, ast):
+        """Purity de 'ast', compartida por las pasadas mientras ninguna lo cambie."""
+        if self._purity is None or self._purity.ast is not ast:
+            self._purity = Purity(ast, self)
+        return self._purity
+
+    def new_temp(self):
+        """Nombre de una variable temporal única (no choca con las de los generadores)."""
+        name = f"_wax_a{self.temp_count}"
+        self.temp_count += 1
+        return name
+
+    def optimize(self, ast):
+        for optimization in self.passes:
+            ast = optimization(self).run(ast)
+        return ast
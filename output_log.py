@@ -0,0 +1,72 @@
+# output_log.py
+# Salida de un programa para la consola de la GUI. Antes cada print()
+# unía la lista completa de líneas y reemplazaba el texto del widget:
+# imprimir N líneas costaba O(N²) y un repintado por línea.
+#
+# OutputLog separa lo que se guarda de lo que se muestra:
+#   - todo lo escrito va a un archivo temporal (spool), así "Guardar
+#     salida" entrega la salida completa sin tenerla en memoria;
+#   - lo que falta mostrar se acumula en 'pending', un búfer circular de
+#     a lo sumo 'max_lines' líneas: si el programa imprime más entre dos
+#     refrescos, las más viejas se descartan, porque tampoco quedarían en
+#     la consola (que guarda las mismas 'max_lines' líneas).
+# La consola (gui.OutputConsole) llama a take_pending() unas 30 veces por
+# segundo y agrega ese texto al final del widget. No depende de Qt.
+
+import collections
+import shutil
+import tempfile
+
+DEFAULT_MAX_LINES = 20_000
+
+
+class OutputLog:
+    def __init__(self, max_lines=DEFAULT_MAX_LINES):
+        self.max_lines = max_lines
+        self.pending = collections.deque(maxlen=max_lines)
+        self._added = 0         # líneas agregadas a 'pending' desde el último take_pending()
+        self._spool = tempfile.TemporaryFile("w+", encoding="utf-8", newline="")
+
+    def write(self, text):
+        if not text:
+            return
+        self._spool.write(text)
+        lines = text.splitlines(True)
+        self._added += len(lines)
+        self.pending.extend(lines)
+
+    def take_pending(self):
+        """
+        Devuelve (texto, truncado): lo que falta mostrar y si se
+        descartaron líneas viejas (entonces el texto reemplaza todo lo
+        que muestra la consola en lugar de agregarse al final).
+        """
+        truncated = self._added > len(self.pending)
+        text = "".join(self.pending)
+        self.pending.clear()
+        self._added = 0
+        return text, truncated
+
+    def clear(self):
+        self.pending.clear()
+        self._added = 0
+        self._spool.seek(0)
+        self._spool.truncate()
+
+    def save(self, path):
+        """Escribe en 'path' todo lo que se escribió desde el último clear()."""
+        self._spool.flush()
+        self._spool.seek(0)
+        try:
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                shutil.copyfileobj(self._spool, f)
+        finally:
+            self._spool.seek(0, 2)
+
+    @property
+    def closed(self):
+        return self._spool.closed
+
+    def close(self):
+        """Borra el archivo temporal; después de close() no se puede escribir."""
+        self._spool.close()
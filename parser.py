@@ -3,14 +3,13 @@
 # Este archivo DEPENDE de 'lexer.py' para la lista de tokens.
 
 import ply.yacc as yacc
-from lexer import tokens,lexer
+from lexer import tokens,lexer,WAX_DEBUG
+from ast_nodes import make_node
 import sys
 
 # ==============================
 # SINTÁCTICO (AST)
 # ==============================
-def make_node(type, children=None, value=None, datatype=None, lineno=None):
-    return {"type": type, "children": children or [], "value": value, "datatype": datatype, "lineno": lineno}
 
 precedence = (
     ("left", "OR"),
@@ -29,10 +28,10 @@ def p_program(p):
                | statement
                | empty"""
     if len(p) == 3:
+        # Se agrega en el misma lista (O(1) amortizado) en vez de copiarla
         if p[2] is not None:
-            p[0] = p[1] + [p[2]]
-        else:
-            p[0] = p[1]
+            p[1].append(p[2])
+        p[0] = p[1]
     elif len(p) == 2 and p[1] is not None:
         p[0] = [p[1]]
     else:
@@ -234,7 +233,9 @@ def p_list_items(p):
     """list_items : list_items COMMA expression
                   | expression
                   | empty"""
-    if len(p) == 4: p[0] = p[1] + [p[3]]
+    if len(p) == 4:
+        p[1].append(p[3])
+        p[0] = p[1]
     elif len(p) == 2: p[0] = [] if p[1] is None else [p[1]]
 
 def p_expression_list_access(p):
@@ -263,19 +264,25 @@ def p_arglist(p):
     """arglist : arglist COMMA expression
                | expression
                | empty"""
-    if len(p) == 4: p[0] = p[1] + [p[3]]
+    if len(p) == 4:
+        p[1].append(p[3])
+        p[0] = p[1]
     elif len(p) == 2: p[0] = [] if p[1] is None else [p[1]]
 
 def p_expression_list_values(p):
     """expression_list : expression_list COMMA expression
                        | expression"""
-    if len(p) == 4: p[0] = p[1] + [p[3]]
+    if len(p) == 4:
+        p[1].append(p[3])
+        p[0] = p[1]
     else: p[0] = [p[1]]
 
 def p_ident_list(p):
     """ident_list : ident_list COMMA IDENT
                   | IDENT"""
-    if len(p) == 4: p[0] = p[1] + [make_node("IDENT", value=p[3], lineno=p.lineno(3))]
+    if len(p) == 4:
+        p[1].append(make_node("IDENT", value=p[3], lineno=p.lineno(3)))
+        p[0] = p[1]
     else: p[0] = [make_node("IDENT", value=p[1], lineno=p.lineno(1))]
 
 def p_paramlist(p):
@@ -284,7 +291,8 @@ def p_paramlist(p):
                  | empty"""
     if len(p) == 6:
         param_node = make_node("PARAM", [make_node("Identifier", value=p[3]), make_node("Type", value=p[5])])
-        p[0] = p[1] + [param_node]
+        p[1].append(param_node)
+        p[0] = p[1]
     elif len(p) == 4:
         param_node = make_node("PARAM", [make_node( "Identifier", value=p[1]), make_node("Type", value=p[3])])
         p[0] = [param_node]
@@ -296,31 +304,45 @@ def p_empty(p):
     p[0] = None
 
 # ---------- ERRORES ----------
-def p_error(p):
+def syntax_error_messages(p, symstack):
+    """
+    Construye los mensajes de un error sintáctico. 'symstack' es la pila
+    interna del parser que encontró el error (se usa para sugerir qué
+    bloque o expresión quedó sin cerrar al llegar al final de la entrada).
+    """
     if p:
         # Error estándar: un token inesperado
-        print(f"[Error Sintáctico] Token inesperado {p.type} ('{p.value}') en línea {p.lineno}",file=sys.stderr)
-    else:
-        # Error de "Fin inesperado de la entrada" (EOF)
-        print(f"[Error Sintáctico] Fin inesperado de la entrada.",file=sys.stderr)
-        
-        # Accedemos a la pila interna del parser
-        stack = parser.symstack
-        
-        # Buscamos de arriba hacia abajo (reversed) en la pila
-        # por el último token de apertura que no se cerró.
-        for sym in reversed(stack):
-            # 'sym' puede ser un No-Terminal (sin 'type') o un Token (con 'type')
-            if hasattr(sym, 'type'):
-                if sym.type == 'LBRACE': # '{'
-                    print(f"    > Sugerencia: Revisa si falta un '}}' (llave de cierre) para el bloque que comenzó en la línea {sym.lineno}.",file=sys.stderr)
-                    return
-                if sym.type == 'LPAREN': # '('
-                    print(f"    > Sugerencia: Revisa si falta un ')' (paréntesis de cierre) para la expresión que comenzó en la línea {sym.lineno}.",file=sys.stderr)
-                    return
-
-        # Si no encontramos un token específico, damos la sugerencia genérica
-        print(f"    > Sugerencia: Revisa si falta un '}}' o ';' en algún lugar.",file=sys.stderr)
+        return [f"[Error Sintáctico] Token inesperado {p.type} ('{p.value}') en línea {p.lineno}"]
+
+    # Error de "Fin inesperado de la entrada" (EOF)
+    messages = [f"[Error Sintáctico] Fin inesperado de la entrada."]
+
+    # Buscamos de arriba hacia abajo (reversed) en la pila
+    # por el último token de apertura que no se cerró.
+    for sym in reversed(symstack):
+        # 'sym' puede ser un No-Terminal (sin 'type') o un Token (con 'type')
+        if hasattr(sym, 'type'):
+            if sym.type == 'LBRACE': # '{'
+                messages.append(f"    > Sugerencia: Revisa si falta un '}}' (llave de cierre) para el bloque que comenzó en la línea {sym.lineno}.")
+                return messages
+            if sym.type == 'LPAREN': # '('
+                messages.append(f"    > Sugerencia: Revisa si falta un ')' (paréntesis de cierre) para la expresión que comenzó en la línea {sym.lineno}.")
+                return messages
+
+    # Si no encontramos un token específico, damos la sugerencia genérica
+    messages.append(f"    > Sugerencia: Revisa si falta un '}}' o ';' en algún lugar.")
+    return messages
+
+def p_error(p):
+    # Parser compartido del módulo: los errores se imprimen en stderr.
+    # (compiler.Compiler instala su propio manejador por instancia)
+    for message in syntax_error_messages(p, parser.symstack):
+        print(message, file=sys.stderr)
 
 # Construye el parser
-parser = yacc.yacc()
\ No newline at end of file
+# Las tablas LALR se leen de 'parsetab.py' (PLY las regenera si la firma de
+# la gramática cambió). 'parser.out' solo se escribe en modo depuración.
+if WAX_DEBUG:
+    parser = yacc.yacc(debug=True, tabmodule="parsetab")
+else:
+    parser = yacc.yacc(debug=False, tabmodule="parsetab", errorlog=yacc.NullLogger())
\ No newline at end of file
@@ -0,0 +1,110 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'leftORleftANDrightNOTrightUMINUSleftEQEQNOTEQLTLEGTGEleftPLUSMINUSleftSTARSLASHMODrightPOWAND APPEND BOOL COLON COMMA COMMENT_BLOCK COMMENT_LINE DOT DOUBLE ELSE EQEQ EQUAL FOR FUNCTION GE GT IDENT IF INPUT INT LBRACE LBRACKET LE LPAREN LT MINUS MINUSEQ MINUSMINUS MOD NOT NOTEQ OR PLUS PLUSEQ PLUSPLUS POW PRINT RBRACE RBRACKET REMOVE RETURN RPAREN SEMI SLASH SLASHEQ STAR STAREQ STR STRING VOID WAX WHILEprogram : program statement\n               | statement\n               | emptystatement : COMMENT_LINE\n                 | COMMENT_BLOCKstatement : WAX IDENT COLON IDENT EQUAL expression SEMIstatement : IDENT EQUAL expression SEMIstatement : IDENT PLUSEQ expression SEMI\n                 | IDENT MINUSEQ expression SEMI\n                 | IDENT STAREQ expression SEMI\n                 | IDENT SLASHEQ expression SEMIstatement : IDENT PLUSPLUS SEMI\n                 | IDENT MINUSMINUS SEMI\n                 | PLUSPLUS IDENT SEMI\n                 | MINUSMINUS IDENT SEMIstatement : ident_list EQUAL expression_list SEMIstatement : IDENT DOT APPEND LPAREN expression RPAREN SEMIstatement : IDENT DOT REMOVE LPAREN expression RPAREN SEMIstatement : IF LPAREN expression RPAREN LBRACE program RBRACE\n                 | IF LPAREN expression RPAREN LBRACE program RBRACE ELSE LBRACE program RBRACEstatement : FOR LPAREN WAX IDENT COLON IDENT EQUAL expression SEMI expression SEMI for_increment RPAREN LBRACE program RBRACEfor_increment : IDENT PLUSPLUS\n                     | IDENT MINUSMINUS\n                     | PLUSPLUS IDENT\n                     | MINUSMINUS IDENT\n                     | IDENT PLUSEQ expression\n                     | IDENT MINUSEQ expression\n                     | IDENT STAREQ expression\n                     | IDENT SLASHEQ expression\n                     | IDENT EQUAL expressionstatement : WHILE LPAREN expression RPAREN LBRACE program RBRACEstatement : PRINT LPAREN expression RPAREN SEMIreturn_type : IDENT\n                   | VOIDstatement : RETURN expression_list SEMIstatement : RETURN SEMIstatement : WAX FUNCTION IDENT COLON return_type LPAREN paramlist RPAREN LBRACE program RBRACEstatement : expression SEMIexpression : expression PLUS expression\n                  | expression MINUS expression\n                  | expression STAR expression\n                  | expression SLASH expression\n                  | expression MOD expression\n                  | expression POW expressionexpression : expression LT expression\n                  | expression LE expression\n                  | expression GT expression\n                  | expression GE expression\n                  | expression EQEQ expression\n                  | expression NOTEQ expressionexpression : expression AND expression\n                  | expression OR expressionexpression : LPAREN expression RPARENexpression : INT\n                  | DOUBLEexpression : STRINGexpression : BOOLexpression : NOT expressionexpression : MINUS expression %prec UMINUSexpression : IDENTexpression : LBRACKET list_items RBRACKETlist_items : list_items COMMA expression\n                  | expression\n                  | emptyexpression : IDENT LBRACKET expression RBRACKETexpression : IDENT LPAREN arglist RPARENexpression : STR LPAREN expression RPARENexpression : INPUT LPAREN RPAREN\n                  | INPUT LPAREN expression RPARENarglist : arglist COMMA expression\n               | expression\n               | emptyexpression_list : expression_list COMMA expression\n                       | expressionident_list : ident_list COMMA IDENT\n                  | IDENTparamlist : paramlist COMMA IDENT COLON IDENT\n                 | IDENT COLON IDENT\n                 | emptyempty :'
+    
+_lr_action_items = {'COMMENT_LINE':([0,1,2,3,4,5,27,40,66,82,83,104,105,113,122,123,124,125,126,132,148,150,151,156,158,159,163,164,165,167,174,176,178,180,182,184,205,206,207,],[4,4,-2,-3,-4,-5,-1,-38,-36,-12,-13,-14,-15,-35,-7,-8,-9,-10,-11,-16,4,4,-32,4,4,-6,-17,-18,-19,-31,4,4,4,4,-37,-20,4,4,-21,]),'COMMENT_BLOCK':([0,1,2,3,4,5,27,40,66,82,83,104,105,113,122,123,124,125,126,132,148,150,151,156,158,159,163,164,165,167,174,176,178,180,182,184,205,206,207,],[5,5,-2,-3,-4,-5,-1,-38,-36,-12,-13,-14,-15,-35,-7,-8,-9,-10,-11,-16,5,5,-32,5,5,-6,-17,-18,-19,-31,5,5,5,5,-37,-20,5,5,-21,]),'WAX':([0,1,2,3,4,5,27,40,62,66,82,83,104,105,113,122,123,124,125,126,132,148,150,151,156,158,159,163,164,165,167,174,176,178,180,182,184,205,206,207,],[6,6,-2,-3,-4,-5,-1,-38,110,-36,-12,-13,-14,-15,-35,-7,-8,-9,-10,-11,-16,6,6,-32,6,6,-6,-17,-18,-19,-31,6,6,6,6,-37,-20,6,6,-21,]),'IDENT':([0,1,2,3,4,5,6,9,10,12,17,18,23,24,27,29,30,31,32,33,34,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,57,58,61,63,64,66,73,74,75,82,83,104,105,110,113,114,116,121,122,123,124,125,126,127,128,130,132,141,148,149,150,151,153,156,158,159,163,164,165,166,167,168,170,174,176,177,178,179,180,182,184,185,188,189,192,193,194,195,196,205,206,207,],[7,7,-2,-3,-4,-5,28,55,56,60,60,60,60,60,-1,76,60,60,60,60,60,60,60,-38,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,107,60,60,60,-36,60,60,120,-12,-13,-14,-15,134,-35,60,60,142,-7,-8,-9,-10,-11,60,60,60,-16,60,7,157,7,-32,160,7,7,-6,-17,-18,-19,60,-31,173,175,7,7,60,7,183,7,-37,-20,186,198,199,60,60,60,60,60,7,7,-21,]),'PLUSPLUS':([0,1,2,3,4,5,7,27,40,66,82,83,104,105,113,122,123,124,125,126,132,148,150,151,156,158,159,163,164,165,167,174,176,178,180,182,184,185,186,205,206,207,],[9,9,-2,-3,-4,-5,35,-1,-38,-36,-12,-13,-14,-15,-35,-7,-8,-9,-10,-11,-16,9,9,-32,9,9,-6,-17,-18,-19,-31,9,9,9,9,-37,-20,188,190,9,9,-21,]),'MINUSMINUS':([0,1,2,3,4,5,7,27,40,66,82,83,104,105,113,122,123,124,125,126,132,148,150,151,156,158,159,163,164,165,167,174,176,178,180,182,184,185,186,205,206,207,],[10,10,-2,-3,-4,-5,36,-1,-38,-36,-12,-13,-14,-15,-35,-7,-8,-9,-10,-11,-16,10,10,-32,10,10,-6,-17,-18,-19,-31,10,10,10,10,-37,-20,189,191,10,10,-21,]),'IF':([0,1,2,3,4,5,27,40,66,82,83,104,105,113,122,123,124,125,126,132,148,150,151,156,158,159,163,164,165,167,174,176,178,180,182,184,205,206,207,],[13,13,-2,-3,-4,-5,-1,-38,-36,-12,-13,-14,-15,-35,-7,-8,-9,-10,-11,-16,13,13,-32,13,13,-6,-17,-18,-19,-31,13,13,13,13,-37,-20,13,13,-21,]),'FOR':([0,1,2,3,4,5,27,40,66,82,83,104,105,113,122,123,124,125,126,132,148,150,151,156,158,159,163,164,165,167,174,176,178,180,182,184,205,206,207,],[14,14,-2,-3,-4,-5,-1,-38,-36,-12,-13,-14,-15,-35,-7,-8,-9,-10,-11,-16,14,14,-32,14,14,-6,-17,-18,-19,-31,14,14,14,14,-37,-20,14,14,-21,]),'WHILE':([0,1,2,3,4,5,27,40,66,82,83,104,105,113,122,123,124,125,126,132,148,150,151,156,158,159,163,164,165,167,174,176,178,180,182,184,205,206,207,],[15,15,-2,-3,-4,-5,-1,-38,-36,-12,-13,-14,-15,-35,-7,-8,-9,-10,-11,-16,15,15,-32,15,15,-6,-17,-18,-19,-31,15,15,15,15,-37,-20,15,15,-21,]),'PRINT':([0,1,2,3,4,5,27,40,66,82,83,104,105,113,122,123,124,125,126,132,148,150,151,156,158,159,163,164,165,167,174,176,178,180,182,184,205,206,207,],[16,16,-2,-3,-4,-5,-1,-38,-36,-12,-13,-14,-15,-35,-7,-8,-9,-10,-11,-16,16,16,-32,16,16,-6,-17,-18,-19,-31,16,16,16,16,-37,-20,16,16,-21,]),'RETURN':([0,1,2,3,4,5,27,40,66,82,83,104,105,113,122,123,124,125,126,132,148,150,151,156,158,159,163,164,165,167,174,176,178,180,182,184,205,206,207,],[17,17,-2,-3,-4,-5,-1,-38,-36,-12,-13,-14,-15,-35,-7,-8,-9,-10,-11,-16,17,17,-32,17,17,-6,-17,-18,-19,-31,17,17,17,17,-37,-20,17,17,-21,]),'LPAREN':([0,1,2,3,4,5,7,12,13,14,15,16,17,18,23,24,25,26,27,30,31,32,33,34,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,57,60,61,63,64,66,73,74,82,83,84,85,104,105,113,114,116,122,123,124,125,126,127,128,130,132,141,142,143,144,148,150,151,156,158,159,163,164,165,166,167,174,176,177,178,180,182,184,192,193,194,195,196,205,206,207,],[12,12,-2,-3,-4,-5,38,12,61,62,63,64,12,12,12,12,73,74,-1,12,12,12,12,12,12,12,-38,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,38,12,12,12,-36,12,12,-12,-13,127,128,-14,-15,-35,12,12,-7,-8,-9,-10,-11,12,12,12,-16,12,-33,153,-34,12,12,-32,12,12,-6,-17,-18,-19,12,-31,12,12,12,12,12,-37,-20,12,12,12,12,12,12,12,-21,]),'INT':([0,1,2,3,4,5,12,17,18,23,24,27,30,31,32,33,34,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,57,61,63,64,66,73,74,82,83,104,105,113,114,116,122,123,124,125,126,127,128,130,132,141,148,150,151,156,158,159,163,164,165,166,167,174,176,177,178,180,182,184,192,193,194,195,196,205,206,207,],[19,19,-2,-3,-4,-5,19,19,19,19,19,-1,19,19,19,19,19,19,19,-38,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,-36,19,19,-12,-13,-14,-15,-35,19,19,-7,-8,-9,-10,-11,19,19,19,-16,19,19,19,-32,19,19,-6,-17,-18,-19,19,-31,19,19,19,19,19,-37,-20,19,19,19,19,19,19,19,-21,]),'DOUBLE':([0,1,2,3,4,5,12,17,18,23,24,27,30,31,32,33,34,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,57,61,63,64,66,73,74,82,83,104,105,113,114,116,122,123,124,125,126,127,128,130,132,141,148,150,151,156,158,159,163,164,165,166,167,174,176,177,178,180,182,184,192,193,194,195,196,205,206,207,],[20,20,-2,-3,-4,-5,20,20,20,20,20,-1,20,20,20,20,20,20,20,-38,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,-36,20,20,-12,-13,-14,-15,-35,20,20,-7,-8,-9,-10,-11,20,20,20,-16,20,20,20,-32,20,20,-6,-17,-18,-19,20,-31,20,20,20,20,20,-37,-20,20,20,20,20,20,20,20,-21,]),'STRING':([0,1,2,3,4,5,12,17,18,23,24,27,30,31,32,33,34,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,57,61,63,64,66,73,74,82,83,104,105,113,114,116,122,123,124,125,126,127,128,130,132,141,148,150,151,156,158,159,163,164,165,166,167,174,176,177,178,180,182,184,192,193,194,195,196,205,206,207,],[21,21,-2,-3,-4,-5,21,21,21,21,21,-1,21,21,21,21,21,21,21,-38,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,-36,21,21,-12,-13,-14,-15,-35,21,21,-7,-8,-9,-10,-11,21,21,21,-16,21,21,21,-32,21,21,-6,-17,-18,-19,21,-31,21,21,21,21,21,-37,-20,21,21,21,21,21,21,21,-21,]),'BOOL':([0,1,2,3,4,5,12,17,18,23,24,27,30,31,32,33,34,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,57,61,63,64,66,73,74,82,83,104,105,113,114,116,122,123,124,125,126,127,128,130,132,141,148,150,151,156,158,159,163,164,165,166,167,174,176,177,178,180,182,184,192,193,194,195,196,205,206,207,],[22,22,-2,-3,-4,-5,22,22,22,22,22,-1,22,22,22,22,22,22,22,-38,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,-36,22,22,-12,-13,-14,-15,-35,22,22,-7,-8,-9,-10,-11,22,22,22,-16,22,22,22,-32,22,22,-6,-17,-18,-19,22,-31,22,22,22,22,22,-37,-20,22,22,22,22,22,22,22,-21,]),'NOT':([0,1,2,3,4,5,12,17,18,23,24,27,30,31,32,33,34,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,57,61,63,64,66,73,74,82,83,104,105,113,114,116,122,123,124,125,126,127,128,130,132,141,148,150,151,156,158,159,163,164,165,166,167,174,176,177,178,180,182,184,192,193,194,195,196,205,206,207,],[23,23,-2,-3,-4,-5,23,23,23,23,23,-1,23,23,23,23,23,23,23,-38,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,-36,23,23,-12,-13,-14,-15,-35,23,23,-7,-8,-9,-10,-11,23,23,23,-16,23,23,23,-32,23,23,-6,-17,-18,-19,23,-31,23,23,23,23,23,-37,-20,23,23,23,23,23,23,23,-21,]),'MINUS':([0,1,2,3,4,5,7,8,12,17,18,19,20,21,22,23,24,27,30,31,32,33,34,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,57,59,60,61,63,64,66,67,68,69,71,73,74,77,78,79,80,81,82,83,87,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,105,108,109,111,112,113,114,115,116,117,118,119,122,123,124,125,126,127,128,129,130,131,132,137,138,139,140,141,145,146,147,148,150,151,152,156,158,159,163,164,165,166,167,172,174,176,177,178,180,181,182,184,192,193,194,195,196,200,201,202,203,204,205,206,207,],[18,18,-2,-3,-4,-5,-60,42,18,18,18,-54,-55,-56,-57,18,18,-1,18,18,18,18,18,18,18,-38,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,42,-60,18,18,18,-36,42,42,42,42,18,18,42,42,42,42,42,-12,-13,42,42,-39,-40,-41,-42,-43,-44,42,42,42,42,42,42,42,42,-14,-15,-53,42,42,42,-35,18,-61,18,42,-68,42,-7,-8,-9,-10,-11,18,18,-66,18,-65,-16,42,42,-67,-69,18,42,42,42,18,18,-32,42,18,18,-6,-17,-18,-19,18,-31,42,18,18,18,18,18,42,-37,-20,18,18,18,18,18,42,42,42,42,42,18,18,-21,]),'LBRACKET':([0,1,2,3,4,5,7,12,17,18,23,24,27,30,31,32,33,34,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,57,60,61,63,64,66,73,74,82,83,104,105,113,114,116,122,123,124,125,126,127,128,130,132,141,148,150,151,156,158,159,163,164,165,166,167,174,176,177,178,180,182,184,192,193,194,195,196,205,206,207,],[24,24,-2,-3,-4,-5,39,24,24,24,24,24,-1,24,24,24,24,24,24,24,-38,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,39,24,24,24,-36,24,24,-12,-13,-14,-15,-35,24,24,-7,-8,-9,-10,-11,24,24,24,-16,24,24,24,-32,24,24,-6,-17,-18,-19,24,-31,24,24,24,24,24,-37,-20,24,24,24,24,24,24,24,-21,]),'STR':([0,1,2,3,4,5,12,17,18,23,24,27,30,31,32,33,34,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,57,61,63,64,66,73,74,82,83,104,105,113,114,116,122,123,124,125,126,127,128,130,132,141,148,150,151,156,158,159,163,164,165,166,167,174,176,177,178,180,182,184,192,193,194,195,196,205,206,207,],[25,25,-2,-3,-4,-5,25,25,25,25,25,-1,25,25,25,25,25,25,25,-38,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,-36,25,25,-12,-13,-14,-15,-35,25,25,-7,-8,-9,-10,-11,25,25,25,-16,25,25,25,-32,25,25,-6,-17,-18,-19,25,-31,25,25,25,25,25,-37,-20,25,25,25,25,25,25,25,-21,]),'INPUT':([0,1,2,3,4,5,12,17,18,23,24,27,30,31,32,33,34,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,57,61,63,64,66,73,74,82,83,104,105,113,114,116,122,123,124,125,126,127,128,130,132,141,148,150,151,156,158,159,163,164,165,166,167,174,176,177,178,180,182,184,192,193,194,195,196,205,206,207,],[26,26,-2,-3,-4,-5,26,26,26,26,26,-1,26,26,26,26,26,26,26,-38,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,-36,26,26,-12,-13,-14,-15,-35,26,26,-7,-8,-9,-10,-11,26,26,26,-16,26,26,26,-32,26,26,-6,-17,-18,-19,26,-31,26,26,26,26,26,-37,-20,26,26,26,26,26,26,26,-21,]),'$end':([0,1,2,3,4,5,27,40,66,82,83,104,105,113,122,123,124,125,126,132,151,159,163,164,165,167,182,184,207,],[-80,0,-2,-3,-4,-5,-1,-38,-36,-12,-13,-14,-15,-35,-7,-8,-9,-10,-11,-16,-32,-6,-17,-18,-19,-31,-37,-20,-21,]),'RBRACE':([2,3,4,5,27,40,66,82,83,104,105,113,122,123,124,125,126,132,148,150,151,156,158,159,163,164,165,167,174,176,178,180,182,184,205,206,207,],[-2,-3,-4,-5,-1,-38,-36,-12,-13,-14,-15,-35,-7,-8,-9,-10,-11,-16,-80,-80,-32,165,167,-6,-17,-18,-19,-31,-80,-80,182,184,-37,-20,-80,207,-21,]),'FUNCTION':([6,],[29,]),'EQUAL':([7,11,107,120,157,186,],[30,57,-75,141,166,196,]),'PLUSEQ':([7,186,],[31,192,]),'MINUSEQ':([7,186,],[32,193,]),'STAREQ':([7,186,],[33,194,]),'SLASHEQ':([7,186,],[34,195,]),'DOT':([7,],[37,]),'COMMA':([7,11,19,20,21,22,24,38,60,65,67,68,69,70,71,72,86,87,88,90,91,92,93,94,95,96,97,98,99,100,101,102,103,106,107,108,115,118,129,131,137,138,139,140,147,153,161,162,173,183,],[-76,58,-54,-55,-56,-57,-80,-80,-60,114,-74,-59,-58,116,-63,-64,130,-71,-72,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,114,-75,-53,-61,-68,-66,-65,-73,-62,-67,-69,-70,-80,170,-79,-78,-77,]),'SEMI':([7,8,17,19,20,21,22,35,36,55,56,60,65,67,68,69,77,78,79,80,81,90,91,92,93,94,95,96,97,98,99,100,101,102,103,106,108,115,118,129,131,136,137,139,140,152,154,155,172,181,],[-60,40,66,-54,-55,-56,-57,82,83,104,105,-60,113,-74,-59,-58,122,123,124,125,126,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,132,-53,-61,-68,-66,-65,151,-73,-67,-69,159,163,164,177,185,]),'PLUS':([7,8,19,20,21,22,59,60,67,68,69,71,77,78,79,80,81,87,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,108,109,111,112,115,117,118,119,129,131,137,138,139,140,145,146,147,152,172,181,200,201,202,203,204,],[-60,41,-54,-55,-56,-57,41,-60,41,41,41,41,41,41,41,41,41,41,41,-39,-40,-41,-42,-43,-44,41,41,41,41,41,41,41,41,-53,41,41,41,-61,41,-68,41,-66,-65,41,41,-67,-69,41,41,41,41,41,41,41,41,41,41,41,]),'STAR':([7,8,19,20,21,22,59,60,67,68,69,71,77,78,79,80,81,87,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,108,109,111,112,115,117,118,119,129,131,137,138,139,140,145,146,147,152,172,181,200,201,202,203,204,],[-60,43,-54,-55,-56,-57,43,-60,43,43,43,43,43,43,43,43,43,43,43,43,43,-41,-42,-43,-44,43,43,43,43,43,43,43,43,-53,43,43,43,-61,43,-68,43,-66,-65,43,43,-67,-69,43,43,43,43,43,43,43,43,43,43,43,]),'SLASH':([7,8,19,20,21,22,59,60,67,68,69,71,77,78,79,80,81,87,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,108,109,111,112,115,117,118,119,129,131,137,138,139,140,145,146,147,152,172,181,200,201,202,203,204,],[-60,44,-54,-55,-56,-57,44,-60,44,44,44,44,44,44,44,44,44,44,44,44,44,-41,-42,-43,-44,44,44,44,44,44,44,44,44,-53,44,44,44,-61,44,-68,44,-66,-65,44,44,-67,-69,44,44,44,44,44,44,44,44,44,44,44,]),'MOD':([7,8,19,20,21,22,59,60,67,68,69,71,77,78,79,80,81,87,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,108,109,111,112,115,117,118,119,129,131,137,138,139,140,145,146,147,152,172,181,200,201,202,203,204,],[-60,45,-54,-55,-56,-57,45,-60,45,45,45,45,45,45,45,45,45,45,45,45,45,-41,-42,-43,-44,45,45,45,45,45,45,45,45,-53,45,45,45,-61,45,-68,45,-66,-65,45,45,-67,-69,45,45,45,45,45,45,45,45,45,45,45,]),'POW':([7,8,19,20,21,22,59,60,67,68,69,71,77,78,79,80,81,87,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,108,109,111,112,115,117,118,119,129,131,137,138,139,140,145,146,147,152,172,181,200,201,202,203,204,],[-60,46,-54,-55,-56,-57,46,-60,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,-53,46,46,46,-61,46,-68,46,-66,-65,46,46,-67,-69,46,46,46,46,46,46,46,46,46,46,46,]),'LT':([7,8,19,20,21,22,59,60,67,68,69,71,77,78,79,80,81,87,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,108,109,111,112,115,117,118,119,129,131,137,138,139,140,145,146,147,152,172,181,200,201,202,203,204,],[-60,47,-54,-55,-56,-57,47,-60,47,47,47,47,47,47,47,47,47,47,47,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,47,47,-53,47,47,47,-61,47,-68,47,-66,-65,47,47,-67,-69,47,47,47,47,47,47,47,47,47,47,47,]),'LE':([7,8,19,20,21,22,59,60,67,68,69,71,77,78,79,80,81,87,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,108,109,111,112,115,117,118,119,129,131,137,138,139,140,145,146,147,152,172,181,200,201,202,203,204,],[-60,48,-54,-55,-56,-57,48,-60,48,48,48,48,48,48,48,48,48,48,48,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,48,48,-53,48,48,48,-61,48,-68,48,-66,-65,48,48,-67,-69,48,48,48,48,48,48,48,48,48,48,48,]),'GT':([7,8,19,20,21,22,59,60,67,68,69,71,77,78,79,80,81,87,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,108,109,111,112,115,117,118,119,129,131,137,138,139,140,145,146,147,152,172,181,200,201,202,203,204,],[-60,49,-54,-55,-56,-57,49,-60,49,49,49,49,49,49,49,49,49,49,49,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,49,49,-53,49,49,49,-61,49,-68,49,-66,-65,49,49,-67,-69,49,49,49,49,49,49,49,49,49,49,49,]),'GE':([7,8,19,20,21,22,59,60,67,68,69,71,77,78,79,80,81,87,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,108,109,111,112,115,117,118,119,129,131,137,138,139,140,145,146,147,152,172,181,200,201,202,203,204,],[-60,50,-54,-55,-56,-57,50,-60,50,50,50,50,50,50,50,50,50,50,50,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,50,50,-53,50,50,50,-61,50,-68,50,-66,-65,50,50,-67,-69,50,50,50,50,50,50,50,50,50,50,50,]),'EQEQ':([7,8,19,20,21,22,59,60,67,68,69,71,77,78,79,80,81,87,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,108,109,111,112,115,117,118,119,129,131,137,138,139,140,145,146,147,152,172,181,200,201,202,203,204,],[-60,51,-54,-55,-56,-57,51,-60,51,51,51,51,51,51,51,51,51,51,51,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,51,51,-53,51,51,51,-61,51,-68,51,-66,-65,51,51,-67,-69,51,51,51,51,51,51,51,51,51,51,51,]),'NOTEQ':([7,8,19,20,21,22,59,60,67,68,69,71,77,78,79,80,81,87,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,108,109,111,112,115,117,118,119,129,131,137,138,139,140,145,146,147,152,172,181,200,201,202,203,204,],[-60,52,-54,-55,-56,-57,52,-60,52,52,52,52,52,52,52,52,52,52,52,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,52,52,-53,52,52,52,-61,52,-68,52,-66,-65,52,52,-67,-69,52,52,52,52,52,52,52,52,52,52,52,]),'AND':([7,8,19,20,21,22,59,60,67,68,69,71,77,78,79,80,81,87,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,108,109,111,112,115,117,118,119,129,131,137,138,139,140,145,146,147,152,172,181,200,201,202,203,204,],[-60,53,-54,-55,-56,-57,53,-60,53,-59,-58,53,53,53,53,53,53,53,53,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,-51,53,-53,53,53,53,-61,53,-68,53,-66,-65,53,53,-67,-69,53,53,53,53,53,53,53,53,53,53,53,]),'OR':([7,8,19,20,21,22,59,60,67,68,69,71,77,78,79,80,81,87,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,108,109,111,112,115,117,118,119,129,131,137,138,139,140,145,146,147,152,172,181,200,201,202,203,204,],[-60,54,-54,-55,-56,-57,54,-60,54,-59,-58,54,54,54,54,54,54,54,54,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,54,54,54,-61,54,-68,54,-66,-65,54,54,-67,-69,54,54,54,54,54,54,54,54,54,54,54,]),'RPAREN':([19,20,21,22,38,59,60,68,69,74,86,87,88,90,91,92,93,94,95,96,97,98,99,100,101,102,103,108,109,111,112,115,117,118,119,129,131,139,140,145,146,147,153,161,162,173,183,187,190,191,198,199,200,201,202,203,204,],[-54,-55,-56,-57,-80,108,-60,-59,-58,118,129,-71,-72,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,133,135,136,-61,139,-68,140,-66,-65,-67,-69,154,155,-70,-80,169,-79,-78,-77,197,-22,-23,-24,-25,-26,-27,-28,-29,-30,]),'RBRACKET':([19,20,21,22,24,60,68,69,70,71,72,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,108,115,118,129,131,138,139,140,],[-54,-55,-56,-57,-80,-60,-59,-58,115,-63,-64,131,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-61,-68,-66,-65,-62,-67,-69,]),'COLON':([28,76,134,160,175,],[75,121,149,168,179,]),'APPEND':([37,],[84,]),'REMOVE':([37,],[85,]),'VOID':([121,],[144,]),'LBRACE':([133,135,169,171,197,],[148,150,174,176,205,]),'ELSE':([165,],[171,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'program':([0,148,150,174,176,205,],[1,156,158,178,180,206,]),'statement':([0,1,148,150,156,158,174,176,178,180,205,206,],[2,27,2,2,27,27,2,2,27,27,2,27,]),'empty':([0,24,38,148,150,153,174,176,205,],[3,72,88,3,3,162,3,3,3,]),'expression':([0,1,12,17,18,23,24,30,31,32,33,34,38,39,41,42,43,44,45,46,47,48,49,50,51,52,53,54,57,61,63,64,73,74,114,116,127,128,130,141,148,150,156,158,166,174,176,177,178,180,192,193,194,195,196,205,206,],[8,8,59,67,68,69,71,77,78,79,80,81,87,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,67,109,111,112,117,119,137,138,145,146,147,152,8,8,8,8,172,8,8,181,8,8,200,201,202,203,204,8,8,]),'ident_list':([0,1,148,150,156,158,174,176,178,180,205,206,],[11,11,11,11,11,11,11,11,11,11,11,11,]),'expression_list':([17,57,],[65,106,]),'list_items':([24,],[70,]),'arglist':([38,],[86,]),'return_type':([121,],[143,]),'paramlist':([153,],[161,]),'for_increment':([185,],[187,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> program","S'",1,None,None,None),
+  ('program -> program statement','program',2,'p_program','parser.py',28),
+  ('program -> statement','program',1,'p_program','parser.py',29),
+  ('program -> empty','program',1,'p_program','parser.py',30),
+  ('statement -> COMMENT_LINE','statement',1,'p_statement_comment','parser.py',43),
+  ('statement -> COMMENT_BLOCK','statement',1,'p_statement_comment','parser.py',44),
+  ('statement -> WAX IDENT COLON IDENT EQUAL expression SEMI','statement',7,'p_statement_decl','parser.py',48),
+  ('statement -> IDENT EQUAL expression SEMI','statement',4,'p_statement_assignment','parser.py',54),
+  ('statement -> IDENT PLUSEQ expression SEMI','statement',4,'p_statement_compound_assignment','parser.py',59),
+  ('statement -> IDENT MINUSEQ expression SEMI','statement',4,'p_statement_compound_assignment','parser.py',60),
+  ('statement -> IDENT STAREQ expression SEMI','statement',4,'p_statement_compound_assignment','parser.py',61),
+  ('statement -> IDENT SLASHEQ expression SEMI','statement',4,'p_statement_compound_assignment','parser.py',62),
+  ('statement -> IDENT PLUSPLUS SEMI','statement',3,'p_statement_increment','parser.py',68),
+  ('statement -> IDENT MINUSMINUS SEMI','statement',3,'p_statement_increment','parser.py',69),
+  ('statement -> PLUSPLUS IDENT SEMI','statement',3,'p_statement_increment','parser.py',70),
+  ('statement -> MINUSMINUS IDENT SEMI','statement',3,'p_statement_increment','parser.py',71),
+  ('statement -> ident_list EQUAL expression_list SEMI','statement',4,'p_statement_multi_assignment','parser.py',84),
+  ('statement -> IDENT DOT APPEND LPAREN expression RPAREN SEMI','statement',7,'p_statement_list_append','parser.py',88),
+  ('statement -> IDENT DOT REMOVE LPAREN expression RPAREN SEMI','statement',7,'p_statement_list_remove','parser.py',93),
+  ('statement -> IF LPAREN expression RPAREN LBRACE program RBRACE','statement',7,'p_statement_if','parser.py',99),
+  ('statement -> IF LPAREN expression RPAREN LBRACE program RBRACE ELSE LBRACE program RBRACE','statement',11,'p_statement_if','parser.py',100),
+  ('statement -> FOR LPAREN WAX IDENT COLON IDENT EQUAL expression SEMI expression SEMI for_increment RPAREN LBRACE program RBRACE','statement',16,'p_statement_for','parser.py',107),
+  ('for_increment -> IDENT PLUSPLUS','for_increment',2,'p_for_increment','parser.py',122),
+  ('for_increment -> IDENT MINUSMINUS','for_increment',2,'p_for_increment','parser.py',123),
+  ('for_increment -> PLUSPLUS IDENT','for_increment',2,'p_for_increment','parser.py',124),
+  ('for_increment -> MINUSMINUS IDENT','for_increment',2,'p_for_increment','parser.py',125),
+  ('for_increment -> IDENT PLUSEQ expression','for_increment',3,'p_for_increment','parser.py',126),
+  ('for_increment -> IDENT MINUSEQ expression','for_increment',3,'p_for_increment','parser.py',127),
+  ('for_increment -> IDENT STAREQ expression','for_increment',3,'p_for_increment','parser.py',128),
+  ('for_increment -> IDENT SLASHEQ expression','for_increment',3,'p_for_increment','parser.py',129),
+  ('for_increment -> IDENT EQUAL expression','for_increment',3,'p_for_increment','parser.py',130),
+  ('statement -> WHILE LPAREN expression RPAREN LBRACE program RBRACE','statement',7,'p_statement_while','parser.py',146),
+  ('statement -> PRINT LPAREN expression RPAREN SEMI','statement',5,'p_statement_print','parser.py',150),
+  ('return_type -> IDENT','return_type',1,'p_return_type','parser.py',154),
+  ('return_type -> VOID','return_type',1,'p_return_type','parser.py',155),
+  ('statement -> RETURN expression_list SEMI','statement',3,'p_statement_return_value','parser.py',159),
+  ('statement -> RETURN SEMI','statement',2,'p_statement_return_empty','parser.py',163),
+  ('statement -> WAX FUNCTION IDENT COLON return_type LPAREN paramlist RPAREN LBRACE program RBRACE','statement',11,'p_statement_func','parser.py',167),
+  ('statement -> expression SEMI','statement',2,'p_statement_expression','parser.py',172),
+  ('expression -> expression PLUS expression','expression',3,'p_expression_binop','parser.py',177),
+  ('expression -> expression MINUS expression','expression',3,'p_expression_binop','parser.py',178),
+  ('expression -> expression STAR expression','expression',3,'p_expression_binop','parser.py',179),
+  ('expression -> expression SLASH expression','expression',3,'p_expression_binop','parser.py',180),
+  ('expression -> expression MOD expression','expression',3,'p_expression_binop','parser.py',181),
+  ('expression -> expression POW expression','expression',3,'p_expression_binop','parser.py',182),
+  ('expression -> expression LT expression','expression',3,'p_expression_comparison','parser.py',186),
+  ('expression -> expression LE expression','expression',3,'p_expression_comparison','parser.py',187),
+  ('expression -> expression GT expression','expression',3,'p_expression_comparison','parser.py',188),
+  ('expression -> expression GE expression','expression',3,'p_expression_comparison','parser.py',189),
+  ('expression -> expression EQEQ expression','expression',3,'p_expression_comparison','parser.py',190),
+  ('expression -> expression NOTEQ expression','expression',3,'p_expression_comparison','parser.py',191),
+  ('expression -> expression AND expression','expression',3,'p_expression_logic','parser.py',195),
+  ('expression -> expression OR expression','expression',3,'p_expression_logic','parser.py',196),
+  ('expression -> LPAREN expression RPAREN','expression',3,'p_expression_group','parser.py',200),
+  ('expression -> INT','expression',1,'p_expression_number','parser.py',204),
+  ('expression -> DOUBLE','expression',1,'p_expression_number','parser.py',205),
+  ('expression -> STRING','expression',1,'p_expression_string','parser.py',210),
+  ('expression -> BOOL','expression',1,'p_expression_bool','parser.py',214),
+  ('expression -> NOT expression','expression',2,'p_expression_not','parser.py',218),
+  ('expression -> MINUS expression','expression',2,'p_expression_unary_minus','parser.py',222),
+  ('expression -> IDENT','expression',1,'p_expression_ident','parser.py',226),
+  ('expression -> LBRACKET list_items RBRACKET','expression',3,'p_expression_list','parser.py',230),
+  ('list_items -> list_items COMMA expression','list_items',3,'p_list_items','parser.py',234),
+  ('list_items -> expression','list_items',1,'p_list_items','parser.py',235),
+  ('list_items -> empty','list_items',1,'p_list_items','parser.py',236),
+  ('expression -> IDENT LBRACKET expression RBRACKET','expression',4,'p_expression_list_access','parser.py',243),
+  ('expression -> IDENT LPAREN arglist RPAREN','expression',4,'p_expression_func_call','parser.py',247),
+  ('expression -> STR LPAREN expression RPAREN','expression',4,'p_expression_str_call','parser.py',252),
+  ('expression -> INPUT LPAREN RPAREN','expression',3,'p_expression_input','parser.py',256),
+  ('expression -> INPUT LPAREN expression RPAREN','expression',4,'p_expression_input','parser.py',257),
+  ('arglist -> arglist COMMA expression','arglist',3,'p_arglist','parser.py',265),
+  ('arglist -> expression','arglist',1,'p_arglist','parser.py',266),
+  ('arglist -> empty','arglist',1,'p_arglist','parser.py',267),
+  ('expression_list -> expression_list COMMA expression','expression_list',3,'p_expression_list_values','parser.py',274),
+  ('expression_list -> expression','expression_list',1,'p_expression_list_values','parser.py',275),
+  ('ident_list -> ident_list COMMA IDENT','ident_list',3,'p_ident_list','parser.py',282),
+  ('ident_list -> IDENT','ident_list',1,'p_ident_list','parser.py',283),
+  ('paramlist -> paramlist COMMA IDENT COLON IDENT','paramlist',5,'p_paramlist','parser.py',290),
+  ('paramlist -> IDENT COLON IDENT','paramlist',3,'p_paramlist','parser.py',291),
+  ('paramlist -> empty','paramlist',1,'p_paramlist','parser.py',292),
+  ('empty -> <empty>','empty',0,'p_empty','parser.py',304),
+]
@@ -0,0 +1,144 @@
+# program_runner.py
+# Ejecución de un programa compilado en un hilo aparte, para la GUI. Antes
+# gui.py ejecutaba el objeto código en el hilo de la interfaz y la ventana
+# sólo respondía porque cada print() llamaba a processEvents(): un ciclo
+# largo sin print la congelaba y no había forma de detenerlo.
+#
+# ProgramRunner no depende de Qt; se comunica con quien lo usa mediante
+# tres funciones que se llaman desde el hilo del programa:
+#   on_output()          -> hay salida nueva: se pide con take_output().
+#                           No se vuelve a llamar hasta la siguiente
+#                           take_output(), así mil print() seguidos
+#                           cuestan un aviso y no mil.
+#   on_input(prompt)     -> el programa llamó a input(): el hilo espera
+#                           hasta que alguien llame a answer(texto).
+#   on_finished(status, error)
+#                        -> terminó; 'status' es "ok", "error",
+#                           "step_limit" o "cancelled" (los nombres de
+#                           exec_pool.py) y 'error' el mensaje de la
+#                           excepción, si la hubo.
+#
+# cancel() detiene el programa lanzando ProgramCancelled dentro de su hilo
+# (PyThreadState_SetAsyncExc): llega en la siguiente instrucción de
+# bytecode, así corta cualquier ciclo de Python, y si el programa espera un
+# input() lo despierta. Una sola operación larga en C (multiplicar una
+# cadena enorme) termina antes de que llegue la excepción. El hilo del
+# programa comparte el GIL con el de la interfaz, pero Python se lo cede
+# cada sys.getswitchinterval() (5 ms), así la ventana sigue respondiendo.
+
+import collections
+import ctypes
+import queue
+import threading
+
+from runtime import StepLimitExceeded
+
+
+class ProgramCancelled(Exception):
+    """Se lanza dentro del programa cuando se pide detenerlo."""
+
+
+class ProgramRunner:
+    def __init__(self, code_object, on_output, on_input, on_finished):
+        self.code_object = code_object
+        self.on_output = on_output
+        self.on_input = on_input
+        self.on_finished = on_finished
+        self.status = None
+        self.error = None
+        # Salida pendiente: el hilo del programa agrega y take_output() saca
+        # por la izquierda; cada operación de un deque es atómica, así
+        # print() no necesita tomar un lock
+        self._pending = collections.deque()
+        self._notified = False
+        self._answers = queue.Queue()
+        self._lock = threading.Lock()
+        self._running = False
+        self._cancelled = False
+        self._thread = threading.Thread(target=self._run, name="wax-program", daemon=True)
+
+    def start(self):
+        self._running = True
+        self._thread.start()
+
+    @property
+    def running(self):
+        return self._running
+
+    def take_output(self):
+        """Devuelve (y olvida) todo lo que se imprimió desde la última llamada."""
+        # Primero se rearma el aviso: lo que se agregue después de vaciar
+        # el deque vuelve a llamar a on_output()
+        self._notified = False
+        pending = self._pending
+        return "".join([pending.popleft() for _ in range(len(pending))])
+
+    def answer(self, text):
+        """Respuesta al último on_input(); None detiene el programa."""
+        self._answers.put(text)
+
+    def cancel(self):
+        """Pide detener el programa; on_finished llega con "cancelled"."""
+        with self._lock:
+            if not self._running or self._cancelled:
+                return
+            self._cancelled = True
+            ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(self._thread.ident),
+                                                       ctypes.py_object(ProgramCancelled))
+        self._answers.put(None)
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+    # --- Funciones que ve el programa ---
+
+    def _write(self, text):
+        self._pending.append(text)
+        if not self._notified:
+            self._notified = True
+            self.on_output()
+
+    def _print(self, *args, sep=" ", end="\n", file=None, flush=False):
+        if end is None:
+            end = "\n"
+        # El código generado imprime siempre un solo valor
+        if len(args) == 1:
+            self._pending.append(str(args[0]) + end)
+        else:
+            self._pending.append((" " if sep is None else sep).join(map(str, args)) + end)
+        if not self._notified:
+            self._notified = True
+            self.on_output()
+
+    def _input(self, prompt=""):
+        self.on_input(prompt)
+        text = self._answers.get()
+        if text is None:
+            raise ProgramCancelled()
+        # Como en la consola: el prompt y lo que se escribió quedan en la salida
+        self._write(f"{prompt}{text}\n")
+        return text
+
+    # --- Hilo del programa ---
+
+    def _run(self):
+        scope = {"print": self._print, "input": self._input, "__builtins__": __builtins__}
+        ident = ctypes.c_ulong(threading.get_ident())
+        status, error = "ok", None
+        try:
+            try:
+                exec(self.code_object, scope, scope)
+            finally:
+                # Desde aquí cancel() ya no lanza nada; si lanzó justo al
+                # terminar el programa y la excepción no llegó, se descarta
+                with self._lock:
+                    self._running = False
+                    ctypes.pythonapi.PyThreadState_SetAsyncExc(ident, None)
+        except ProgramCancelled:
+            status = "cancelled"
+        except StepLimitExceeded as e:
+            status, error = "step_limit", f"{type(e).__name__}: {e}"
+        except Exception as e:
+            status, error = "error", f"{type(e).__name__}: {e}"
+        self.status, self.error = status, error
+        self.on_finished(status, error)
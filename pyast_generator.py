@@ -0,0 +1,451 @@
+# pyast_generator.py
+# Traduce el AST verificado directamente a un árbol 'ast.Module' de Python,
+# listo para compile(). Evita que CPython tenga que volver a tokenizar y
+# parsear el texto generado. Los números de línea de los nodos Python son
+# los de los nodos Wax, así que los errores de ejecución apuntan al .wax.
+# El código legible (para --code y la GUI) lo sigue produciendo CodeGenerator.
+
+import ast
+
+from ast_nodes import dispatch_table, trampoline
+from generator import CHAIN_CHUNK, ENTRY_FUNCTION, STEP_ERROR, STEP_REPEAT, STEP_VAR, STEPS
+from loop_analysis import find_range_loops
+from scope_analysis import entry_globals
+
+# Contextos y operadores sin estado: se comparten entre todos los nodos
+# (CPython hace lo mismo al parsear), así se crean menos objetos.
+LOAD, STORE, DEL = ast.Load(), ast.Store(), ast.Del()
+OR, AND, NOT, USUB = ast.Or(), ast.And(), ast.Not(), ast.USub()
+
+# Operadores Wax -> operadores de Python
+BIN_OPS = {
+    "+": ast.Add(), "-": ast.Sub(), "*": ast.Mult(), "/": ast.Div(),
+    "%": ast.Mod(), "**": ast.Pow(),
+}
+COMPARE_OPS = {
+    "==": ast.Eq(), "!=": ast.NotEq(), "<": ast.Lt(),
+    "<=": ast.LtE(), ">": ast.Gt(), ">=": ast.GtE(),
+}
+AUG_OPS = {"+=": BIN_OPS["+"], "-=": BIN_OPS["-"], "*=": BIN_OPS["*"], "/=": BIN_OPS["/"]}
+
+# Cada nodo Python lleva sólo 'lineno' y 'col_offset' (las posiciones
+# finales son opcionales para compile()); se pasan al constructor porque
+# es más barato que asignarlas después.
+
+class PyAstGenerator:
+    # Igual que CodeGenerator.lower_range_loops
+    lower_range_loops = True
+    # Igual que CodeGenerator.wrap_main
+    wrap_main = True
+
+    def __init__(self, step_budget=None, wrap_main=None):
+        if wrap_main is not None:
+            self.wrap_main = wrap_main
+        self.lineno = 1
+        self.temp_count = 0
+        # Igual que en CodeGenerator: pasos del programa (None: sin instrumentar)
+        self.step_budget = step_budget
+        self.range_loops = {}
+        self._visitors = dispatch_table(type(self), 'visit_')
+
+    def generate(self, ast_nodes):
+        """Punto de entrada principal. Devuelve un ast.Module."""
+        body = [ast.Import([ast.alias("sys", None, lineno=1, col_offset=0)], lineno=1, col_offset=0)]
+        if self.step_budget is not None:
+            body.extend(self._step_prologue())
+        # Con presupuesto no se traduce a range() (ver generator.py)
+        lower = self.lower_range_loops and self.step_budget is None
+        self.range_loops = find_range_loops(ast_nodes) if lower else {}
+        if not self.wrap_main:
+            for node in ast_nodes:
+                self._extend(body, self.visit(node))
+            return ast.Module(body, [])
+
+        # def _wax_main(): global ...; <nivel superior>  /  _wax_main()
+        main_body = []
+        global_names = entry_globals(ast_nodes)
+        if global_names:
+            main_body.append(ast.Global(sorted(global_names), lineno=1, col_offset=0))
+        for node in ast_nodes:
+            self._extend(main_body, self.visit(node))
+        if not main_body:
+            main_body.append(ast.Pass(lineno=1, col_offset=0))
+        arguments = ast.arguments([], [], None, [], [], None, [])
+        body.append(ast.FunctionDef(ENTRY_FUNCTION, arguments, main_body, [], None,
+                                    lineno=1, col_offset=0))
+        call = ast.Call(ast.Name(ENTRY_FUNCTION, LOAD, lineno=self.lineno, col_offset=0), [], [],
+                        lineno=self.lineno, col_offset=0)
+        body.append(ast.Expr(call, lineno=self.lineno, col_offset=0))
+        return ast.Module(body, [])
+
+    def compile(self, ast_nodes, filename="<wax>"):
+        """Genera el módulo y lo compila a un objeto código."""
+        return compile(self.generate(ast_nodes), filename, "exec")
+
+    # --- Utilidades ---
+
+    def _line(self, node):
+        """Línea del nodo Wax, o la última conocida si no la tiene."""
+        lineno = node.lineno
+        if lineno:
+            self.lineno = lineno
+            return lineno
+        return self.lineno
+
+    def _extend(self, body, stmt):
+        """Agrega una sentencia (o una lista de sentencias) a un bloque."""
+        if stmt is None:
+            return
+        if stmt.__class__ is list:
+            body.extend(stmt)
+        else:
+            body.append(stmt)
+
+    # Igual que en CodeGenerator, los visitantes con hijos son generadores
+    # ejecutados por 'trampoline' para no depender de la pila de Python.
+
+    def visit(self, node):
+        return trampoline(self._visit(node))
+
+    def _visit(self, node):
+        if node is None:
+            return None
+        if isinstance(node, list):
+            return self.visit_program(node)
+        method = self._visitors.get(node.type)
+        if method is None:
+            return self.generic_visit(node)
+        return method(self, node)
+
+    def generic_visit(self, node):
+        """Los nodos sin traducción (Type, ASSIGN_MULTI...) no generan código."""
+        return None
+
+    # --- Bloques ---
+
+    def visit_program(self, node_list):
+        """Lista de sentencias Python; 'pass' si el bloque queda vacío."""
+        body = []
+        for stmt in node_list:
+            self._extend(body, (yield self._visit(stmt)))
+        if not body:
+            body.append(ast.Pass(lineno=self.lineno, col_offset=0))
+        return body
+
+    # --- Sentencias ---
+
+    def _assign(self, name, value, line):
+        target = ast.Name(name, STORE, lineno=line, col_offset=0)
+        return ast.Assign([target], value, None, lineno=line, col_offset=0)
+
+    def _aug_assign(self, name, operator, value, line):
+        if operator == "=":
+            return self._assign(name, value, line)
+        target = ast.Name(name, STORE, lineno=line, col_offset=0)
+        return ast.AugAssign(target, AUG_OPS[operator], value, lineno=line, col_offset=0)
+
+    def visit_DECLARATION(self, node):
+        # wax mi_var:int = 5  ->  mi_var = 5
+        line = self._line(node)
+        value = yield self._visit(node.children[2])
+        return self._assign(node.children[1].value, value, line)
+
+    def visit_ASSIGN(self, node):
+        line = self._line(node)
+        value = yield self._visit(node.children[1])
+        return self._assign(node.children[0].value, value, line)
+
+    def visit_ASSIGN_COMPOUND(self, node):
+        line = self._line(node)
+        value = yield self._visit(node.children[1])
+        return self._aug_assign(node.children[0].value, node.value, value, line)
+
+    def visit_INCREMENT(self, node):
+        # i++  ->  i += 1
+        line = self._line(node)
+        operator = "+=" if node.value == "++" else "-="
+        one = ast.Constant(1, lineno=line, col_offset=0)
+        return self._aug_assign(node.children[0].value, operator, one, line)
+
+    def visit_LIST_APPEND(self, node):
+        # mi_lista.append(5)
+        line = self._line(node)
+        element = yield self._visit(node.children[1])
+        target = ast.Name(node.children[0].value, LOAD, lineno=line, col_offset=0)
+        method = ast.Attribute(target, "append", LOAD, lineno=line, col_offset=0)
+        call = ast.Call(method, [element], [], lineno=line, col_offset=0)
+        return ast.Expr(call, lineno=line, col_offset=0)
+
+    def visit_LIST_REMOVE(self, node):
+        # mi_lista.remove(0)  ->  del mi_lista[0]
+        line = self._line(node)
+        index = yield self._visit(node.children[1])
+        target = ast.Name(node.children[0].value, LOAD, lineno=line, col_offset=0)
+        item = ast.Subscript(target, index, DEL, lineno=line, col_offset=0)
+        return ast.Delete([item], lineno=line, col_offset=0)
+
+    def visit_PRINT(self, node):
+        # print(x)  ->  print(x); ver CodeGenerator.visit_PRINT
+        line = self._line(node)
+        expr = yield self._visit(node.children[0])
+        func = ast.Name("print", LOAD, lineno=line, col_offset=0)
+        call = ast.Call(func, [expr], [], lineno=line, col_offset=0)
+        return ast.Expr(call, lineno=line, col_offset=0)
+
+    def visit_IF(self, node):
+        line = self._line(node)
+        test = yield self._visit(node.children[0])
+        body = yield self._visit(node.children[1])
+        return ast.If(test, body, [], lineno=line, col_offset=0)
+
+    def visit_IF_ELSE(self, node):
+        line = self._line(node)
+        test = yield self._visit(node.children[0])
+        body = yield self._visit(node.children[1])
+        orelse = yield self._visit(node.children[2])
+        return ast.If(test, body, orelse, lineno=line, col_offset=0)
+
+    def visit_WHILE(self, node):
+        line = self._line(node)
+        test = yield self._visit(node.children[0])
+        body = yield self._visit(node.children[1])
+        if self.step_budget is not None:
+            return self._step_loop(test, body, line)
+        return ast.While(test, body, [], lineno=line, col_offset=0)
+
+    def visit_FOR(self, node):
+        # for (wax i:int = 0; i < 10; i++) { ... }
+        #   ->  i = 0 / while i < 10: ... ; i += 1
+        line = self._line(node)
+        var_name = node.children[1].value
+        spec = self.range_loops.get(node)
+        if spec is not None:
+            return (yield self.visit_range_for(var_name, spec, node.children[5], line))
+        init_value = yield self._visit(node.children[2])
+        test = yield self._visit(node.children[3])
+        increment = yield self.visit_for_increment(node.children[4])
+        body = yield self._visit(node.children[5])
+        if len(body) == 1 and body[0].__class__ is ast.Pass:
+            body = []
+        body.append(increment)
+        if self.step_budget is not None:
+            return [self._assign(var_name, init_value, line), self._step_loop(test, body, line)]
+        loop = ast.While(test, body, [], lineno=line, col_offset=0)
+        return [self._assign(var_name, init_value, line), loop]
+
+    def visit_range_for(self, var_name, spec, body, line):
+        # for (wax i:int = 0; i <= n; i += 2)  ->  for i in range(0, n + 1, 2)
+        start = yield self._visit(spec["start"])
+        stop, offset = spec["stop"], spec["offset"]
+        if stop.type == "NUMBER":
+            stop = ast.Constant(stop.value + offset, lineno=line, col_offset=0)
+        else:
+            stop = yield self._visit(stop)
+            if offset:
+                one = ast.Constant(1, lineno=line, col_offset=0)
+                stop = ast.BinOp(stop, BIN_OPS["+" if offset > 0 else "-"], one,
+                                 lineno=line, col_offset=0)
+        args = [start, stop]
+        if spec["step"] != 1:
+            args.append(ast.Constant(spec["step"], lineno=line, col_offset=0))
+        func = ast.Name("range", LOAD, lineno=line, col_offset=0)
+        iterable = ast.Call(func, args, [], lineno=line, col_offset=0)
+        body = yield self._visit(body)
+        target = ast.Name(var_name, STORE, lineno=line, col_offset=0)
+        return ast.For(target, iterable, body, [], None, lineno=line, col_offset=0)
+
+    # --- Presupuesto de pasos (ver generator.py) ---
+
+    def _step_prologue(self):
+        """Importa repeat y StepLimitExceeded y crea el iterador de pasos."""
+        repeat = ast.ImportFrom("itertools", [ast.alias("repeat", STEP_REPEAT, lineno=1, col_offset=0)],
+                                0, lineno=1, col_offset=0)
+        error = ast.ImportFrom("runtime", [ast.alias("StepLimitExceeded", STEP_ERROR, lineno=1, col_offset=0)],
+                               0, lineno=1, col_offset=0)
+        args = [ast.Constant(None, lineno=1, col_offset=0), ast.Constant(self.step_budget, lineno=1, col_offset=0)]
+        steps = ast.Call(ast.Name(STEP_REPEAT, LOAD, lineno=1, col_offset=0), args, [],
+                         lineno=1, col_offset=0)
+        return [repeat, error, self._assign(STEPS, steps, 1)]
+
+    def _step_error(self, line):
+        """raise _wax_StepLimitExceeded(línea, presupuesto)"""
+        args = [ast.Constant(line, lineno=line, col_offset=0),
+                ast.Constant(self.step_budget, lineno=line, col_offset=0)]
+        call = ast.Call(ast.Name(STEP_ERROR, LOAD, lineno=line, col_offset=0), args, [],
+                        lineno=line, col_offset=0)
+        return ast.Raise(call, None, lineno=line, col_offset=0)
+
+    def _step_loop(self, test, body, line):
+        """for _wax_step in _wax_steps: if not test: break / body / else: raise"""
+        exit_test = ast.UnaryOp(NOT, test, lineno=line, col_offset=0)
+        exit_loop = ast.If(exit_test, [ast.Break(lineno=line, col_offset=0)], [], lineno=line, col_offset=0)
+        target = ast.Name(STEP_VAR, STORE, lineno=line, col_offset=0)
+        steps = ast.Name(STEPS, LOAD, lineno=line, col_offset=0)
+        return ast.For(target, steps, [exit_loop] + body, [self._step_error(line)], None,
+                       lineno=line, col_offset=0)
+
+    def _step_check(self, line):
+        """for _wax_step in _wax_steps: break / else: raise"""
+        steps = ast.Name(STEPS, LOAD, lineno=line, col_offset=0)
+        target = ast.Name(STEP_VAR, STORE, lineno=line, col_offset=0)
+        return ast.For(target, steps, [ast.Break(lineno=line, col_offset=0)], [self._step_error(line)],
+                       None, lineno=line, col_offset=0)
+
+    def visit_for_increment(self, node):
+        line = self._line(node)
+        var_name = node.children[0].value
+        if node.type == "FOR_INCREMENT":
+            operator = "+=" if node.value == "++" else "-="
+            value = ast.Constant(1, lineno=line, col_offset=0)
+        else:
+            operator = node.value
+            value = yield self._visit(node.children[1])
+        return self._aug_assign(var_name, operator, value, line)
+
+    def visit_FUNCTION(self, node):
+        line = self._line(node)
+        params = [ast.arg(p.children[0].value, None, lineno=line, col_offset=0)
+                  for p in node.children[2]]
+        body = yield self._visit(node.children[3])
+        if self.step_budget is not None:
+            body.insert(0, self._step_check(line))
+        arguments = ast.arguments([], params, None, [], [], None, [])
+        return ast.FunctionDef(node.children[1].value, arguments, body, [], None,
+                               lineno=line, col_offset=0)
+
+    def visit_RETURN_VALUE(self, node):
+        line = self._line(node)
+        value = yield self._visit(node.children[0])
+        return ast.Return(value, lineno=line, col_offset=0)
+
+    def visit_RETURN_EMPTY(self, node):
+        return ast.Return(None, lineno=self._line(node), col_offset=0)
+
+    def visit_EXPR_STATEMENT(self, node):
+        line = self._line(node)
+        value = yield self._visit(node.children[0])
+        return ast.Expr(value, lineno=line, col_offset=0)
+
+    # --- Expresiones ---
+
+    def visit_Identifier(self, node):
+        return ast.Name(node.value, LOAD, lineno=self._line(node), col_offset=0)
+
+    visit_IDENT = visit_Identifier
+
+    def visit_NUMBER(self, node):
+        return ast.Constant(node.value, lineno=self._line(node), col_offset=0)
+
+    def visit_STRING(self, node):
+        # Mismo valor que el literal "..." que escribe CodeGenerator; si ese
+        # literal no fuera válido en Python, se usa el texto tal cual.
+        value = node.value
+        if "\\" in value:
+            try:
+                value = ast.literal_eval(f'"{value}"')
+            except (SyntaxError, ValueError):
+                pass
+        return ast.Constant(value, lineno=self._line(node), col_offset=0)
+
+    def visit_BOOL(self, node):
+        return ast.Constant(bool(node.value), lineno=self._line(node), col_offset=0)
+
+    def visit_LIST(self, node):
+        line = self._line(node)
+        items = []
+        for item in node.children:
+            items.append((yield self._visit(item)))
+        return ast.List(items, LOAD, lineno=line, col_offset=0)
+
+    def visit_LIST_ACCESS(self, node):
+        line = self._line(node)
+        value = yield self._visit(node.children[0])
+        index = yield self._visit(node.children[1])
+        return ast.Subscript(value, index, LOAD, lineno=line, col_offset=0)
+
+    def visit_BINOP(self, node):
+        return self._operator_chain(node)
+
+    def visit_LOGIC(self, node):
+        return self._operator_chain(node)
+
+    def _operator(self, op_node, left, right):
+        """Nodo Python para 'left op right' (BinOp, Compare o BoolOp)."""
+        line = self._line(op_node)
+        op = op_node.value
+        if op_node.type == "LOGIC":
+            return ast.BoolOp(OR if op == "||" else AND, [left, right], lineno=line, col_offset=0)
+        if op in COMPARE_OPS:
+            return ast.Compare(left, [COMPARE_OPS[op]], [right], lineno=line, col_offset=0)
+        return ast.BinOp(left, BIN_OPS[op], right, lineno=line, col_offset=0)
+
+    def _operator_chain(self, node):
+        """
+        Cadena de BINOP/LOGIC por la izquierda, recorrida en un bucle. Las
+        cadenas largas se parten en tramos igual que en CodeGenerator:
+        (_wax_t0 := ..., _wax_t0 := ..., _wax_t0)[-1]
+        """
+        spine = []
+        while node.type in ("BINOP", "LOGIC"):
+            spine.append(node)
+            node = node.children[0]
+        spine.reverse()
+
+        expr = yield self._visit(node)
+        if len(spine) <= CHAIN_CHUNK:
+            for op_node in spine:
+                right = yield self._visit(op_node.children[1])
+                expr = self._operator(op_node, expr, right)
+            return expr
+
+        temp = f"_wax_t{self.temp_count}"
+        self.temp_count += 1
+        line = self._line(spine[0])
+        chunks = []
+        for start in range(0, len(spine), CHAIN_CHUNK):
+            if start:
+                expr = ast.Name(temp, LOAD, lineno=line, col_offset=0)
+            for op_node in spine[start:start + CHAIN_CHUNK]:
+                right = yield self._visit(op_node.children[1])
+                expr = self._operator(op_node, expr, right)
+            target = ast.Name(temp, STORE, lineno=line, col_offset=0)
+            chunks.append(ast.NamedExpr(target, expr, lineno=line, col_offset=0))
+        chunks.append(ast.Name(temp, LOAD, lineno=line, col_offset=0))
+        items = ast.Tuple(chunks, LOAD, lineno=line, col_offset=0)
+        last = ast.Constant(-1, lineno=line, col_offset=0)
+        return ast.Subscript(items, last, LOAD, lineno=line, col_offset=0)
+
+    def visit_BIND(self, node):
+        # (_wax_a0 := argumento); ver CodeGenerator.visit_BIND
+        line = self._line(node)
+        target, value = node.children
+        value = yield self._visit(value)
+        target = ast.Name(target.value, STORE, lineno=line, col_offset=0)
+        return ast.NamedExpr(target, value, lineno=line, col_offset=0)
+
+    def visit_NOT(self, node):
+        line = self._line(node)
+        operand = yield self._visit(node.children[0])
+        return ast.UnaryOp(NOT, operand, lineno=line, col_offset=0)
+
+    def visit_UNARY_MINUS(self, node):
+        line = self._line(node)
+        operand = yield self._visit(node.children[0])
+        return ast.UnaryOp(USUB, operand, lineno=line, col_offset=0)
+
+    def visit_FUNC_CALL(self, node):
+        line = self._line(node)
+        func = yield self._visit(node.children[0])
+        args = []
+        for arg in node.children[1:]:
+            args.append((yield self._visit(arg)))
+        return ast.Call(func, args, [], lineno=line, col_offset=0)
+
+    def visit_INPUT(self, node):
+        # input("msg")  ->  input("msg"); ver CodeGenerator.visit_INPUT
+        line = self._line(node)
+        args = []
+        if node.children:
+            args.append((yield self._visit(node.children[0])))
+        return ast.Call(ast.Name("input", LOAD, lineno=line, col_offset=0), args, [],
+                        lineno=line, col_offset=0)
@@ -0,0 +1,162 @@
+# runtime.py
+# Entorno de ejecución de los programas compilados desde la CLI.
+#
+# El código generado llama a print() sin flush; cuándo llega la salida al
+# sistema operativo lo decide el modo de salida:
+#   "interactive" -> se vacía después de cada línea, también si la salida
+#                    es un archivo o un pipe (el comportamiento de siempre).
+#   "buffered"    -> se acumula en bloques de BUFFER_SIZE bytes: una
+#                    llamada a write() por bloque en lugar de una por línea.
+#                    Se vacía antes de cada input() (el input() de Python
+#                    lo hace), al terminar el programa y si falla.
+#
+# La entrada tiene dos modos:
+#   "interactive" -> input() de Python: vacía la salida y lee una línea.
+#   "batch"       -> toda la entrada (stdin o un archivo) se lee de una vez
+#                    y cada input() toma la siguiente línea del búfer, sin
+#                    vaciar la salida. Para reproducir archivos de entrada
+#                    grabados; el resultado es el mismo que con el modo
+#                    interactivo leyendo ese archivo.
+#
+# run_program() es la FASE 5 de main.py: prepara la entrada, imprime los
+# encabezados y ejecuta el objeto código. La usan también el cliente y el
+# servidor de compilación (wax_client.py, compile_server.py); por eso este
+# módulo no importa nada del compilador.
+#
+# StepLimitExceeded es la excepción que lanza el código generado con un
+# presupuesto de pasos (main.py --max-steps): el generador la importa de
+# aquí en el prólogo del programa.
+
+import contextlib
+import functools
+import io
+import sys
+
+OUTPUT_MODES = ("interactive", "buffered")
+
+INPUT_MODES = ("interactive", "batch")
+
+BUFFER_SIZE = 1 << 16
+
+# Límites por defecto de la ejecución aislada (exec_pool.py, --isolate)
+DEFAULT_TIMEOUT = 10.0                  # segundos de tiempo real por programa
+DEFAULT_CPU_SECONDS = 5                 # segundos de CPU por programa
+DEFAULT_MEMORY_BYTES = 512 * 1024 * 1024
+
+
+class StepLimitExceeded(RuntimeError):
+    """
+    El programa agotó su presupuesto de pasos (vueltas de ciclos y llamadas
+    a funciones). 'lineno' es la línea del .wax del ciclo o la función que
+    pidió el paso que ya no había.
+    """
+    def __init__(self, lineno, budget):
+        super().__init__(f"el programa superó su límite de {budget} pasos (línea {lineno})")
+        self.lineno = lineno
+        self.budget = budget
+
+
+@contextlib.contextmanager
+def program_output(mode="interactive", buffer_size=BUFFER_SIZE):
+    """
+    Configura sys.stdout para ejecutar un programa en el modo 'mode' y lo
+    restaura (vaciando lo pendiente) al salir, aunque el programa falle.
+    Si sys.stdout no es un archivo real (la GUI, un StringIO) se deja igual.
+    """
+    if mode not in OUTPUT_MODES:
+        raise ValueError(f"Modo de salida desconocido '{mode}' (opciones: {', '.join(OUTPUT_MODES)})")
+    stdout = sys.stdout
+    try:
+        fd = stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        fd = None
+    if fd is None or not hasattr(stdout, "reconfigure"):
+        yield stdout
+        return
+
+    stdout.flush()
+    if mode == "interactive":
+        line_buffering = stdout.line_buffering
+        stdout.reconfigure(line_buffering=True)
+        try:
+            yield stdout
+        finally:
+            stdout.reconfigure(line_buffering=line_buffering)
+        return
+
+    # Mismo descriptor, otro búfer: el sys.stdout original no se cierra
+    raw = io.FileIO(fd, "w", closefd=False)
+    stream = io.TextIOWrapper(io.BufferedWriter(raw, buffer_size),
+                              encoding=stdout.encoding, errors=stdout.errors)
+    sys.stdout = stream
+    try:
+        yield stream
+    finally:
+        sys.stdout = stdout
+        stream.flush()
+
+
+def batch_input(stream, prompts=True, out=None):
+    """
+    Lee 'stream' completo y devuelve un reemplazo de input() que entrega
+    una línea por llamada, igual que input() leyendo un archivo: sin el
+    salto de línea final y EOFError al acabarse. Con prompts=True el
+    mensaje se escribe en 'out' (por defecto sys.stdout) como lo haría
+    input(); con False se omite.
+    """
+    lines = stream.read().split("\n")
+    if lines[-1] == "":
+        lines.pop()     # la entrada termina en salto de línea (o está vacía)
+    next_line = iter(lines).__next__
+
+    def read(prompt=""):
+        if prompts and prompt:
+            (out or sys.stdout).write(str(prompt))
+        try:
+            return next_line()
+        except StopIteration:
+            raise EOFError("EOF when reading a line") from None
+
+    return read
+
+
+def run_program(code_object, output="interactive", input_mode="interactive", input_file=None,
+                prompts=True, stdin=None, out=None):
+    """
+    Ejecuta 'code_object' como la FASE 5 de main.py y devuelve el código de
+    salida (0 o 1). 'stdin' es de donde lee el modo batch si no hay
+    'input_file' (por defecto sys.stdin). Con 'out' (un StringIO) todo lo
+    que imprime el programa se escribe ahí en lugar de en sys.stdout, sin
+    tocar sys.stdout; así puede ejecutarse en un hilo del servidor. En ese
+    caso la entrada tiene que ser batch.
+    """
+    scope = {}
+    if out is not None:
+        scope["print"] = functools.partial(print, file=out)
+    if input_mode == "batch":
+        # Modo batch: toda la entrada se lee antes de ejecutar
+        if input_file:
+            try:
+                with open(input_file, "r", encoding="utf-8") as f:
+                    scope["input"] = batch_input(f, prompts, out)
+            except OSError as e:
+                print(f"[Error Crítico] No se pudo leer la entrada '{input_file}': {e.strerror}", file=out)
+                return 1
+        else:
+            scope["input"] = batch_input(stdin or sys.stdin, prompts, out)
+
+    print("\n=== FASE 5: EJECUTANDO CÓDIGO... ===", file=out)
+    print("--- Salida del Programa ---", file=out)
+    try:
+        # Sin 'out' no se captura stdout, para que input() funcione
+        # correctamente y la salida se vea en tiempo real
+        with program_output(output) if out is None else contextlib.nullcontext():
+            exec(code_object, scope, scope)
+
+        print("---------------------------", file=out)
+        print("✓ Ejecución finalizada.", file=out)
+    except Exception as e:
+        print(f"\n[Error de Ejecución] El programa generado falló.", file=out)
+        print(f"    > {type(e).__name__}: {e}", file=out)
+        return 1
+    return 0
@@ -0,0 +1,61 @@
+# scope_analysis.py
+# Análisis de nombres para envolver el código de nivel superior en una
+# función de entrada: qué variables del programa principal leen las
+# funciones de Wax y por lo tanto deben seguir siendo globales de Python.
+
+# Nodos que ligan un nombre en el ámbito de Python donde aparecen
+BINDING_TYPES = {
+    "DECLARATION": 1, "FOR": 1, "FUNCTION": 1,
+    "ASSIGN": 0, "ASSIGN_COMPOUND": 0, "INCREMENT": 0, "BIND": 0,
+}
+
+
+def scope_names(body):
+    """
+    Devuelve (ligados, leídos, funciones) de un bloque de Python: los nombres
+    que el bloque asigna, los que lee y los nodos FUNCTION anidados. No
+    entra en el cuerpo de las funciones anidadas (son otro ámbito).
+    """
+    bound, read, functions = set(), set(), []
+    stack = [body]
+    while stack:
+        item = stack.pop()
+        if item is None:
+            continue
+        if isinstance(item, (list, tuple)):
+            stack.extend(item)
+            continue
+        kind = item.type
+        if kind in ("IDENT", "Identifier"):
+            read.add(item.value)
+            continue
+        if kind in BINDING_TYPES:
+            bound.add(item.children[BINDING_TYPES[kind]].value)
+        elif kind == "ASSIGN_MULTI":
+            bound.update(ident.value for ident in item.children[0])
+        if kind == "FUNCTION":
+            functions.append(item)
+            continue
+        stack.extend(item.children)
+    return bound, read, functions
+
+
+def entry_globals(ast):
+    """
+    Nombres que la función de entrada debe declarar 'global': las funciones
+    definidas en el programa y las variables del nivel superior que alguna
+    función lee sin ligarlas ella misma. El resto quedan como variables
+    locales (rápidas) de la función de entrada.
+    """
+    main_bound, _, functions = scope_names(ast)
+    needed = {function.children[1].value for function in functions}
+    # (función, nombres ligados por las funciones que la contienen)
+    stack = [(function, frozenset()) for function in functions]
+    while stack:
+        function, enclosing = stack.pop()
+        params = {param.children[0].value for param in function.children[2]}
+        bound, read, nested = scope_names(function.children[3])
+        bound |= params
+        needed |= read - bound - enclosing
+        stack.extend((child, enclosing | bound) for child in nested)
+    return needed & main_bound
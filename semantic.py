@@ -1,26 +1,45 @@
 # semantic.py
 
+from ast_nodes import dispatch_table, trampoline
+
 class SemanticAnalyzer:
     def __init__(self):
+        # Tablas de despacho tipo de nodo -> método (calculadas una vez por clase)
+        self._visitors = dispatch_table(type(self), 'visit_')
+        self._expr_typers = dispatch_table(type(self), 'get_expr_type_')
+
         self.errors = []
         self.current_function_return_type = None
         self.scope_stack = ['global'] 
 
         self.symbol_log = []
+        # Firmas de las funciones de nivel superior (registradas en el primer paso)
+        self.function_signatures = {}
 
         # Creamos el alcance global y lo pre-cargamos con las funciones built-in.
         built_ins = {
             'str': {
                 'type_info': {'type': 'function', 'return_type': 'string', 'param_types': ['any']},
-                'scope': 'global'
+                'scope': 'global',
+                'depth': 0
             },
             'input': {
                 'type_info': {'type': 'function', 'return_type': 'string', 'param_types': []},
-                'scope': 'global'
+                'scope': 'global',
+                'depth': 0
             }
         }
-        self.symbol_table = [built_ins]
+        # Tabla de símbolos plana: cada nombre apunta a la pila de sus
+        # declaraciones visibles (la última es la activa), así que buscar
+        # un símbolo cuesta O(1) sin importar la profundidad de anidamiento.
+        # 'scope_undo' guarda, por ámbito abierto, los nombres declarados
+        # en él para deshacerlos al salir.
+        self.bindings = {}
+        self.scope_undo = [[]]
 
+        for name, data in built_ins.items():
+            self.bindings[name] = [data]
+            self.scope_undo[0].append(name)
         
         for name, data in built_ins.items():
             self.symbol_log.append({
@@ -78,18 +97,24 @@ class SemanticAnalyzer:
         return False
 
     def enter_scope(self,scope_name):
-        self.symbol_table.append({})
+        self.scope_undo.append([])
         self.scope_stack.append(scope_name)
 
     def exit_scope(self):
-        self.symbol_table.pop()
+        bindings = self.bindings
+        for name in self.scope_undo.pop():
+            stack = bindings[name]
+            stack.pop()
+            if not stack:
+                del bindings[name]
         self.scope_stack.pop()
 
     def add_symbol(self, name, symbol_info, lineno):
-        current_scope = self.symbol_table[-1]
+        depth = len(self.scope_undo) - 1
         current_scope_name = self.scope_stack[-1] 
 
-        if name in current_scope:
+        stack = self.bindings.get(name)
+        if stack and stack[-1]['depth'] == depth:
             self._error(f"El símbolo '{name}' ya ha sido declarado en este alcance.", lineno)
             return False
         
@@ -97,9 +122,14 @@ class SemanticAnalyzer:
         # En lugar de solo guardar el tipo, guardamos un dict que lo contiene
         symbol_data = {
             'type_info': symbol_info,
-            'scope': current_scope_name
+            'scope': current_scope_name,
+            'depth': depth
         }
-        current_scope[name] = symbol_data
+        if stack:
+            stack.append(symbol_data)
+        else:
+            self.bindings[name] = [symbol_data]
+        self.scope_undo[-1].append(name)
 
         # Guardamos un registro persistente para la tabla final
         log_entry = {
@@ -113,18 +143,18 @@ class SemanticAnalyzer:
         return True
 
     def get_symbol(self, name, lineno):
-        for scope in reversed(self.symbol_table):
-            if name in scope:
-                return scope[name]['type_info']
+        stack = self.bindings.get(name)
+        if stack:
+            return stack[-1]['type_info']
         self._error(f"El símbolo '{name}' no ha sido declarado.", lineno)
         return None
     
     def update_symbol_type(self, name, new_type):
-        """Busca el símbolo en todos los ámbitos y actualiza su tipo."""
-        for scope in reversed(self.symbol_table):
-            if name in scope:
-                scope[name]['type_info'] = new_type
-                return True
+        """Actualiza el tipo de la declaración visible del símbolo."""
+        stack = self.bindings.get(name)
+        if stack:
+            stack[-1]['type_info'] = new_type
+            return True
         return False
 
     def analyze(self, ast):
@@ -137,24 +167,35 @@ class SemanticAnalyzer:
         for node in ast:
             self.visit(node, first_pass=False)
 
+    # Los visitantes que recorren bloques o subexpresiones son generadores:
+    # piden el resultado de cada hijo con 'yield self._visit(...)' o
+    # 'yield self._expr_type(...)' y 'trampoline' los ejecuta con una pila
+    # explícita, sin recursión nativa (ver ast_nodes.trampoline).
+
     def visit(self, node, first_pass=False):
+        return trampoline(self._visit(node, first_pass))
+
+    def _visit(self, node, first_pass=False):
         if node is None: return
         if isinstance(node, list):
-            
-            for item in node: self.visit(item, first_pass)
-            return
+            return self._visit_list(node, first_pass)
         
-        method_name = f'visit_{node["type"]}'
-        method = getattr(self, method_name, self.generic_visit)
+        method = self._visitors.get(node["type"])
+        if method is None:
+            return self.generic_visit(node, first_pass=first_pass)
         # ¡Esta línea es clave! Pasa el "return" del método visitado
-        return method(node, first_pass=first_pass)
+        return method(self, node, first_pass=first_pass)
+
+    def _visit_list(self, nodes, first_pass):
+        for item in nodes:
+            yield self._visit(item, first_pass)
     
 
     def generic_visit(self, node, first_pass=False):
         # Durante el primer paso, solo nos interesan las funciones
         if first_pass: return
         for child in node.get("children", []):
-            self.visit(child)
+            yield self._visit(child)
 
     def visit_statement_list(self, nodes, first_pass=False):
         """
@@ -171,7 +212,7 @@ class SemanticAnalyzer:
                 continue 
             
             # Visitamos la sentencia y capturamos su "estado"
-            status = self.visit(node, first_pass=first_pass)
+            status = yield self._visit(node, first_pass=first_pass)
             
             # Si la sentencia fue un return, marcamos la bandera
             if status == "unreachable":
@@ -424,12 +465,12 @@ class SemanticAnalyzer:
 
         # 2. Analiza el bloque IF (con nuevo ámbito)
         self.enter_scope(f"if_block(L{node['lineno']})")
-        self.visit_statement_list(node["children"][1], first_pass)
+        yield self.visit_statement_list(node["children"][1], first_pass)
         self.exit_scope()
         
         # 3. Analiza el bloque ELSE (con nuevo ámbito)
         self.enter_scope(f"else_block(L{node['lineno']})")
-        self.visit_statement_list(node["children"][2], first_pass)
+        yield self.visit_statement_list(node["children"][2], first_pass)
         self.exit_scope()
         
 
@@ -441,7 +482,7 @@ class SemanticAnalyzer:
         
         # Analiza el bloque 'program' (con nuevo ámbito)
         self.enter_scope(f"if_block(L{node['lineno']})")
-        self.visit_statement_list(node["children"][1], first_pass)
+        yield self.visit_statement_list(node["children"][1], first_pass)
         self.exit_scope()
         
 
@@ -454,7 +495,7 @@ class SemanticAnalyzer:
         
         # Analiza el bloque 'program' (con nuevo ámbito)
         self.enter_scope(f"while_block(L{node['lineno']})")
-        self.visit_statement_list(node["children"][1], first_pass)
+        yield self.visit_statement_list(node["children"][1], first_pass)
         self.exit_scope()
 
     
@@ -508,7 +549,7 @@ class SemanticAnalyzer:
         self.visit_for_increment(increment, var_name, first_pass)
         
         # 7. Analizar el cuerpo del for
-        self.visit_statement_list(body, first_pass)
+        yield self.visit_statement_list(body, first_pass)
         
         # 8. Salir del scope
         self.exit_scope()
@@ -553,7 +594,8 @@ class SemanticAnalyzer:
                 param_types.append(p['children'][1]['value'])
             
             func_info = {'type': 'function', 'return_type': return_type, 'param_types': param_types}
-            self.add_symbol(func_name, func_info, lineno)
+            if self.add_symbol(func_name, func_info, lineno):
+                self.function_signatures[func_name] = func_info
         else:
             # En el segundo paso, analizamos el cuerpo de la función
             body = node["children"][3]
@@ -569,7 +611,7 @@ class SemanticAnalyzer:
                 self.add_symbol(param_name, param_type, lineno)
             
             # ¡Usa el nuevo visit_statement_list!
-            self.visit_statement_list(body, first_pass) 
+            yield self.visit_statement_list(body, first_pass) 
             
             self.exit_scope()
             self.current_function_return_type = None
@@ -598,12 +640,16 @@ class SemanticAnalyzer:
         return "unreachable"
 
     def get_expr_type(self, node):
+        return trampoline(self._expr_type(node))
+
+    def _expr_type(self, node):
         if node is None: return "error"
-        method_name = f'get_expr_type_{node["type"]}'
+        method = self._expr_typers.get(node["type"])
         
         # Si el método no se encuentra, llama a self.unsupported_expr
-        method = getattr(self, method_name, self.unsupported_expr)
-        return method(node)
+        if method is None:
+            return self.unsupported_expr(node)
+        return method(self, node)
 
     def get_expr_type_NUMBER(self, node): return node["datatype"]
     def get_expr_type_STRING(self, node): return "string"
@@ -611,7 +657,7 @@ class SemanticAnalyzer:
 
     def get_expr_type_NOT(self, node):
         """Valida el operador NOT (!)"""
-        operand_type = self.get_expr_type(node["children"][0])
+        operand_type = yield self._expr_type(node["children"][0])
         
         if operand_type == "error":
             return "error"
@@ -628,7 +674,7 @@ class SemanticAnalyzer:
     
     def get_expr_type_UNARY_MINUS(self, node):
         """Valida el operador unario menos (-)"""
-        operand_type = self.get_expr_type(node["children"][0])
+        operand_type = yield self._expr_type(node["children"][0])
     
         if operand_type == "error":
             return "error"
@@ -645,7 +691,7 @@ class SemanticAnalyzer:
     
     def get_expr_type_INPUT(self, node):
         if node.get("children") and len(node["children"]) > 0:
-            msg_type = self.get_expr_type(node["children"][0])
+            msg_type = yield self._expr_type(node["children"][0])
             if msg_type != "string" and msg_type != "error":
                 self._error(
                     f"El argumento de input() debe ser de tipo 'string', "
@@ -661,12 +707,12 @@ class SemanticAnalyzer:
         
         # Caso 2: Lista con elementos
         # Determina el tipo base usando el primer elemento
-        first_type = self.get_expr_type(node["children"][0])
+        first_type = yield self._expr_type(node["children"][0])
         if first_type == "error": return "error"
 
         # Comprueba que todos los demás elementos sean del mismo tipo
         for i, element_node in enumerate(node["children"][1:]):
-            current_type = self.get_expr_type(element_node)
+            current_type = yield self._expr_type(element_node)
             if current_type == "error": return "error"
             
             
@@ -687,8 +733,27 @@ class SemanticAnalyzer:
     
 
     def get_expr_type_BINOP(self, node):
-        left_type = self.get_expr_type(node["children"][0])
-        right_type = self.get_expr_type(node["children"][1])
+        # Las cadenas por la izquierda (a + b - c && d ...) se recorren de
+        # forma iterativa sobre su "espina": primero el operando más a la
+        # izquierda y luego, de abajo hacia arriba, el operando derecho de
+        # cada operador. Así una cadena de N términos no anida N generadores.
+        spine = []
+        while node["type"] in ("BINOP", "LOGIC"):
+            spine.append(node)
+            node = node["children"][0]
+        current_type = yield self._expr_type(node)
+        for op_node in reversed(spine):
+            right_type = yield self._expr_type(op_node["children"][1])
+            if op_node["type"] == "BINOP":
+                current_type = self.binop_type(op_node, current_type, right_type)
+            else:
+                current_type = self.logic_type(op_node, current_type, right_type)
+        return current_type
+
+    get_expr_type_LOGIC = get_expr_type_BINOP
+
+    def binop_type(self, node, left_type, right_type):
+        """Tipo de un BINOP dados los tipos de sus operandos."""
         op = node["value"]
         lineno = node["lineno"]
         
@@ -736,9 +801,8 @@ class SemanticAnalyzer:
         if left_type == "double" or right_type == "double": return "double"
         return "int"
 
-    def get_expr_type_LOGIC(self, node):
-        left_type = self.get_expr_type(node["children"][0])
-        right_type = self.get_expr_type(node["children"][1])
+    def logic_type(self, node, left_type, right_type):
+        """Tipo de un LOGIC (&&, ||) dados los tipos de sus operandos."""
         if left_type != "bool" or right_type != "bool":
             self._error(f"Operación lógica '{node['value']}' solo permitida entre valores 'bool'.", node["lineno"])
             return "error"
@@ -760,7 +824,7 @@ class SemanticAnalyzer:
         
         for i, arg in enumerate(args):
             if i >= len(expected_params): break
-            arg_type = self.get_expr_type(arg)
+            arg_type = yield self._expr_type(arg)
             expected_type = expected_params[i]
             
             if expected_type == 'any': continue # La función acepta cualquier cosa
@@ -785,7 +849,7 @@ class SemanticAnalyzer:
             return "error"
         
         # 3. Verificar que el índice es un entero
-        index_type = self.get_expr_type(index_node)
+        index_type = yield self._expr_type(index_node)
         if index_type != "int":
             self._error(f"El índice de acceso a la lista debe ser 'int', pero se encontró '{index_type}'.", lineno)
             return "error"
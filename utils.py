@@ -1,28 +1,34 @@
 # utils.py
 # Contiene funciones de ayuda, como la visualización del AST.
 import graphviz
+from ast_nodes import Node
 
 def print_ast(node, prefix="", is_last=True):
-    if isinstance(node, (list, tuple)):
-        for i, n in enumerate(node):
-            print_ast(n, prefix, i == len(node)-1)
-        return
+    # Pila explícita de (nodo, prefijo, es_último) para no depender del
+    # límite de recursión en árboles profundos
+    stack = [(node, prefix, is_last)]
+    while stack:
+        node, prefix, is_last = stack.pop()
+        if isinstance(node, (list, tuple)):
+            for i in range(len(node) - 1, -1, -1):
+                stack.append((node[i], prefix, i == len(node)-1))
+            continue
 
-    # Ignora nodos None que pueden venir de sentencias vacías o comentarios
-    if not isinstance(node, dict):
-        return
+        # Ignora nodos None que pueden venir de sentencias vacías o comentarios
+        if not isinstance(node, Node):
+            continue
 
-    connector = "└── " if is_last else "├── "
-    datatype = f" ({node.get('datatype')})" if node.get('datatype') else ""
-    value = f": {node.get('value')}" if node.get('value') is not None else ""
-    lineno = f" [linea {node.get('lineno')}]" if node.get('lineno') else ""
-    print(f"{prefix}{connector}{node['type']}{datatype}{value}{lineno}")
+        connector = "└── " if is_last else "├── "
+        datatype = f" ({node.get('datatype')})" if node.get('datatype') else ""
+        value = f": {node.get('value')}" if node.get('value') is not None else ""
+        lineno = f" [linea {node.get('lineno')}]" if node.get('lineno') else ""
+        print(f"{prefix}{connector}{node['type']}{datatype}{value}{lineno}")
 
-    children = node.get("children", [])
-    for i, child in enumerate(children):
+        children = node.get("children", [])
         # El prefijo para los hijos cambia dependiendo si este es el último nodo
         child_prefix = prefix + ("    " if is_last else "│   ")
-        print_ast(child, child_prefix, i == len(children)-1)
+        for i in range(len(children) - 1, -1, -1):
+            stack.append((children[i], child_prefix, i == len(children)-1))
         
         
 class ASTVisualizer:
@@ -32,34 +38,37 @@ class ASTVisualizer:
         self.seq = 0
 
     def visit(self, node, parent=None):
-        if isinstance(node, (list, tuple)):
-            for item in node:
-                self.visit(item, parent)
-            return
+        # Recorrido en preorden con pila explícita de (nodo, padre); la
+        # numeración de los nodos coincide con la del recorrido recursivo
+        stack = [(node, parent)]
+        while stack:
+            node, parent = stack.pop()
+            if isinstance(node, (list, tuple)):
+                stack.extend((item, parent) for item in reversed(node))
+                continue
 
-        if not isinstance(node, dict):
-            return
+            if not isinstance(node, Node):
+                continue
 
-        # Crea un nombre único para el nodo actual
-        node_name = f'node{self.seq}'
-        self.seq += 1
+            # Crea un nombre único para el nodo actual
+            node_name = f'node{self.seq}'
+            self.seq += 1
 
-        # Crea la etiqueta del nodo con su información
-        label = f"{node['type']}"
-        if node.get('value') is not None:
-            label += f"\\nvalue: {node['value']}"
-        if node.get('datatype') is not None:
-            label += f"\\ndatatype: {node['datatype']}"
-        
-        self.dot.node(node_name, label)
+            # Crea la etiqueta del nodo con su información
+            label = f"{node['type']}"
+            if node.get('value') is not None:
+                label += f"\\nvalue: {node['value']}"
+            if node.get('datatype') is not None:
+                label += f"\\ndatatype: {node['datatype']}"
+            
+            self.dot.node(node_name, label)
 
-        # Si tiene un padre, dibuja una flecha
-        if parent:
-            self.dot.edge(parent, node_name)
+            # Si tiene un padre, dibuja una flecha
+            if parent:
+                self.dot.edge(parent, node_name)
 
-        # Visita a los hijos
-        for child in node.get('children', []):
-            self.visit(child, node_name)
+            # Visita a los hijos
+            stack.extend((child, node_name) for child in reversed(node.get('children', [])))
 
     def visualize(self, ast, filename='ast_output'):
         self.visit(ast)
@@ -0,0 +1,121 @@
+# wax_client.py
+# Cliente del servidor de compilación (compile_server.py). Acepta los mismos
+# flags que main.py y escribe la misma salida, pero la compilación la hace
+# el servidor, que ya tiene el compilador cargado; este proceso sólo
+# importa el protocolo y runtime.py. Con --execute el programa se ejecuta
+# aquí, con la entrada y la salida de la terminal, igual que en main.py.
+#
+# Flags propios (se quitan antes de enviar el resto al servidor):
+#   --socket RUTA      socket del servidor (por defecto el de
+#                      compile_protocol.default_socket_path()).
+#   --run-on-server    ejecuta el programa en el servidor, aislado en su
+#                      pool de procesos: lee toda la entrada estándar y la
+#                      envía para input() (modo batch).
+#
+# Si no hay servidor, o se pide --batch, se ejecuta main.py en este mismo
+# proceso con los mismos argumentos. La entrada estándar se lee sólo
+# después de conectarse; si aun así hay que volver a main.py con la
+# entrada ya leída, main.py la recibe desde un archivo temporal.
+#
+# Uso: python wax_client.py programa.wax --execute
+
+import os
+import sys
+
+from compile_protocol import MAGIC, STDERR, Connection, decode_code
+from runtime import run_program
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def client_options(argv):
+    """Separa los flags propios del cliente de los de main.py."""
+    socket_path = None
+    run_on_server = False
+    rest = []
+    args = iter(argv)
+    for arg in args:
+        if arg == "--socket":
+            socket_path = next(args, None)
+        elif arg.startswith("--socket="):
+            socket_path = arg.split("=", 1)[1]
+        elif arg == "--run-on-server":
+            run_on_server = True
+        else:
+            rest.append(arg)
+    return socket_path, run_on_server, rest
+
+
+def needs_stdin(argv):
+    """Con --run-on-server, si el programa leerá la entrada estándar."""
+    if sys.stdin is None or sys.stdin.isatty():
+        return False
+    return "--execute" in argv and not any(arg.startswith("--input-file") for arg in argv)
+
+
+def run_locally(argv, stdin_text=None):
+    """
+    Sin servidor: reemplaza este proceso por main.py con los mismos
+    argumentos. 'stdin_text' es la entrada estándar que ya se había leído:
+    main.py la lee de un archivo temporal (ya borrado) puesto como stdin.
+    """
+    sys.stdout.flush()
+    if stdin_text is not None:
+        import tempfile
+        with tempfile.TemporaryFile() as f:
+            f.write(stdin_text.encode("utf-8"))
+            f.seek(0)
+            os.dup2(f.fileno(), 0)
+    main_py = os.path.join(HERE, "main.py")
+    os.execv(sys.executable, [sys.executable, main_py] + argv)
+
+
+def write_output(chunks):
+    for fd, text in chunks:
+        stream = sys.stderr if fd == STDERR else sys.stdout
+        stream.write(text)
+        stream.flush()
+
+
+def main(argv=None):
+    socket_path, run_on_server, argv = client_options(sys.argv[1:] if argv is None else argv)
+    if "--batch" in argv:
+        run_locally(argv)
+
+    request = {"op": "run" if run_on_server else "compile", "argv": argv, "cwd": os.getcwd()}
+    try:
+        connection = Connection(socket_path)
+    except OSError:
+        run_locally(argv)
+    # Con el servidor conectado ya se puede consumir la entrada estándar
+    with connection:
+        if run_on_server and needs_stdin(argv):
+            request["stdin"] = sys.stdin.read()
+        try:
+            response = connection.request(request)
+        except OSError:
+            run_locally(argv, request.get("stdin"))
+
+    if not response.get("ok"):
+        print(f"[Error Crítico] El servidor de compilación falló: {response.get('error')}")
+        sys.exit(1)
+    # Un servidor con otra versión de Python: su objeto código (marshal) no
+    # sirve aquí. Se decide antes de escribir nada, para que main.py no
+    # repita los diagnósticos.
+    if response.get("magic") != MAGIC:
+        run_locally(argv, request.get("stdin"))
+    write_output(response["output"])
+    if response["exit"] is not None:
+        sys.exit(response["exit"])
+
+    # --execute: el objeto código viene serializado con marshal
+    code_object = decode_code(response["code"])
+    options = response["run"]
+    if response.get("isolate"):
+        from exec_pool import run_isolated     # sólo con --isolate (importa multiprocessing)
+        sys.exit(run_isolated(code_object, options["input_file"], options["prompts"], **response["isolate"]))
+    sys.exit(run_program(code_object, **options))
+
+
+if __name__ == "__main__":
+    main()